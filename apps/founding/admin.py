@@ -5,7 +5,7 @@ from django.http import HttpResponse
 from django.utils import timezone
 from django.contrib import admin
 
-from .models import FoundingFamilySignup
+from .models import FoundingFamilySignup, FoundingSlot
 
 
 def export_founding_signups_csv(modeladmin, request, queryset):
@@ -37,3 +37,15 @@ class FoundingFamilySignupAdmin(admin.ModelAdmin):
     search_fields = ("name", "email")
     list_filter = ("child_age_range", "created_at")
     actions = [export_founding_signups_csv]
+
+
+@admin.register(FoundingSlot)
+class FoundingSlotAdmin(admin.ModelAdmin):
+    list_display = ("number", "signup")
+    list_filter = (("signup", admin.EmptyFieldListFilter),)
+    search_fields = ("signup__email",)
+    list_select_related = ("signup",)
+    readonly_fields = ("number", "signup")
+
+    def has_add_permission(self, request):
+        return False
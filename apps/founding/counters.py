@@ -0,0 +1,57 @@
+"""
+Founding family signup counter.
+
+The landing pages show how many founding spots are left on every hit, so the
+count is served from the shared cache instead of counting the signups table
+per request. The signal handlers in models.py mark it stale whenever a signup
+is created or deleted; the next reader refreshes it with a single COUNT while
+everyone else keeps serving the previous value.
+
+This is a display figure only. Enforcing the limit stays with the database.
+"""
+from django.db import transaction
+
+from zonuko.cache import expire, get_or_compute
+
+from .models import FoundingFamilySignup
+
+
+FOUNDING_LIMIT = 200
+RESERVED_SPOTS = 0  # No reserved spots - when they're gone, they're gone!
+
+SIGNUP_COUNT_KEY = "founding:signup_count"
+SIGNUP_COUNT_TTL = 300  # seconds; upper bound on drift if an invalidation is lost
+
+
+def count_signups():
+    """Authoritative signup count straight from the database"""
+    return FoundingFamilySignup.objects.count()
+
+
+def get_signup_count():
+    """Cached signup count, recomputed by a single caller when stale"""
+    return get_or_compute(SIGNUP_COUNT_KEY, count_signups, timeout=SIGNUP_COUNT_TTL)
+
+
+def _expire_signup_count():
+    expire(SIGNUP_COUNT_KEY)
+
+
+def invalidate_signup_count():
+    """Refresh the cached count once the current transaction commits"""
+    transaction.on_commit(_expire_signup_count)
+
+
+def get_signup_stats(total_signups=None):
+    """Template context shared by the home page and the founding page"""
+    if total_signups is None:
+        total_signups = get_signup_count()
+    available_limit = FOUNDING_LIMIT - RESERVED_SPOTS
+
+    return {
+        'total_signups': total_signups,
+        'founding_limit': FOUNDING_LIMIT,
+        'spots_remaining': max(0, available_limit - total_signups),
+        'signups_closed': total_signups >= available_limit,
+        'progress_percentage': min(100, int((total_signups / available_limit) * 100)),
+    }
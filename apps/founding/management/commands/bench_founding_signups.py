@@ -0,0 +1,121 @@
+"""
+Concurrency benchmark for founding slot reservation.
+
+Fires many simultaneous signups at the configured database through the same
+claim path the signup view uses, then checks that exactly the available
+number of spots were handed out. Benchmark signups are removed afterwards.
+
+    python manage.py migrate
+    python manage.py bench_founding_signups --signups 500 --workers 64
+"""
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.founding.counters import FOUNDING_LIMIT, RESERVED_SPOTS
+from apps.founding.forms import ChildFormSet, FoundingFamilySignupForm
+from apps.founding.models import FoundingFamilySignup, FoundingSlot
+from apps.founding.slots import FoundingSpotsExhausted, claim_founding_spot, ensure_slots
+
+
+BENCH_EMAIL_DOMAIN = 'bench.zonuko.invalid'
+
+
+class Command(BaseCommand):
+    help = 'Fire parallel founding signups and assert the slot limit holds exactly'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--signups', type=int, default=500, help='Total signup attempts')
+        parser.add_argument('--workers', type=int, default=64, help='Concurrent workers')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark signups afterwards')
+
+    def handle(self, *args, **options):
+        attempts = options['signups']
+        workers = options['workers']
+        available = FOUNDING_LIMIT - RESERVED_SPOTS
+
+        if FoundingFamilySignup.objects.exists():
+            raise CommandError('The benchmark needs an empty founding signup table (use a local database).')
+        ensure_slots(available)
+
+        start_gate = threading.Barrier(workers)
+        results = []
+        results_lock = threading.Lock()
+
+        def run_worker(worker_index):
+            try:
+                start_gate.wait()
+                for attempt in range(worker_index, attempts, workers):
+                    outcome, elapsed = self._attempt_signup(attempt)
+                    with results_lock:
+                        results.append((outcome, elapsed))
+            finally:
+                connection.close()
+
+        self.stdout.write(f'Firing {attempts} signups from {workers} workers at {available} slots...')
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run_worker, range(workers)))
+        wall_time = time.perf_counter() - started
+
+        claimed = [elapsed for outcome, elapsed in results if outcome == 'claimed']
+        rejected = sum(1 for outcome, _ in results if outcome == 'full')
+        errors = [outcome for outcome, _ in results if outcome not in ('claimed', 'full')]
+        latencies = sorted(elapsed for _, elapsed in results)
+
+        self.stdout.write(f'Claimed:  {len(claimed)}')
+        self.stdout.write(f'Rejected: {rejected}')
+        self.stdout.write(f'Errors:   {len(errors)}')
+        if latencies:
+            self.stdout.write(
+                f'Latency:  p50 {statistics.median(latencies) * 1000:.1f}ms, '
+                f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms, '
+                f'max {latencies[-1] * 1000:.1f}ms'
+            )
+        self.stdout.write(f'Wall:     {wall_time:.2f}s ({len(results) / wall_time:.0f} signups/s)')
+
+        signup_count = FoundingFamilySignup.objects.filter(email__endswith=BENCH_EMAIL_DOMAIN).count()
+        slot_count = FoundingSlot.objects.filter(signup__isnull=False).count()
+
+        if not options['keep']:
+            FoundingFamilySignup.objects.filter(email__endswith=BENCH_EMAIL_DOMAIN).delete()
+
+        problems = []
+        if errors:
+            problems.append(f'{len(errors)} attempts failed unexpectedly (first: {errors[0]})')
+        if len(claimed) != min(available, attempts):
+            problems.append(f'expected {min(available, attempts)} claimed spots, got {len(claimed)}')
+        if signup_count != len(claimed) or slot_count != len(claimed):
+            problems.append(f'{signup_count} signups and {slot_count} claimed slots for {len(claimed)} claims')
+        if problems:
+            raise CommandError('; '.join(problems))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Exactly {len(claimed)} founding spots claimed'))
+
+    def _attempt_signup(self, attempt):
+        data = {
+            'name': f'Bench Family {attempt}',
+            'email': f'family{attempt}@{BENCH_EMAIL_DOMAIN}',
+            'child_age_range': FoundingFamilySignup.NAVIGATORS,
+            'children-TOTAL_FORMS': '0',
+            'children-INITIAL_FORMS': '0',
+        }
+        form = FoundingFamilySignupForm(data)
+        child_formset = ChildFormSet(data)
+
+        started = time.perf_counter()
+        try:
+            if not (form.is_valid() and child_formset.is_valid()):
+                outcome = f'invalid form: {form.errors.as_text() or child_formset.errors}'
+            else:
+                claim_founding_spot(form, child_formset)
+                outcome = 'claimed'
+        except FoundingSpotsExhausted:
+            outcome = 'full'
+        except Exception as exc:  # reported, not raised, so one failure doesn't stop the run
+            outcome = f'{type(exc).__name__}: {exc}'
+        return outcome, time.perf_counter() - started
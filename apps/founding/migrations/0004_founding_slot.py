@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FOUNDING_LIMIT = 200
+
+
+def allocate_slots(apps, schema_editor):
+    FoundingFamilySignup = apps.get_model("founding", "FoundingFamilySignup")
+    FoundingSlot = apps.get_model("founding", "FoundingSlot")
+
+    # Existing signups keep their place in the queue; if the list already
+    # overflowed, every existing family still gets a slot
+    signup_ids = list(
+        FoundingFamilySignup.objects.order_by("created_at", "id").values_list("id", flat=True)
+    )
+    total = max(FOUNDING_LIMIT, len(signup_ids))
+    FoundingSlot.objects.bulk_create(
+        [
+            FoundingSlot(
+                number=number,
+                signup_id=signup_ids[number - 1] if number <= len(signup_ids) else None,
+            )
+            for number in range(1, total + 1)
+        ]
+    )
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('founding', '0003_alter_foundingfamilysignup_child_age_range_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoundingSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(unique=True)),
+                ('signup', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='slot', to='founding.foundingfamilysignup')),
+            ],
+            options={
+                'ordering': ['number'],
+            },
+        ),
+        migrations.RunPython(allocate_slots, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 
 class FoundingFamilySignup(models.Model):
@@ -30,3 +32,43 @@ class FoundingFamilyChild(models.Model):
 
     def __str__(self) -> str:
         return f"Child of {self.family.email} ({self.age_range})"
+
+
+class FoundingSlot(models.Model):
+    """
+    One pre-allocated founding family spot.
+
+    Signups claim a free slot with a conditional UPDATE in the same
+    transaction that saves them (see apps/founding/slots.py), so the limit
+    is enforced by the database rather than by a count-then-insert check.
+    Deleting a signup frees its slot again.
+    """
+    number = models.PositiveIntegerField(unique=True)
+    signup = models.OneToOneField(
+        FoundingFamilySignup,
+        related_name='slot',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        ordering = ['number']
+
+    def __str__(self) -> str:
+        return f"Slot {self.number} ({self.signup.email if self.signup_id else 'free'})"
+
+
+@receiver(post_save, sender=FoundingFamilySignup)
+def invalidate_signup_count_on_save(sender, instance, created, **kwargs):
+    """Refresh the cached founding counter when a signup is added"""
+    if created:
+        from .counters import invalidate_signup_count
+        invalidate_signup_count()
+
+
+@receiver(post_delete, sender=FoundingFamilySignup)
+def invalidate_signup_count_on_delete(sender, instance, **kwargs):
+    """Refresh the cached founding counter when a signup is removed"""
+    from .counters import invalidate_signup_count
+    invalidate_signup_count()
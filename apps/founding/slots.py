@@ -0,0 +1,92 @@
+"""
+Founding slot reservation.
+
+Every founding spot is a pre-allocated FoundingSlot row. A signup is only
+kept if it claims one of those rows inside the same transaction, so the
+limit holds no matter how many signups arrive at once.
+
+On PostgreSQL a claimer locks the first free slot with
+SELECT ... FOR UPDATE SKIP LOCKED, so concurrent claimers never wait on each
+other's rows. Backends without SKIP LOCKED (SQLite in development) fall back
+to a conditional UPDATE ... WHERE signup IS NULL on a shuffled window of free
+slots. That is a compare-and-set: whoever loses a race moves on to the next
+candidate.
+"""
+import random
+
+from django.db import connection, transaction
+
+from .counters import FOUNDING_LIMIT, RESERVED_SPOTS
+from .models import FoundingSlot
+
+
+CLAIM_WINDOW = 16  # free slots considered per compare-and-set round
+
+
+class FoundingSpotsExhausted(Exception):
+    """Raised when every founding slot has been claimed"""
+
+
+def ensure_slots(total=None):
+    """Top the slot table up to `total` slots (never removes any)"""
+    if total is None:
+        total = FOUNDING_LIMIT - RESERVED_SPOTS
+    existing = set(FoundingSlot.objects.values_list('number', flat=True))
+    missing = [FoundingSlot(number=number) for number in range(1, total + 1) if number not in existing]
+    FoundingSlot.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(missing)
+
+
+def reserve_slot(signup):
+    """
+    Claim a free slot for `signup`.
+
+    Must run inside the transaction that saved `signup`, so a failed claim
+    rolls the signup back with it. Raises FoundingSpotsExhausted when no
+    slot is left.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        slot = (
+            FoundingSlot.objects.select_for_update(skip_locked=True)
+            .filter(signup__isnull=True)
+            .order_by('number')
+            .first()
+        )
+        if slot is None:
+            raise FoundingSpotsExhausted()
+        FoundingSlot.objects.filter(pk=slot.pk).update(signup=signup)
+        slot.signup = signup
+        return slot
+
+    while True:
+        candidates = list(
+            FoundingSlot.objects.filter(signup__isnull=True)
+            .order_by('number')
+            .values_list('pk', 'number')[:CLAIM_WINDOW]
+        )
+        if not candidates:
+            raise FoundingSpotsExhausted()
+        random.shuffle(candidates)
+        for pk, number in candidates:
+            if FoundingSlot.objects.filter(pk=pk, signup__isnull=True).update(signup=signup):
+                return FoundingSlot(pk=pk, number=number, signup=signup)
+
+
+def claim_founding_spot(form, child_formset=None):
+    """
+    Save a founding signup (and its extra children) only if a slot is free.
+
+    Raises FoundingSpotsExhausted, with nothing written, once the list is full.
+    """
+    # Cheap read first so a full list turns people away without taking a
+    # write lock; the claim inside the transaction is still authoritative.
+    if not FoundingSlot.objects.filter(signup__isnull=True).exists():
+        raise FoundingSpotsExhausted()
+
+    with transaction.atomic():
+        signup = form.save()
+        reserve_slot(signup)
+        if child_formset is not None:
+            child_formset.instance = signup
+            child_formset.save()
+    return signup
@@ -0,0 +1,45 @@
+from django.test import TestCase
+
+from apps.founding import counters
+from apps.founding.models import FoundingFamilySignup
+from zonuko.cache import get_cache
+
+
+def create_signup(number):
+    return FoundingFamilySignup.objects.create(
+        name=f'Family {number}', email=f'family{number}@example.com', child_age_range=FoundingFamilySignup.IMAGINAUTS,
+    )
+
+
+class SignupCounterTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_count_is_served_from_the_cache(self):
+        create_signup(1)
+        with self.assertNumQueries(1):
+            self.assertEqual(counters.get_signup_count(), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.get_signup_count(), 1)
+
+    def test_signups_refresh_the_count_after_commit(self):
+        self.assertEqual(counters.get_signup_count(), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            signup = create_signup(1)
+            create_signup(2)
+        self.assertEqual(counters.get_signup_count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            signup.delete()
+        self.assertEqual(counters.get_signup_count(), 1)
+
+    def test_stats(self):
+        stats = counters.get_signup_stats(total_signups=50)
+        self.assertEqual(stats['spots_remaining'], counters.FOUNDING_LIMIT - 50)
+        self.assertEqual(stats['progress_percentage'], 50 * 100 // counters.FOUNDING_LIMIT)
+        self.assertFalse(stats['signups_closed'])
+
+        stats = counters.get_signup_stats(total_signups=counters.FOUNDING_LIMIT + 3)
+        self.assertEqual(stats['spots_remaining'], 0)
+        self.assertEqual(stats['progress_percentage'], 100)
+        self.assertTrue(stats['signups_closed'])
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.founding.counters import FOUNDING_LIMIT
+from apps.founding.forms import FoundingFamilySignupForm
+from apps.founding.models import FoundingFamilySignup, FoundingSlot
+from apps.founding.slots import FoundingSpotsExhausted, claim_founding_spot, ensure_slots, reserve_slot
+from zonuko.cache import get_cache
+
+
+def signup_form(number):
+    form = FoundingFamilySignupForm(data={
+        'name': f'Family {number}', 'email': f'family{number}@example.com', 'child_age_range': 'IMAGINAUTS',
+    })
+    assert form.is_valid(), form.errors
+    return form
+
+
+class FoundingSlotTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def fill_slots(self):
+        for number in range(FOUNDING_LIMIT):
+            signup = FoundingFamilySignup.objects.create(
+                name=f'Family {number}', email=f'filled{number}@example.com', child_age_range='IMAGINAUTS',
+            )
+            reserve_slot(signup)
+
+    def test_slots_are_allocated_up_to_the_limit(self):
+        self.assertEqual(FoundingSlot.objects.count(), FOUNDING_LIMIT)
+        self.assertEqual(ensure_slots(), 0)
+
+    def test_claims_stop_at_the_limit(self):
+        self.fill_slots()
+        self.assertFalse(FoundingSlot.objects.filter(signup__isnull=True).exists())
+        self.assertEqual(
+            sorted(FoundingSlot.objects.values_list('signup_id', flat=True)),
+            sorted(FoundingFamilySignup.objects.values_list('id', flat=True)),
+        )
+
+        with self.assertRaises(FoundingSpotsExhausted):
+            claim_founding_spot(signup_form('late'))
+        self.assertEqual(FoundingFamilySignup.objects.count(), FOUNDING_LIMIT)
+
+    def test_failed_reservation_rolls_the_signup_back(self):
+        # A claim that loses the last slot after the cheap pre-check writes nothing
+        with mock.patch('apps.founding.slots.reserve_slot', side_effect=FoundingSpotsExhausted):
+            with self.assertRaises(FoundingSpotsExhausted):
+                claim_founding_spot(signup_form('late'))
+        self.assertFalse(FoundingFamilySignup.objects.exists())
+
+    def test_deleting_a_signup_frees_its_slot(self):
+        signup = claim_founding_spot(signup_form(1))
+        self.assertEqual(FoundingSlot.objects.get(signup=signup).signup_id, signup.id)
+        signup.delete()
+        self.assertEqual(FoundingSlot.objects.filter(signup__isnull=True).count(), FOUNDING_LIMIT)
+
+    def test_signup_page_turns_people_away_when_full(self):
+        self.fill_slots()
+        response = self.client.post(reverse('founding:founding'), {
+            'name': 'Late family', 'email': 'late@example.com', 'child_age_range': 'IMAGINAUTS',
+            'children-TOTAL_FORMS': '0', 'children-INITIAL_FORMS': '0',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'all founding family spots have been claimed')
+        self.assertFalse(FoundingFamilySignup.objects.filter(email='late@example.com').exists())
@@ -8,8 +8,10 @@ from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views.generic import FormView, TemplateView
 
+from . import counters
 from .forms import FoundingFamilySignupForm, ChildFormSet
 from .models import FoundingFamilySignup
+from .slots import FoundingSpotsExhausted, claim_founding_spot
 
 
 class FoundingFamilySignupView(FormView):
@@ -18,19 +20,12 @@ class FoundingFamilySignupView(FormView):
     success_url = reverse_lazy("founding:thanks")
     
     # Set the limit for founding family signups
-    FOUNDING_LIMIT = 200
-    RESERVED_SPOTS = 0  # No reserved spots - when they're gone, they're gone!
+    FOUNDING_LIMIT = counters.FOUNDING_LIMIT
+    RESERVED_SPOTS = counters.RESERVED_SPOTS
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        total_signups = FoundingFamilySignup.objects.count()
-        available_limit = self.FOUNDING_LIMIT - self.RESERVED_SPOTS
-        
-        context['total_signups'] = total_signups
-        context['founding_limit'] = self.FOUNDING_LIMIT
-        context['spots_remaining'] = max(0, available_limit - total_signups)
-        context['signups_closed'] = total_signups >= available_limit
-        context['progress_percentage'] = min(100, int((total_signups / available_limit) * 100))
+        context.update(counters.get_signup_stats())
         
         # Add formset to context
         if 'child_formset' not in context:
@@ -48,21 +43,20 @@ class FoundingFamilySignupView(FormView):
             return self.form_invalid(form, child_formset)
 
     def form_valid(self, form, child_formset):
-        # Check if limit reached before saving
-        total_signups = FoundingFamilySignup.objects.count()
+        # The cached counter lets a full list turn people away without a
+        # write; the slot claim is what actually enforces the limit.
         available_limit = self.FOUNDING_LIMIT - self.RESERVED_SPOTS
-        
-        if total_signups >= available_limit:
+        if counters.get_signup_count() >= available_limit:
             form.add_error(None, "Sorry, all founding family spots have been claimed!")
             return self.form_invalid(form, child_formset)
-        
-        # Save the main form
-        self.object = form.save()
-        
-        # Save the children formset
-        child_formset.instance = self.object
-        child_formset.save()
-        
+
+        # Save the signup and its children together with a founding slot
+        try:
+            self.object = claim_founding_spot(form, child_formset)
+        except FoundingSpotsExhausted:
+            form.add_error(None, "Sorry, all founding family spots have been claimed!")
+            return self.form_invalid(form, child_formset)
+
         return super().form_valid(form)
     
     def form_invalid(self, form, child_formset=None):
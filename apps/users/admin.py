@@ -4,12 +4,26 @@ from django.utils import timezone
 from tinymce.widgets import TinyMCE
 import json
 from .models import (
-    ParentProfile, ChildProfile, Subscription, Project, ProjectProgress,
+    ParentProfile, ChildProfile, ChildProgressSummary, ChildDailyActivity, ChildRecommendation, Subscription, StripeWebhookEvent, Project, ProjectProgress,
     ProgressionStage, GrowthPathway, ProjectSkillMapping, InspirationShare,
     Skill, ProjectSkill, ProjectInstructionStep, ChildHelpRequest
 )
 
 
+class AgeBandListFilter(admin.SimpleListFilter):
+    """Filter projects by age band using the indexed ProjectAgeBand rows"""
+    title = "age group"
+    parameter_name = "age_band"
+
+    def lookups(self, request, model_admin):
+        return ChildProfile.AGE_RANGE_CHOICES
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(age_bands__age_band=self.value())
+        return queryset
+
+
 class ProjectAdminForm(forms.ModelForm):
     """Custom form for Project admin with rich text editors and better widgets"""
     
@@ -148,6 +162,46 @@ class SubscriptionAdmin(admin.ModelAdmin):
     )
 
 
+
+def retry_stripe_events(modeladmin, request, queryset):
+    """Send failed or waiting events back to the worker immediately"""
+    queryset.exclude(status=StripeWebhookEvent.STATUS_PROCESSED).update(
+        status=StripeWebhookEvent.STATUS_PENDING,
+        next_attempt_at=timezone.now(),
+        locked_at=None,
+    )
+
+
+retry_stripe_events.short_description = "Retry selected events now"
+
+
+def resolve_stripe_events(modeladmin, request, queryset):
+    """Mark failed events as handled by hand, so later events for their subscription can run"""
+    queryset.filter(status=StripeWebhookEvent.STATUS_FAILED).update(
+        status=StripeWebhookEvent.STATUS_PROCESSED,
+        processed_at=timezone.now(),
+        locked_at=None,
+    )
+
+
+resolve_stripe_events.short_description = "Mark selected failed events as resolved"
+
+
+@admin.register(StripeWebhookEvent)
+class StripeWebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("event_type", "event_id", "ordering_key", "status", "attempts", "stripe_created", "processed_at")
+    list_filter = ("status", "event_type")
+    search_fields = ("event_id", "ordering_key")
+    readonly_fields = (
+        "event_id", "event_type", "ordering_key", "payload", "stripe_created", "status", "attempts",
+        "last_error", "next_attempt_at", "locked_at", "received_at", "processed_at",
+    )
+    actions = [retry_stripe_events, resolve_stripe_events]
+
+    def has_add_permission(self, request):
+        return False
+
+
 class ProjectSkillInline(admin.TabularInline):
     """Inline editor for ProjectSkill through model"""
     model = ProjectSkill
@@ -171,7 +225,7 @@ class ProjectAdmin(admin.ModelAdmin):
     form = ProjectAdminForm
     list_display = ("emoji", "title", "get_type", "category", "difficulty", "get_age_ranges", "get_visibility", "is_featured", "minimum_stage", "created_at")
     search_fields = ("title", "description")
-    list_filter = ("type", "category", "difficulty", "visibility", "is_featured", "minimum_stage", "created_at")
+    list_filter = ("type", "category", "difficulty", AgeBandListFilter, "visibility", "is_featured", "minimum_stage", "created_at")
     list_editable = ("is_featured",)
     readonly_fields = ("created_at", "updated_at")
     filter_horizontal = ("prerequisites",)
@@ -254,6 +308,28 @@ class ProjectProgressAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ChildProgressSummary)
+class ChildProgressSummaryAdmin(admin.ModelAdmin):
+    list_display = ("child", "completed_count", "reflection_count", "in_progress_count", "last_activity_at", "updated_at")
+    search_fields = ("child__username",)
+    readonly_fields = ("child", "completed_count", "reflection_count", "in_progress_count", "skill_totals", "last_activity_at", "updated_at")
+
+
+@admin.register(ChildDailyActivity)
+class ChildDailyActivityAdmin(admin.ModelAdmin):
+    list_display = ("child", "day", "completions", "reflections", "creative_thinking", "practical_making", "problem_solving", "resilience")
+    search_fields = ("child__username",)
+    list_filter = ("day",)
+    readonly_fields = ("child", "day", "completions", "reflections", "creative_thinking", "practical_making", "problem_solving", "resilience")
+
+
+@admin.register(ChildRecommendation)
+class ChildRecommendationAdmin(admin.ModelAdmin):
+    list_display = ("child", "catalog_hash", "computed_at")
+    search_fields = ("child__username",)
+    readonly_fields = ("child", "project_ids", "catalog_hash", "inputs_hash", "computed_at")
+
+
 @admin.register(ChildHelpRequest)
 class ChildHelpRequestAdmin(admin.ModelAdmin):
     list_display = ("child", "project", "status", "created_at", "responded_at", "responded_by")
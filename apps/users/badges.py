@@ -0,0 +1,84 @@
+"""
+Badge Registry
+
+Declarative badge rules. Each rule names the counter it depends on and the
+threshold that earns it; badge metadata (name, description) lives here once
+and is shared by the award logic and the growth map.
+
+Evaluation is incremental: callers pass the counters that changed, only rules
+watching those counters are checked, and each counter's rules are sorted by
+threshold so the scan stops at the first one not yet reached. Earned badges
+are checked with set membership.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+
+
+# Counters rules can depend on
+TOTAL_REFLECTIONS = 'total_reflections'  # ChildProfile.total_reflections
+CHALLENGE_REFLECTIONS = 'challenge_reflections'  # reflections on completed projects (progress summary)
+
+
+@dataclass(frozen=True)
+class BadgeRule:
+    code: str
+    name: str
+    desc: str
+    counter: str
+    threshold: int
+
+    def award(self):
+        """Badge payload shown to the child when it's earned"""
+        return {'code': self.code, 'name': self.name, 'desc': self.desc}
+
+    def display(self):
+        """Badge metadata for listing earned badges"""
+        return {'name': self.name, 'desc': self.desc}
+
+
+# Award order follows registry order
+BADGE_RULES = (
+    BadgeRule('deep_thinker', '🌟 Deep Thinker', "You're thinking about your learning!", TOTAL_REFLECTIONS, 5),
+    BadgeRule('thoughtful_builder', '💭 Thoughtful Builder', 'Your reflections show real growth', TOTAL_REFLECTIONS, 10),
+    BadgeRule('reflection_master', '🧠 Reflection Master', 'You understand how you learn best', TOTAL_REFLECTIONS, 20),
+    BadgeRule('growth_mindset', '🎯 Growth Mindset', 'You know learning comes from practice', TOTAL_REFLECTIONS, 30),
+    BadgeRule('resilience_builder', '💪 Resilience Builder', "You learn from what doesn't work", CHALLENGE_REFLECTIONS, 10),
+)
+
+BADGES_BY_CODE = MappingProxyType({rule.code: rule for rule in BADGE_RULES})
+
+_RULE_ORDER = {rule.code: position for position, rule in enumerate(BADGE_RULES)}
+
+RULES_BY_COUNTER = MappingProxyType({
+    counter: tuple(sorted((rule for rule in BADGE_RULES if rule.counter == counter), key=lambda rule: rule.threshold))
+    for counter in dict.fromkeys(rule.counter for rule in BADGE_RULES)
+})
+
+
+def evaluate_badges(earned, counters, changed=None):
+    """
+    Rules newly earned with the given counter values.
+
+    Args:
+        earned: Set of badge codes already earned
+        counters: Mapping of counter name -> current value
+        changed: Counter names whose value changed (None re-checks every counter given)
+    """
+    new_rules = []
+    for counter in (counters if changed is None else changed):
+        value = counters.get(counter)
+        if value is None:
+            continue
+        for rule in RULES_BY_COUNTER.get(counter, ()):
+            if value < rule.threshold:
+                break
+            if rule.code not in earned:
+                new_rules.append(rule)
+    new_rules.sort(key=lambda rule: _RULE_ORDER[rule.code])
+    return new_rules
+
+
+def earned_badge_details(codes):
+    """Display metadata for earned badge codes, skipping retired ones"""
+    return [BADGES_BY_CODE[code].display() for code in codes if code in BADGES_BY_CODE]
@@ -0,0 +1,181 @@
+"""
+Compiled Project Catalog
+
+Versioned, immutable in-memory snapshot of the project catalog.
+The query engine filters this snapshot in Python instead of rebuilding
+the catalog from the database on every dashboard request.
+
+The snapshot is rebuilt lazily whenever the shared catalog version changes
+(bumped by the Project/ProjectSkill signal handlers in models.py) or when it
+is older than CATALOG_MAX_AGE seconds.
+
+Running more than one worker process requires a shared cache
+(CACHE_BACKEND "file" or "redis"). With "locmem" every process keeps its own
+version counter, so an admin edit only reaches the worker that saved it;
+the others keep serving their old snapshot, and the recommendation index
+built from it, for up to CATALOG_MAX_AGE seconds.
+"""
+
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.db import transaction
+
+from zonuko.cache import bump_version, current_version
+
+from .models import Project, ProjectAgeBand, ProjectSkill
+
+
+CATALOG_VERSION_KEY = 'users:catalog:version'
+CATALOG_MAX_AGE = 300  # seconds
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """
+    Immutable view of one project and the fields the engine filters on.
+
+    `project` is the template-facing model instance. It is shared between
+    requests, so callers must use materialize() to get their own copy
+    before attaching per-child attributes such as `progress`.
+    """
+    id: int
+    type: str
+    category: str
+    difficulty: int
+    minimum_stage: int
+    visibility: str
+    published_at: object
+    is_featured: bool
+    age_ranges: frozenset
+    tags: tuple
+    skill_dimensions: MappingProxyType  # growth pathway -> boost
+    skill_weights: MappingProxyType  # skill_id -> weight
+    prerequisite_ids: frozenset
+    project: Project
+
+    def is_published(self, now):
+        """Mirror of the engine's LIVE / SCHEDULED+published visibility rule"""
+        if self.visibility == Project.VISIBILITY_LIVE:
+            return True
+        if self.visibility == Project.VISIBILITY_SCHEDULED:
+            return not (self.published_at and self.published_at > now)
+        return False
+
+    def materialize(self):
+        """Return a private copy of the project instance"""
+        return copy.copy(self.project)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """All projects at one catalog version, in default Project ordering"""
+    version: int
+    built_at: float
+    entries: tuple
+    by_id: MappingProxyType
+    by_age_band: MappingProxyType
+
+    def get(self, project_id):
+        return self.by_id.get(project_id)
+
+    def for_age_band(self, age_band):
+        return self.by_age_band.get(age_band, ())
+
+
+def get_catalog_version():
+    """Current shared catalog version"""
+    return current_version(CATALOG_VERSION_KEY)
+
+
+def _bump_catalog_version():
+    bump_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """
+    Invalidate every worker's snapshot.
+
+    Deferred until the surrounding transaction commits so a concurrent
+    rebuild can't capture pre-commit rows under the new version.
+    """
+    transaction.on_commit(_bump_catalog_version)
+
+
+def build_catalog(version):
+    """Load the full catalog in four queries and compile it into a snapshot"""
+    age_bands = {}
+    for project_id, age_band in ProjectAgeBand.objects.values_list('project_id', 'age_band'):
+        age_bands.setdefault(project_id, set()).add(age_band)
+
+    skill_weights = {}
+    for project_id, skill_id, weight in ProjectSkill.objects.values_list('project_id', 'skill_id', 'weight'):
+        skill_weights.setdefault(project_id, {})[skill_id] = int(weight or 0)
+
+    prerequisites = {}
+    through = Project.prerequisites.through
+    for from_id, to_id in through.objects.values_list('from_project_id', 'to_project_id'):
+        prerequisites.setdefault(from_id, set()).add(to_id)
+
+    entries = []
+    by_age_band = {}
+    for project in Project.objects.all():
+        age_ranges = frozenset(age_bands.get(project.id, ()))
+        entry = CatalogEntry(
+            id=project.id,
+            type=project.type,
+            category=project.category,
+            difficulty=project.difficulty,
+            minimum_stage=project.minimum_stage,
+            visibility=project.visibility,
+            published_at=project.published_at,
+            is_featured=project.is_featured,
+            age_ranges=age_ranges,
+            tags=tuple(project.tags or []),
+            skill_dimensions=MappingProxyType(dict(project.skill_dimensions or {})),
+            skill_weights=MappingProxyType(skill_weights.get(project.id, {})),
+            prerequisite_ids=frozenset(prerequisites.get(project.id, ())),
+            project=project,
+        )
+        entries.append(entry)
+        for age_band in age_ranges:
+            by_age_band.setdefault(age_band, []).append(entry)
+
+    return CatalogSnapshot(
+        version=version,
+        built_at=time.monotonic(),
+        entries=tuple(entries),
+        by_id=MappingProxyType({entry.id: entry for entry in entries}),
+        by_age_band=MappingProxyType({band: tuple(items) for band, items in by_age_band.items()}),
+    )
+
+
+def _is_fresh(snapshot, version):
+    return (
+        snapshot is not None
+        and snapshot.version == version
+        and time.monotonic() - snapshot.built_at < CATALOG_MAX_AGE
+    )
+
+
+def get_catalog():
+    """Return the current snapshot, rebuilding it if the version moved on"""
+    global _snapshot
+
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if _is_fresh(snapshot, version):
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if not _is_fresh(snapshot, version):
+            snapshot = build_catalog(version)
+            _snapshot = snapshot
+    return snapshot
@@ -0,0 +1,85 @@
+"""
+Cached Child Context
+
+Lightweight, cacheable identity for a logged-in child. Kid-facing views that
+only need who the child is (lightweight JSON endpoints, session checks) take
+this from the shared cache instead of loading the ChildProfile row on every
+request.
+
+Entries live in the users:child_context namespace (see zonuko.cache) and are
+keyed by a per-child version that the ChildProfile and ProgressionStage
+signal handlers in models.py bump after commit, so profile edits, stage
+changes and deletions invalidate the cached context immediately.
+"""
+
+from dataclasses import dataclass
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+
+from zonuko.cache import bump_version, current_version, get_or_compute, make_key
+
+from .models import ChildProfile
+
+
+CHILD_CONTEXT_NAMESPACE = 'users:child_context'
+CHILD_CONTEXT_TTL = 300  # seconds
+
+
+@dataclass(frozen=True)
+class ChildContext:
+    """The ChildProfile fields kid-facing views need, plus the stage number"""
+    id: int
+    parent_id: int
+    username: str
+    age_range: str
+    avatar: str
+    quiz_completed: bool
+    current_stage: str
+    progression_stage: object  # ProgressionStage.current_stage, or None if not created yet
+
+    @property
+    def pk(self):
+        return self.id
+
+    @classmethod
+    def from_child(cls, child):
+        try:
+            stage_number = child.progression_stage.current_stage
+        except ObjectDoesNotExist:
+            stage_number = None
+        return cls(
+            id=child.id,
+            parent_id=child.parent_id,
+            username=child.username,
+            age_range=child.age_range,
+            avatar=child.avatar,
+            quiz_completed=child.quiz_completed,
+            current_stage=child.current_stage,
+            progression_stage=stage_number,
+        )
+
+
+def _version_key(child_id):
+    return f'users:child_context_version:{child_id}'
+
+
+def get_child_context(child_id):
+    """
+    Cached ChildContext for a child.
+
+    Loads the profile and progression stage in one query on a miss; raises
+    ChildProfile.DoesNotExist if the child is gone.
+    """
+    key = make_key(CHILD_CONTEXT_NAMESPACE, child_id, current_version(_version_key(child_id)))
+    return get_or_compute(
+        key,
+        lambda: ChildContext.from_child(ChildProfile.objects.select_related('progression_stage').get(id=child_id)),
+        timeout=CHILD_CONTEXT_TTL,
+        stale_ttl=0,
+    )
+
+
+def bump_child_context_version(child_id):
+    """Invalidate a child's cached context once the current transaction commits"""
+    transaction.on_commit(lambda: bump_version(_version_key(child_id)))
@@ -1,7 +1,18 @@
 from django import forms
+from django.conf import settings
+
+from zonuko.throttle import LoginThrottle
+
 from .models import ChildProfile, ChildHelpRequest, Project
 
 
+child_login_throttle = LoginThrottle(
+    'child_login',
+    username_rate=settings.CHILD_LOGIN_THROTTLE_USERNAME_RATE,
+    ip_rate=settings.CHILD_LOGIN_THROTTLE_IP_RATE,
+)
+
+
 class ChildLoginForm(forms.Form):
     """Form for child login with username and PIN"""
     username = forms.CharField(
@@ -23,17 +34,28 @@ class ChildLoginForm(forms.Form):
         })
     )
     
+    def __init__(self, *args, client_ip=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client_ip = client_ip
+        self.throttle = None
+    
     def clean(self):
         cleaned_data = super().clean()
         username = cleaned_data.get('username')
         pin = cleaned_data.get('pin')
         
         if username and pin:
+            # Rate limit before touching the database
+            decision = child_login_throttle.check(username, self.client_ip)
+            if not decision.allowed:
+                self.throttle = decision
+                raise forms.ValidationError('Too many tries! Take a break and try again in a minute.')
             try:
-                child = ChildProfile.objects.get(username__iexact=username)
+                child = ChildProfile.objects.get(username_lower=username.lower())
                 if child.pin != pin:
                     raise forms.ValidationError('Incorrect username or PIN. Please try again.')
                 cleaned_data['child'] = child
+                child_login_throttle.succeeded(username)
             except ChildProfile.DoesNotExist:
                 raise forms.ValidationError('Incorrect username or PIN. Please try again.')
         
@@ -101,7 +123,7 @@ class ChildProfileForm(forms.ModelForm):
         """Ensure username is unique (except when editing the same child)"""
         username = self.cleaned_data.get('username')
         # Check if username exists, excluding the current instance when editing
-        existing = ChildProfile.objects.filter(username__iexact=username)
+        existing = ChildProfile.objects.filter(username_lower=username.lower())
         if self.instance and self.instance.pk:
             existing = existing.exclude(pk=self.instance.pk)
         
@@ -0,0 +1,59 @@
+"""
+Growth Pathway Level Curve
+
+The points -> (level, progress %) curve shared by GrowthPathway.add_points,
+the batched pathway updater and bulk recomputation jobs.
+
+Thresholds, level bases and spans are precomputed once, so a lookup is a
+single bisect (O(log n)) instead of a scan. levels_for_points() computes
+many pathways at once: it sorts the distinct totals once and walks them
+against the thresholds in one pass, with no per-total search.
+"""
+
+from bisect import bisect_right
+
+
+class LevelCurve:
+    """Immutable level curve: thresholds[i] is the points needed for level i + 1"""
+
+    __slots__ = ('thresholds', 'max_level', '_bases', '_spans')
+
+    def __init__(self, thresholds, max_level):
+        self.thresholds = tuple(thresholds)
+        self.max_level = max_level
+        # Start of each level and the distance to the next one (0 = no next level)
+        self._bases = tuple(self.thresholds[level - 1] for level in range(1, max_level + 1))
+        self._spans = tuple(
+            self.thresholds[min(level, max_level)] - self.thresholds[level - 1]
+            for level in range(1, max_level + 1)
+        )
+
+    def level(self, points):
+        """Level reached with `points`"""
+        return max(1, min(self.max_level, bisect_right(self.thresholds, points)))
+
+    def level_and_progress(self, points):
+        """(level, progress % towards the next level) for `points`"""
+        level = self.level(points)
+        return level, self._progress(level, points)
+
+    def levels_for_points(self, points_totals):
+        """(level, progress) for each total, in input order"""
+        points_totals = list(points_totals)
+        thresholds = self.thresholds
+        results = {}
+        passed = 0  # thresholds <= points, i.e. bisect_right(thresholds, points)
+        for points in sorted(set(points_totals)):
+            while passed < len(thresholds) and thresholds[passed] <= points:
+                passed += 1
+            level = max(1, min(self.max_level, passed))
+            results[points] = (level, self._progress(level, points))
+        return [results[points] for points in points_totals]
+
+    def _progress(self, level, points):
+        span = self._spans[level - 1]
+        return int(((points - self._bases[level - 1]) / span) * 100) if span > 0 else 100
+
+
+# Each level requires progressively more points
+PATHWAY_LEVEL_CURVE = LevelCurve((0, 100, 250, 450, 700, 1000, 1350, 1750, 2200), max_level=8)
@@ -0,0 +1,24 @@
+from django.db import models
+from django.db.models.expressions import OrderBy
+
+
+class NullsLastIndex(models.Index):
+    """
+    Index whose DESC NULLS LAST columns become plain DESC on SQLite.
+
+    SQLite rejects NULLS LAST in CREATE INDEX, but already sorts NULLs last
+    in a descending column, so the plain index still matches the query's
+    ORDER BY. Other databases get the expressions as declared.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor == 'sqlite':
+            index = self.clone()
+            index.expressions = tuple(
+                OrderBy(expression.expression, descending=True)
+                if isinstance(expression, OrderBy) and expression.descending and expression.nulls_last
+                else expression
+                for expression in self.expressions
+            )
+            return models.Index.create_sql(index, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
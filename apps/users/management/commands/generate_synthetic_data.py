@@ -0,0 +1,365 @@
+"""
+Management command: python manage.py generate_synthetic_data
+Generates a large, deterministic synthetic dataset for benchmarking:
+thousands of projects, skills and ProjectSkill rows, and tens of thousands of
+children (with parents and subscriptions) with realistic progress histories.
+
+The same --seed and --anchor always produce the same rows. Everything is
+written with bulk_create, so the derived tables that signals normally
+maintain (age bands, summaries, stages, growth pathways) are built here
+directly.
+
+Synthetic rows are tagged so --reset can remove them again:
+parents use the @synthetic.zonuko.invalid email domain, projects and skills
+are prefixed with "Synthetic".
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from apps.users.catalog import bump_catalog_version
+from apps.users.models import (
+    ChildDailyActivity,
+    ChildProfile,
+    ChildProgressSummary,
+    GrowthPathway,
+    ParentProfile,
+    ProgressionStage,
+    Project,
+    ProjectAgeBand,
+    ProjectProgress,
+    ProjectSkill,
+    ProjectSkillMapping,
+    Skill,
+    Subscription,
+    update_daily_activity_on_delete,
+    update_progress_summary_on_delete,
+)
+
+
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.zonuko.invalid'
+SYNTHETIC_PREFIX = 'Synthetic'
+SYNTHETIC_PASSWORD = 'synthetic-pass'
+
+INTERESTS = ['science', 'tech', 'engineering', 'art', 'math', 'music']
+TAGS = INTERESTS + ['nature', 'space', 'robots', 'building', 'colour', 'water', 'electricity', 'animals', 'cooking', 'puzzles']
+AGE_BANDS = [choice for choice, _label in ChildProfile.AGE_RANGE_CHOICES]
+CATEGORIES = [choice for choice, _label in Project.CATEGORY_CHOICES]
+SKILL_KEYS = ChildProgressSummary.SKILL_KEYS
+PATHWAY_TYPES = [choice for choice, _label in GrowthPathway.PATHWAY_CHOICES]
+COUNTER_DELETE_HANDLERS = (update_progress_summary_on_delete, update_daily_activity_on_delete)
+
+# (share of children, min completed, max completed)
+ENGAGEMENT_TIERS = [
+    (0.30, 0, 3),
+    (0.45, 4, 20),
+    (0.20, 21, 60),
+    (0.05, 61, 150),
+]
+
+
+@contextmanager
+def progress_counters_paused():
+    """Disconnect the ProjectProgress delete handlers that maintain the counters"""
+    for handler in COUNTER_DELETE_HANDLERS:
+        post_delete.disconnect(handler, sender=ProjectProgress)
+    try:
+        yield
+    finally:
+        for handler in COUNTER_DELETE_HANDLERS:
+            post_delete.connect(handler, sender=ProjectProgress)
+
+
+class Command(BaseCommand):
+    help = 'Generate a deterministic synthetic dataset for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--projects', type=int, default=3000)
+        parser.add_argument('--skills', type=int, default=60)
+        parser.add_argument('--children', type=int, default=20000)
+        parser.add_argument('--children-per-parent', type=float, default=2.0, help='Average children per parent')
+        parser.add_argument('--anchor', help='Date histories end on (YYYY-MM-DD, default today)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Children written per batch')
+        parser.add_argument('--reset', action='store_true', help='Delete previously generated synthetic data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        anchor_date = datetime.strptime(options['anchor'], '%Y-%m-%d').date() if options['anchor'] else timezone.localdate()
+        self.anchor = timezone.make_aware(datetime.combine(anchor_date, time(18, 0)))
+
+        if options['reset']:
+            self.reset()
+        elif User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').exists():
+            raise CommandError('Synthetic data already exists. Re-run with --reset to replace it.')
+
+        skills = self.create_skills(options['skills'])
+        projects = self.create_projects(options['projects'], skills)
+        self.create_families(options['children'], options['children_per_parent'], projects, options['batch_size'])
+
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS('✅ Synthetic data generated'))
+
+    def reset(self):
+        self.stdout.write('Removing existing synthetic data...')
+        synthetic_users = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+        synthetic_projects = Project.objects.filter(title__startswith=f'{SYNTHETIC_PREFIX} ')
+        # Real children who started synthetic projects; their counters are rebuilt below
+        real_children = list(
+            ProjectProgress.objects.filter(project__in=synthetic_projects)
+            .exclude(child__parent__user__in=synthetic_users)
+            .values_list('child_id', flat=True)
+            .distinct()
+        )
+
+        # The synthetic children's summaries and daily rollups cascade away
+        # with them, so decrementing them row by row is wasted work
+        with transaction.atomic(), progress_counters_paused():
+            synthetic_users.delete()
+            synthetic_projects.delete()
+            Skill.objects.filter(name__startswith=f'{SYNTHETIC_PREFIX} ').delete()
+            ChildProgressSummary.rebuild_for(real_children)
+            ChildDailyActivity.rebuild_for(real_children)
+
+    def create_skills(self, count):
+        skills = Skill.objects.bulk_create([
+            Skill(name=f'{SYNTHETIC_PREFIX} skill {index:03d}', description='Generated for benchmarks')
+            for index in range(count)
+        ])
+        self.stdout.write(f'  Created {len(skills)} skills')
+        return skills
+
+    def create_projects(self, count, skills):
+        rng = self.rng
+        projects = []
+        for index in range(count):
+            visibility = rng.choices(
+                [Project.VISIBILITY_LIVE, Project.VISIBILITY_SCHEDULED, Project.VISIBILITY_COMING_SOON, Project.VISIBILITY_HIDDEN],
+                weights=[85, 5, 5, 5],
+            )[0]
+            published_at = None
+            if visibility == Project.VISIBILITY_SCHEDULED:
+                # Mostly already published, a few still in the future
+                published_at = self.anchor + timedelta(days=rng.randint(-120, 14))
+            category = rng.choice(CATEGORIES)
+            projects.append(Project(
+                title=f'{SYNTHETIC_PREFIX} {category} project {index:05d}',
+                description='Generated for benchmarks',
+                category=category,
+                type=Project.TYPE_SPARK if rng.random() < 0.4 else Project.TYPE_LAB,
+                difficulty=rng.choices([1, 2, 3], weights=[5, 3, 2])[0],
+                age_ranges=sorted(rng.sample(AGE_BANDS, rng.choices([1, 2], weights=[3, 1])[0])),
+                tags=rng.sample(TAGS, rng.randint(1, 4)),
+                estimated_time=rng.choice([10, 20, 30, 45, 60, 90]),
+                minimum_stage=rng.choices([1, 2, 3, 4, 5], weights=[40, 25, 17, 11, 7])[0],
+                skill_dimensions={key: rng.randint(0, 3) for key in SKILL_KEYS},
+                visibility=visibility,
+                published_at=published_at,
+                is_featured=rng.random() < 0.02,
+                order_priority=rng.randint(0, 10),
+            ))
+        projects = Project.objects.bulk_create(projects, batch_size=1000)
+
+        ProjectAgeBand.objects.bulk_create(
+            [ProjectAgeBand(project=project, age_band=band) for project in projects for band in project.age_ranges],
+            batch_size=2000,
+        )
+        ProjectSkill.objects.bulk_create(
+            [
+                ProjectSkill(project=project, skill=skill, weight=rng.randint(1, 5))
+                for project in projects
+                for skill in rng.sample(skills, rng.randint(1, min(4, len(skills))))
+            ],
+            batch_size=2000,
+        )
+        ProjectSkillMapping.objects.bulk_create(
+            [
+                ProjectSkillMapping(
+                    project=project,
+                    thinking_points=rng.choice([0, 10, 20, 30]),
+                    making_points=rng.choice([0, 10, 20, 30, 40]),
+                    problem_solving_points=rng.choice([0, 10, 20, 30]),
+                    resilience_points=rng.choice([0, 5, 10, 20]),
+                    design_planning_points=rng.choice([0, 5, 10, 20]),
+                    contribution_points=rng.choice([0, 5, 10]),
+                )
+                for project in projects
+            ],
+            batch_size=2000,
+        )
+
+        # A few projects unlock after an easier one in the same category
+        through = Project.prerequisites.through
+        by_category = {}
+        for project in projects:
+            by_category.setdefault(project.category, []).append(project)
+        prerequisites = []
+        for project in projects:
+            if project.minimum_stage > 1 and rng.random() < 0.05:
+                easier = [other for other in by_category[project.category] if other.minimum_stage < project.minimum_stage]
+                if easier:
+                    prerequisites.append(through(from_project=project, to_project=rng.choice(easier)))
+        through.objects.bulk_create(prerequisites, batch_size=2000)
+
+        self.stdout.write(f'  Created {len(projects)} projects ({len(prerequisites)} with prerequisites)')
+        return projects
+
+    def create_families(self, child_count, children_per_parent, projects, batch_size):
+        rng = self.rng
+        password = make_password(SYNTHETIC_PASSWORD)
+
+        available_by_band = {band: [] for band in AGE_BANDS}
+        for project in projects:
+            if project.visibility in (Project.VISIBILITY_LIVE, Project.VISIBILITY_SCHEDULED):
+                for band in project.age_ranges:
+                    available_by_band[band].append(project)
+        mappings = {
+            mapping.project_id: mapping.get_contributions()
+            for mapping in ProjectSkillMapping.objects.filter(project__in=projects)
+        }
+
+        # Split the children into families up front so batches never break one
+        family_sizes = []
+        remaining = child_count
+        while remaining > 0:
+            size = max(1, min(5, round(rng.expovariate(1 / children_per_parent))))
+            family_sizes.append(min(size, remaining))
+            remaining -= family_sizes[-1]
+
+        child_index = 0
+        family_index = 0
+        progress_rows = 0
+        while family_index < len(family_sizes):
+            batch_families = []
+            batch_children = 0
+            while family_index < len(family_sizes) and batch_children < batch_size:
+                batch_families.append(family_sizes[family_index])
+                batch_children += family_sizes[family_index]
+                family_index += 1
+
+            with transaction.atomic():
+                written = self.create_family_batch(batch_families, child_index, family_index - len(batch_families), password, available_by_band, mappings)
+            child_index += batch_children
+            progress_rows += written
+            self.stdout.write(f'  {child_index}/{child_count} children, {progress_rows} progress rows')
+
+    def create_family_batch(self, family_sizes, first_child_index, first_family_index, password, available_by_band, mappings):
+        rng = self.rng
+        users = User.objects.bulk_create([
+            User(
+                username=f'family{family:06d}@{SYNTHETIC_EMAIL_DOMAIN}',
+                email=f'family{family:06d}@{SYNTHETIC_EMAIL_DOMAIN}',
+                password=password,
+                date_joined=self.anchor - timedelta(days=rng.randint(0, 365)),
+            )
+            for family in range(first_family_index, first_family_index + len(family_sizes))
+        ])
+        parents = ParentProfile.objects.bulk_create([ParentProfile(user=user) for user in users])
+        Subscription.objects.bulk_create([
+            Subscription(
+                parent_profile=parent,
+                stripe_customer_id=f'cus_synthetic{parent.user_id:08d}',
+                stripe_subscription_id=f'sub_synthetic{parent.user_id:08d}',
+                status=rng.choices(['active', 'trial', 'past_due', 'canceled'], weights=[70, 15, 5, 10])[0],
+                founding_member=rng.random() < 0.05,
+                current_period_end=self.anchor + timedelta(days=rng.randint(1, 30)),
+            )
+            for parent in parents
+        ])
+
+        children = []
+        child_index = first_child_index
+        for parent, size in zip(parents, family_sizes):
+            for _ in range(size):
+                interests = rng.sample(INTERESTS, rng.randint(1, 3))
+                children.append(ChildProfile(
+                    parent=parent,
+                    username=f'synth{child_index:06d}',
+                    username_lower=f'synth{child_index:06d}',
+                    pin=f'{rng.randint(0, 9999):04d}',
+                    age_range=rng.choice(AGE_BANDS),
+                    avatar=rng.choice(ChildProfile.AVATAR_CHOICES)[0],
+                    interests=interests,
+                    quiz_completed=rng.random() < 0.8,
+                ))
+                child_index += 1
+        children = ChildProfile.objects.bulk_create(children)
+
+        progress = []
+        pathways = []
+        stages = []
+        for child in children:
+            child_progress, points = self.build_history(child, available_by_band[child.age_range], mappings)
+            progress.extend(child_progress)
+
+            completed = sum(1 for row in child_progress if row.status == ProjectProgress.STATUS_COMPLETED)
+            reflections = sum(1 for row in child_progress if row.has_reflection)
+            stage = ProgressionStage.stage_for_counts(completed, reflections)
+            child.current_stage = ChildProfile.STAGE_CHOICES[stage - 1][0]
+            child.total_reflections = reflections
+            stages.append(ProgressionStage(child=child, current_stage=stage))
+
+            for pathway_type in PATHWAY_TYPES:
+                level, percent = GrowthPathway.level_for_points(points[pathway_type])
+                pathways.append(GrowthPathway(
+                    child=child,
+                    pathway_type=pathway_type,
+                    points=points[pathway_type],
+                    level=level,
+                    progress=percent,
+                ))
+
+        ChildProfile.objects.bulk_update(children, ['current_stage', 'total_reflections'], batch_size=1000)
+        ProgressionStage.objects.bulk_create(stages, batch_size=1000)
+        GrowthPathway.objects.bulk_create(pathways, batch_size=2000)
+        ProjectProgress.objects.bulk_create(progress, batch_size=2000)
+        ChildProgressSummary.rebuild_for([child.id for child in children])
+        ChildDailyActivity.rebuild_for([child.id for child in children])
+        return len(progress)
+
+    def build_history(self, child, available, mappings):
+        """Progress rows and pathway points for one child"""
+        rng = self.rng
+        _share, low, high = rng.choices(ENGAGEMENT_TIERS, weights=[tier[0] for tier in ENGAGEMENT_TIERS])[0]
+        completed_count = min(rng.randint(low, high), len(available))
+        in_progress_count = min(rng.choice([0, 1, 1, 2, 3]), len(available) - completed_count)
+        reflection_rate = rng.uniform(0.1, 0.7)
+        active_days = rng.randint(14, 365)
+
+        chosen = rng.sample(available, completed_count + in_progress_count)
+        points = dict.fromkeys(PATHWAY_TYPES, 0)
+        rows = []
+        for position, project in enumerate(chosen):
+            started_at = self.anchor - timedelta(days=rng.uniform(0, active_days))
+            if position < completed_count:
+                completed_at = min(self.anchor, started_at + timedelta(hours=rng.uniform(0.2, 72)))
+                has_reflection = rng.random() < reflection_rate
+                rows.append(ProjectProgress(
+                    child=child,
+                    project=project,
+                    status=ProjectProgress.STATUS_COMPLETED,
+                    rating=rng.randint(3, 5) if rng.random() < 0.6 else None,
+                    started_at=started_at,
+                    completed_at=completed_at,
+                    has_reflection=has_reflection,
+                    reflection_text='I changed my design after the first test and it worked much better.' if has_reflection else '',
+                    reflection_at=completed_at if has_reflection else None,
+                    credited_skills=project.skill_dimensions or {},
+                ))
+                for pathway_type, value in mappings.get(project.id, {}).items():
+                    points[pathway_type] += value + (int(value * 0.25) if has_reflection else 0)
+            else:
+                rows.append(ProjectProgress(
+                    child=child,
+                    project=project,
+                    status=ProjectProgress.STATUS_IN_PROGRESS,
+                    started_at=started_at,
+                ))
+        return rows, points
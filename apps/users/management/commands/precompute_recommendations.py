@@ -0,0 +1,70 @@
+"""
+Management command: python manage.py precompute_recommendations
+Scores every child's top recommended projects with the same sparse scorer
+used online (apps/users/recommendations.py) and stores them in
+ChildRecommendation. Chunks of children are scored in parallel in a
+process pool; results are written back from this process.
+
+By default only children whose list is missing or stale are refreshed
+(index changed, or quiz inputs changed since the last run):
+
+    python manage.py precompute_recommendations              # incremental
+    python manage.py precompute_recommendations --all        # everyone
+    python manage.py precompute_recommendations --workers 1  # no process pool
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from apps.users.models import ChildProfile
+from apps.users.recommendations import (
+    PRECOMPUTE_LIMIT, children_needing_refresh, compute_recommendations, get_index, store_recommendations,
+)
+
+
+class Command(BaseCommand):
+    help = 'Precompute and store recommended projects per child'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recompute every child, not just stale ones')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Scoring processes (1 = in-process)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Children per scoring task')
+        parser.add_argument('--limit', type=int, default=PRECOMPUTE_LIMIT, help='Projects stored per child')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        computed_at = timezone.now()
+        # Build the index before forking so forked workers inherit it
+        fingerprint = get_index().fingerprint
+
+        if options['all']:
+            child_ids = list(ChildProfile.objects.order_by('id').values_list('id', flat=True))
+        else:
+            child_ids = children_needing_refresh(fingerprint)
+        chunk_size = max(options['chunk_size'], 1)
+        chunks = [child_ids[start:start + chunk_size] for start in range(0, len(child_ids), chunk_size)]
+
+        stored = 0
+        for catalog_hash, rows in self.score(chunks, options['workers'], options['limit']):
+            stored += store_recommendations(rows, catalog_hash, computed_at)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Scored {len(child_ids)} children in {len(chunks)} chunks in {elapsed:.2f}s')
+        self.stdout.write(self.style.SUCCESS(f'✅ Stored recommendations for {stored} children'))
+
+    def score(self, chunks, workers, limit):
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield compute_recommendations(chunk, limit)
+            return
+
+        # Forked workers must open their own database connections, and
+        # spawned ones (macOS, Windows, forkserver) start without Django set up
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=django.setup) as pool:
+            yield from pool.map(compute_recommendations, chunks, [limit] * len(chunks))
@@ -0,0 +1,58 @@
+"""
+Management command: python manage.py process_stripe_events
+Applies the Stripe webhook events the webhook request left in the
+StripeWebhookEvent inbox: ones held back behind an earlier event for their
+subscription, retries, and subscription refreshes queued by pages
+(see apps/users/stripe_events.py and subscription_sync.py).
+
+    python manage.py process_stripe_events            # drain what's due, then exit
+    python manage.py process_stripe_events --loop     # keep polling (worker process)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.users.stripe_events import process_batch
+from apps.users.subscription_sync import configure_stripe_client
+
+
+class Command(BaseCommand):
+    help = 'Process queued Stripe webhook events in batches, with retries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Events claimed per batch')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events instead of exiting')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls when idle (with --loop)')
+        parser.add_argument('--max-batches', type=int, default=0, help='Stop after this many batches (0 = no limit)')
+
+    def handle(self, *args, **options):
+        configure_stripe_client()
+        totals = {'processed': 0, 'retrying': 0, 'failed': 0, 'deferred': 0}
+        batches = 0
+
+        try:
+            while True:
+                results = process_batch(options['batch_size'])
+                batches += 1
+                for outcome, count in results.items():
+                    totals[outcome] += count
+                if results:
+                    self.stdout.write(
+                        f'Batch {batches}: {results["processed"]} processed, {results["retrying"]} retrying, '
+                        f'{results["failed"]} failed, {results["deferred"]} deferred'
+                    )
+
+                if options['max_batches'] and batches >= options['max_batches']:
+                    break
+                # A full batch usually means more is waiting; only idle on a short one
+                if sum(results.values()) < options['batch_size']:
+                    if not options['loop']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Processed {totals["processed"]} Stripe events '
+            f'({totals["retrying"]} retrying, {totals["failed"]} failed)'
+        ))
@@ -0,0 +1,27 @@
+"""
+Management command to recompute ChildProgressSummary and ChildDailyActivity
+rows from ProjectProgress.
+Use after bulk imports or raw updates that bypass the progress signal handlers.
+"""
+from django.core.management.base import BaseCommand
+from apps.users.models import ChildDailyActivity, ChildProfile, ChildProgressSummary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized per-child progress summaries from progress rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Children per rebuild batch')
+        parser.add_argument('--child', type=int, action='append', dest='child_ids', help='Only rebuild these child ids')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        child_ids = options['child_ids'] or list(ChildProfile.objects.order_by('id').values_list('id', flat=True))
+
+        rebuilt = days = 0
+        for start in range(0, len(child_ids), batch_size):
+            batch = child_ids[start:start + batch_size]
+            rebuilt += ChildProgressSummary.rebuild_for(batch)
+            days += ChildDailyActivity.rebuild_for(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {rebuilt} progress summaries and {days} daily activity rows'))
@@ -0,0 +1,51 @@
+"""
+Management command to recompute GrowthPathway level and progress from points.
+Run after retuning the level curve in apps/users/growth.py: every pathway is
+re-levelled in pk-ordered batches, and only rows whose level or progress
+actually changed are written (one bulk_update per batch).
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.users.growth import PATHWAY_LEVEL_CURVE
+from apps.users.models import GrowthPathway
+
+
+class Command(BaseCommand):
+    help = 'Recompute growth pathway levels and progress from points'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Pathways per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Report changes without writing them')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        scanned = 0
+        changed = 0
+        last_id = 0
+        while True:
+            rows = list(
+                GrowthPathway.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'points', 'level', 'progress')[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            scanned += len(rows)
+
+            computed = PATHWAY_LEVEL_CURVE.levels_for_points(points for _id, points, _level, _progress in rows)
+            updates = [
+                GrowthPathway(id=pathway_id, level=level, progress=progress)
+                for (pathway_id, _points, old_level, old_progress), (level, progress) in zip(rows, computed)
+                if (level, progress) != (old_level, old_progress)
+            ]
+            changed += len(updates)
+            if updates and not dry_run:
+                with transaction.atomic():
+                    GrowthPathway.objects.bulk_update(updates, ['level', 'progress'], batch_size=1000)
+
+        verb = 'Would update' if dry_run else 'Updated'
+        self.stdout.write(self.style.SUCCESS(f'✅ {verb} {changed} of {scanned} growth pathways'))
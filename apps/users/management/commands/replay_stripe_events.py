@@ -0,0 +1,123 @@
+"""
+Management command: python manage.py replay_stripe_events <recording.jsonl>
+Replays a recorded Stripe webhook stream (see STRIPE_WEBHOOK_RECORD_PATH)
+through the webhook endpoint, signed with the webhook secret, and reports
+ingestion throughput (events in order are applied on the webhook request).
+With --process it then drains what was left in the inbox with the
+process_stripe_events worker code and reports that throughput too.
+
+Runs in-process against the local database by default, or posts to a
+running server with --url. Nothing talks to Stripe.
+
+    python manage.py replay_stripe_events webhooks.jsonl --repeat 20 --fresh-ids --process
+"""
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.users.stripe_events import process_batch
+from apps.users.stripe_offline import load_recording, sign_payload
+from zonuko.query_budget import percentile
+
+
+DEFAULT_SECRET = 'whsec_offline'
+
+
+class Command(BaseCommand):
+    help = 'Replay recorded Stripe webhook events through the webhook endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('recording', help='JSONL file written by the webhook recorder')
+        parser.add_argument('--repeat', type=int, default=1, help='Send the stream this many times')
+        parser.add_argument('--fresh-ids', action='store_true', help='Give every replayed event a new id so none are deduplicated')
+        parser.add_argument('--secret', help='Webhook signing secret (default: STRIPE_WEBHOOK_SECRET, or a local test secret)')
+        parser.add_argument('--url', help='Post to this running server instead of in-process')
+        parser.add_argument('--process', action='store_true', help='Drain the inbox afterwards and time it')
+        parser.add_argument('--batch-size', type=int, default=100, help='Worker batch size with --process')
+
+    def handle(self, *args, **options):
+        try:
+            events = load_recording(options['recording'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {options["recording"]}: {e}')
+        if not events:
+            raise CommandError('The recording is empty')
+
+        secret = options['secret'] or settings.STRIPE_WEBHOOK_SECRET or DEFAULT_SECRET
+        with override_settings(STRIPE_WEBHOOK_SECRET=secret, STRIPE_WEBHOOK_RECORD_PATH=''):
+            send = self.http_sender(options['url']) if options['url'] else self.local_sender()
+            latencies, rejected, elapsed = self.replay(events, options['repeat'], options['fresh_ids'], secret, send)
+
+            latencies.sort()
+            self.stdout.write(
+                f'Sent {len(latencies)} events in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s), '
+                f'p50 {statistics.median(latencies):.2f}ms, p95 {percentile(latencies, 0.95):.2f}ms, '
+                f'{rejected} rejected'
+            )
+
+            if options['process']:
+                self.drain(options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Replayed {options["recording"]}'))
+
+    def replay(self, events, repeat, fresh_ids, secret, send):
+        latencies = []
+        rejected = 0
+        started = time.perf_counter()
+        for round_number in range(repeat):
+            for event in events:
+                if fresh_ids:
+                    event = {**event, 'id': f'{event["id"]}_replay{round_number}'}
+                payload = json.dumps(event)
+                sent_at = time.perf_counter()
+                status = send(payload, sign_payload(payload, secret))
+                latencies.append((time.perf_counter() - sent_at) * 1000)
+                rejected += 0 if status == 200 else 1
+        return latencies, rejected, time.perf_counter() - started
+
+    def local_sender(self):
+        client = Client(raise_request_exception=False)
+        url = reverse('users:stripe_webhook')
+        hosts = list(settings.ALLOWED_HOSTS) + ['testserver']
+
+        def send(payload, signature):
+            with override_settings(ALLOWED_HOSTS=hosts, SECURE_SSL_REDIRECT=False):
+                response = client.post(url, payload, content_type='application/json', HTTP_STRIPE_SIGNATURE=signature)
+            return response.status_code
+        return send
+
+    def http_sender(self, url):
+        def send(payload, signature):
+            request = urllib.request.Request(
+                url,
+                data=payload.encode(),
+                headers={'Content-Type': 'application/json', 'Stripe-Signature': signature},
+                method='POST',
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    return response.status
+            except urllib.error.HTTPError as e:
+                return e.code
+        return send
+
+    def drain(self, batch_size):
+        processed = failed = 0
+        started = time.perf_counter()
+        while True:
+            results = process_batch(batch_size)
+            processed += results['processed']
+            failed += results['retrying'] + results['failed']
+            if sum(results.values()) < batch_size:
+                break
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Processed {processed} events in {elapsed:.2f}s ({processed / max(elapsed, 1e-9):.0f}/s), {failed} failed'
+        )
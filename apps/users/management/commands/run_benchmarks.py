@@ -0,0 +1,222 @@
+"""
+Management command: python manage.py run_benchmarks
+Times the hot paths against the synthetic dataset (see generate_synthetic_data)
+and reports p50/p95 latency and query counts, so performance work has a
+baseline to compare against.
+
+Scenarios:
+    engine            ProjectQueryEngine.get_dashboard_lists()
+    child_dashboard   GET kids/dashboard/
+    parent_dashboard  GET dashboard/
+    update_reflection POST api/projects/<id>/reflection/
+    stripe_webhook    POST webhook/stripe/ (signed customer.subscription.updated)
+    checkout          GET subscription/start/ against the offline Stripe stand-in
+
+Writes are rolled back after each sample, so repeated runs measure the same
+data. Samples are picked with --seed, so two runs on the same dataset time the
+same children.
+
+    python manage.py generate_synthetic_data
+    python manage.py run_benchmarks --iterations 100 --json baseline.json
+"""
+import contextlib
+import io
+import json
+import random
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.users.models import ChildProfile, ProjectProgress
+from apps.users.query_engine import ProjectQueryEngine
+from apps.users.stripe_offline import sign_payload
+from zonuko.query_budget import capture_request_stats, percentile
+
+from .generate_synthetic_data import SYNTHETIC_EMAIL_DOMAIN
+
+
+SCENARIOS = ['engine', 'child_dashboard', 'parent_dashboard', 'update_reflection', 'stripe_webhook', 'checkout']
+BENCHMARK_WEBHOOK_SECRET = 'whsec_benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark dashboards, the query engine, reflections and the Stripe webhook'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, dest='scenarios', help='Only run these scenarios')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed samples per scenario')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed samples per scenario')
+        parser.add_argument('--seed', type=int, default=42, help='Seed for picking sample children')
+        parser.add_argument('--cold-cache', action='store_true', help='Clear the shared cache before every sample')
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.cold_cache = options['cold_cache']
+
+        children = list(
+            ChildProfile.objects.filter(
+                parent__user__email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}',
+                quiz_completed=True,
+            ).select_related('parent__user', 'parent__subscription').order_by('id')
+        )
+        if not children:
+            raise CommandError('No synthetic children found. Run generate_synthetic_data first.')
+        self.children = children
+
+        results = {}
+        hosts = ['testserver', 'localhost', '127.0.0.1']
+        overrides = {
+            'ALLOWED_HOSTS': hosts,
+            'STRIPE_WEBHOOK_SECRET': BENCHMARK_WEBHOOK_SECRET,
+            'STRIPE_OFFLINE': True,
+            'STRIPE_WEBHOOK_RECORD_PATH': '',
+            'SECURE_SSL_REDIRECT': False,
+        }
+        with override_settings(**overrides):
+            for scenario in options['scenarios'] or SCENARIOS:
+                prepare = getattr(self, f'prepare_{scenario}')
+                results[scenario] = self.run_scenario(scenario, prepare, options['warmup'], options['iterations'])
+
+        self.print_report(results, len(children))
+        if options['json_path']:
+            with open(options['json_path'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f'Results written to {options["json_path"]}')
+
+    def run_scenario(self, name, prepare, warmup, iterations):
+        """Time `iterations` samples; prepare() returns the callable to time"""
+        self.stdout.write(f'Running {name}...')
+        latencies = []
+        query_counts = []
+        db_times = []
+        failures = 0
+
+        for index in range(warmup + iterations):
+            sample = prepare()
+            if self.cold_cache:
+                cache.clear()
+
+            with transaction.atomic(), contextlib.redirect_stdout(io.StringIO()):
+                with capture_request_stats() as stats:
+                    started = time.perf_counter()
+                    ok = sample()
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+
+            if index < warmup:
+                continue
+            latencies.append(elapsed * 1000)
+            query_counts.append(stats.query_count)
+            db_times.append(stats.db_time * 1000)
+            failures += 0 if ok else 1
+
+        latencies.sort()
+        query_counts.sort()
+        return {
+            'samples': len(latencies),
+            'failures': failures,
+            'p50_ms': round(statistics.median(latencies), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'max_ms': round(latencies[-1], 2),
+            'queries_p50': statistics.median(query_counts),
+            'queries_max': query_counts[-1],
+            'db_ms_p50': round(statistics.median(db_times), 2),
+        }
+
+    def print_report(self, results, child_count):
+        self.stdout.write('')
+        self.stdout.write(f'Benchmark over {child_count} synthetic children (latency in ms)')
+        header = f'{"scenario":<18} {"n":>5} {"p50":>9} {"p95":>9} {"max":>9} {"queries":>9} {"q max":>7} {"db p50":>8} {"fail":>5}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<18} {result["samples"]:>5} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} '
+                f'{result["max_ms"]:>9.2f} {result["queries_p50"]:>9} {result["queries_max"]:>7} '
+                f'{result["db_ms_p50"]:>8.2f} {result["failures"]:>5}'
+            )
+
+    # Scenario setup: each prepare_* runs untimed and returns the timed call
+
+    def _pick_child(self):
+        return self.rng.choice(self.children)
+
+    def _client(self):
+        # Errors count as failed samples instead of aborting the run
+        return Client(raise_request_exception=False)
+
+    def _child_client(self, child):
+        client = self._client()
+        session = client.session
+        session['child_id'] = child.id
+        session.save()
+        return client
+
+    def prepare_engine(self):
+        child_id = self._pick_child().id
+
+        def sample():
+            child = ChildProfile.objects.get(id=child_id)
+            ProjectQueryEngine(child).get_dashboard_lists()
+            return True
+        return sample
+
+    def prepare_child_dashboard(self):
+        client = self._child_client(self._pick_child())
+        url = reverse('users:child_dashboard')
+        return lambda: client.get(url).status_code == 200
+
+    def prepare_parent_dashboard(self):
+        client = self._client()
+        client.force_login(self._pick_child().parent.user)
+        url = reverse('users:dashboard')
+        return lambda: client.get(url).status_code == 200
+
+    def prepare_update_reflection(self):
+        progress = None
+        while progress is None:
+            child = self._pick_child()
+            progress = (
+                ProjectProgress.objects.filter(child=child, status=ProjectProgress.STATUS_COMPLETED)
+                .order_by('id')
+                .first()
+            )
+        client = self._child_client(child)
+        url = reverse('users:update_reflection', args=[progress.id])
+        body = json.dumps({'reflection_text': 'I tried a second design and it held twice as much weight.'})
+        return lambda: client.post(url, body, content_type='application/json').status_code == 200
+
+    def prepare_stripe_webhook(self):
+        subscription = self._pick_child().parent.subscription
+        payload = json.dumps({
+            'id': f'evt_benchmark_{subscription.id}',
+            'object': 'event',
+            'type': 'customer.subscription.updated',
+            'data': {'object': {
+                'id': subscription.stripe_subscription_id,
+                'object': 'subscription',
+                'status': 'active',
+                'current_period_end': int(time.time()) + 30 * 86400,
+            }},
+        })
+        client = self._client()
+        url = reverse('users:stripe_webhook')
+        headers = {'HTTP_STRIPE_SIGNATURE': sign_payload(payload, BENCHMARK_WEBHOOK_SECRET)}
+        return lambda: client.post(url, payload, content_type='application/json', **headers).status_code == 200
+
+    def prepare_checkout(self):
+        # Only parents without an active subscription get a checkout session
+        child = self._pick_child()
+        while child.parent.subscription.is_active:
+            child = self._pick_child()
+        client = self._client()
+        client.force_login(child.parent.user)
+        url = reverse('users:start_subscription')
+        success_url = reverse('users:subscription_success')
+        return lambda: client.get(url).get('Location', '').endswith(success_url)
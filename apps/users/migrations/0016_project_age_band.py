@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_age_bands(apps, schema_editor):
+    Project = apps.get_model('users', 'Project')
+    ProjectAgeBand = apps.get_model('users', 'ProjectAgeBand')
+    rows = [
+        ProjectAgeBand(project_id=project_id, age_band=age_band)
+        for project_id, age_ranges in Project.objects.values_list('id', 'age_ranges')
+        for age_band in set(age_ranges or [])
+    ]
+    ProjectAgeBand.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0015_childhelprequest_responded_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAgeBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('age_band', models.CharField(choices=[('IMAGINAUTS', 'Imaginauts (6–10)'), ('NAVIGATORS', 'Navigators (11–13)'), ('TRAILBLAZERS', 'Trailblazers (14–16)')], max_length=50)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='age_bands', to='users.project')),
+            ],
+            options={
+                'verbose_name': 'Project Age Band',
+                'verbose_name_plural': 'Project Age Bands',
+                'unique_together': {('age_band', 'project')},
+            },
+        ),
+        migrations.RunPython(backfill_age_bands, migrations.RunPython.noop),
+    ]
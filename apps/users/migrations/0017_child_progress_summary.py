@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-16 22:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SKILL_KEYS = ('creative_thinking', 'practical_making', 'problem_solving', 'resilience')
+
+
+def backfill_summaries(apps, schema_editor):
+    ChildProfile = apps.get_model('users', 'ChildProfile')
+    ChildProgressSummary = apps.get_model('users', 'ChildProgressSummary')
+    ProjectProgress = apps.get_model('users', 'ProjectProgress')
+
+    summaries = {
+        child_id: ChildProgressSummary(child_id=child_id, skill_totals={key: 0 for key in SKILL_KEYS})
+        for child_id in ChildProfile.objects.values_list('id', flat=True)
+    }
+    for progress in ProjectProgress.objects.select_related('project').iterator():
+        summary = summaries.get(progress.child_id)
+        if summary is None:
+            continue
+        completed = progress.status == 'completed'
+        if completed:
+            summary.completed_count += 1
+            dimensions = progress.project.skill_dimensions or {}
+            for key in SKILL_KEYS:
+                summary.skill_totals[key] += int(dimensions.get(key, 0) or 0)
+        if completed and progress.reflection_text:
+            summary.reflection_count += 1
+        if progress.status == 'in_progress':
+            summary.in_progress_count += 1
+        for value in (progress.started_at, progress.completed_at, progress.reflection_at):
+            if value and (summary.last_activity_at is None or value > summary.last_activity_at):
+                summary.last_activity_at = value
+
+    ChildProgressSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0016_project_age_band'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChildProgressSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_count', models.IntegerField(default=0)),
+                ('reflection_count', models.IntegerField(default=0, help_text='Completed projects with a written reflection')),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('skill_totals', models.JSONField(default=dict, help_text='Summed skill_dimensions of completed projects')),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('child', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progress_summary', to='users.childprofile')),
+            ],
+            options={
+                'verbose_name': 'Child Progress Summary',
+                'verbose_name_plural': 'Child Progress Summaries',
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
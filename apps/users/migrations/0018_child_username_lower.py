@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:02
+
+from django.db import migrations, models
+
+
+def backfill_username_lower(apps, schema_editor):
+    """Fill username_lower in batches, using the same lower() as ChildProfile.save()"""
+    ChildProfile = apps.get_model("users", "ChildProfile")
+    seen = {}
+    batch = []
+    for child in ChildProfile.objects.only("id", "username").order_by("id").iterator(chunk_size=2000):
+        child.username_lower = child.username.lower()
+        if child.username_lower in seen:
+            raise RuntimeError(
+                f"Child usernames {seen[child.username_lower]!r} and {child.username!r} differ only by case. "
+                "Rename one of them before migrating."
+            )
+        seen[child.username_lower] = child.username
+        batch.append(child)
+        if len(batch) >= 2000:
+            ChildProfile.objects.bulk_update(batch, ["username_lower"])
+            batch = []
+    if batch:
+        ChildProfile.objects.bulk_update(batch, ["username_lower"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0017_child_progress_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='childprofile',
+            name='username_lower',
+            field=models.CharField(editable=False, max_length=30, null=True),
+        ),
+        migrations.RunPython(backfill_username_lower, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0018_child_username_lower'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='childprofile',
+            name='username_lower',
+            field=models.CharField(editable=False, help_text='Lowercased username, for case-insensitive login lookups', max_length=30, unique=True),
+        ),
+    ]
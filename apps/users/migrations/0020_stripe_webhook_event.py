@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0019_child_username_lower_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeWebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('ordering_key', models.CharField(blank=True, help_text='Stripe subscription (or customer) the event belongs to', max_length=255)),
+                ('payload', models.JSONField(help_text='Full Stripe event as received')),
+                ('stripe_created', models.DateTimeField(help_text='When Stripe created the event')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Stripe Webhook Event',
+                'verbose_name_plural': 'Stripe Webhook Events',
+                'ordering': ['stripe_created', 'id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='users_stripe_due_idx'), models.Index(fields=['ordering_key', 'status'], name='users_stripe_order_idx')],
+            },
+        ),
+    ]
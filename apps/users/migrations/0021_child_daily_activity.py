@@ -0,0 +1,60 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+SKILL_KEYS = ('creative_thinking', 'practical_making', 'problem_solving', 'resilience')
+
+
+def backfill_daily_activity(apps, schema_editor):
+    ChildDailyActivity = apps.get_model('users', 'ChildDailyActivity')
+    ProjectProgress = apps.get_model('users', 'ProjectProgress')
+
+    rows = {}
+    for progress in ProjectProgress.objects.select_related('project').iterator():
+        if progress.status == 'completed' and progress.completed_at:
+            day = timezone.localdate(progress.completed_at)
+            row = rows.setdefault((progress.child_id, day), ChildDailyActivity(child_id=progress.child_id, day=day))
+            row.completions += 1
+            dimensions = progress.project.skill_dimensions or {}
+            for key in SKILL_KEYS:
+                setattr(row, key, getattr(row, key) + int(dimensions.get(key, 0) or 0))
+        if progress.reflection_at and (progress.reflection_text or '').strip():
+            day = timezone.localdate(progress.reflection_at)
+            row = rows.setdefault((progress.child_id, day), ChildDailyActivity(child_id=progress.child_id, day=day))
+            row.reflections += 1
+
+    ChildDailyActivity.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0020_stripe_webhook_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChildDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completions', models.IntegerField(default=0)),
+                ('reflections', models.IntegerField(default=0)),
+                ('creative_thinking', models.IntegerField(default=0)),
+                ('practical_making', models.IntegerField(default=0)),
+                ('problem_solving', models.IntegerField(default=0)),
+                ('resilience', models.IntegerField(default=0)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to='users.childprofile')),
+            ],
+            options={
+                'verbose_name': 'Child Daily Activity',
+                'verbose_name_plural': 'Child Daily Activity',
+                'ordering': ['child', 'day'],
+                'unique_together': {('child', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_activity, migrations.RunPython.noop),
+    ]
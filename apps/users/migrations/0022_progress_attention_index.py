@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:18
+
+import apps.users.indexes
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0021_child_daily_activity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectprogress',
+            index=apps.users.indexes.NullsLastIndex(
+                models.F('child'),
+                models.F('status'),
+                django.db.models.expressions.OrderBy(models.F('started_at'), descending=True, nulls_last=True),
+                django.db.models.expressions.OrderBy(models.F('id'), descending=True),
+                name='users_progress_attention_idx',
+            ),
+        ),
+    ]
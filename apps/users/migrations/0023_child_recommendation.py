@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0022_progress_attention_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChildRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_ids', models.JSONField(default=list, help_text='Recommended project ids, best first')),
+                ('catalog_hash', models.CharField(help_text='Fingerprint of the recommendation index the list was scored against', max_length=32)),
+                ('inputs_hash', models.CharField(help_text="Fingerprint of the child's age band and quiz results", max_length=32)),
+                ('computed_at', models.DateTimeField(help_text='When the run that produced this list started')),
+                ('child', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation', to='users.childprofile')),
+            ],
+            options={
+                'verbose_name': 'Child Recommendation',
+                'verbose_name_plural': 'Child Recommendations',
+            },
+        ),
+    ]
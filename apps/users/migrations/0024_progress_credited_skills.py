@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-17 00:04
+
+from django.db import migrations, models
+
+
+def backfill_credited_skills(apps, schema_editor):
+    # The counters were built from the projects' current skill_dimensions
+    ProjectProgress = apps.get_model('users', 'ProjectProgress')
+
+    batch = []
+    for progress in ProjectProgress.objects.filter(status='completed').select_related('project').iterator():
+        progress.credited_skills = progress.project.skill_dimensions or {}
+        batch.append(progress)
+        if len(batch) >= 500:
+            ProjectProgress.objects.bulk_update(batch, ['credited_skills'])
+            batch = []
+    ProjectProgress.objects.bulk_update(batch, ['credited_skills'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0023_child_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectprogress',
+            name='credited_skills',
+            field=models.JSONField(blank=True, default=dict, help_text="The project's skill_dimensions as added to the progress counters at completion"),
+        ),
+        migrations.RunPython(backfill_credited_skills, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,17 @@
-from django.db import models
+from collections import namedtuple
+
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
 
+from .badges import CHALLENGE_REFLECTIONS, TOTAL_REFLECTIONS, evaluate_badges
+from .growth import PATHWAY_LEVEL_CURVE
+from .indexes import NullsLastIndex
+
 
 class ParentProfile(models.Model):
     """Extended profile for parent/guardian users"""
@@ -71,6 +78,7 @@ class ChildProfile(models.Model):
 
     parent = models.ForeignKey(ParentProfile, on_delete=models.CASCADE, related_name="children")
     username = models.CharField(max_length=30, unique=True)
+    username_lower = models.CharField(max_length=30, unique=True, editable=False, help_text='Lowercased username, for case-insensitive login lookups')
     pin = models.CharField(max_length=4, help_text="4-digit PIN for child login")
     age_range = models.CharField(max_length=50, choices=AGE_RANGE_CHOICES)
     avatar = models.CharField(max_length=20, choices=AVATAR_CHOICES, default='astronaut')
@@ -95,6 +103,14 @@ class ChildProfile(models.Model):
     def __str__(self):
         return f"{self.username} ({self.age_range})"
     
+    def save(self, *args, **kwargs):
+        # Keep the case-insensitive lookup column in step with username
+        self.username_lower = self.username.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'username' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'username_lower'}
+        super().save(*args, **kwargs)
+    
     def get_avatar_emoji(self):
         """Get the emoji for the avatar"""
         for code, label in self.AVATAR_CHOICES:
@@ -106,127 +122,138 @@ class ChildProfile(models.Model):
         """Sum of all pathway progress"""
         return self.creative_thinking + self.practical_making + self.problem_solving + self.resilience
     
+    def get_progress_summary(self):
+        """Maintained progress counters (created on first access for legacy rows)"""
+        try:
+            return self.progress_summary
+        except ChildProgressSummary.DoesNotExist:
+            summary, _ = ChildProgressSummary.objects.get_or_create(child=self)
+            return summary
+    
     def get_projects_completed_count(self):
         """Count completed projects"""
-        return self.project_progress.filter(status='completed').count()
+        return self.get_progress_summary().completed_count
     
     def calculate_stage(self):
         """Determine current stage based on progress"""
         completed = self.get_projects_completed_count()
-        reflections = self.total_reflections
-        
-        # Stage thresholds
-        if completed >= 25 and reflections >= 10:
-            return self.INDEPENDENT_MAKER
-        elif completed >= 15 and reflections >= 3:
-            return self.DESIGNER
-        elif completed >= 8:
-            return self.BUILDER
-        elif completed >= 3:
-            return self.EXPERIMENTER
-        else:
-            return self.EXPLORER
+        stage_number = ProgressionStage.stage_for_counts(completed, self.total_reflections)
+        return self.STAGE_CHOICES[stage_number - 1][0]
     
-    def update_stage(self):
+    def update_stage(self, save=True):
         """Update stage and check for advancement"""
         old_stage = self.current_stage
         new_stage = self.calculate_stage()
         
         if new_stage != old_stage:
             self.current_stage = new_stage
-            self.save()
+            if save:
+                self.save(update_fields=['current_stage', 'updated_at'])
             return True  # Stage advanced!
         return False
     
-    def check_and_award_badges(self):
-        """Check for new badge eligibility"""
-        new_badges = []
-        
-        # Reflection badges
-        if self.total_reflections >= 5 and 'deep_thinker' not in self.badges_earned:
-            self.badges_earned.append('deep_thinker')
-            new_badges.append({'code': 'deep_thinker', 'name': '🌟 Deep Thinker', 'desc': "You're thinking about your learning!"})
-        
-        if self.total_reflections >= 10 and 'thoughtful_builder' not in self.badges_earned:
-            self.badges_earned.append('thoughtful_builder')
-            new_badges.append({'code': 'thoughtful_builder', 'name': '💭 Thoughtful Builder', 'desc': 'Your reflections show real growth'})
-        
-        if self.total_reflections >= 20 and 'reflection_master' not in self.badges_earned:
-            self.badges_earned.append('reflection_master')
-            new_badges.append({'code': 'reflection_master', 'name': '🧠 Reflection Master', 'desc': 'You understand how you learn best'})
-        
-        if self.total_reflections >= 30 and 'growth_mindset' not in self.badges_earned:
-            self.badges_earned.append('growth_mindset')
-            new_badges.append({'code': 'growth_mindset', 'name': '🎯 Growth Mindset', 'desc': 'You know learning comes from practice'})
-        
-        # Resilience builder (check for reflections on challenges)
-        challenge_reflections = self.project_progress.filter(
-            status='completed',
-            reflection_text__isnull=False
-        ).exclude(reflection_text='').count()
-        
-        if challenge_reflections >= 10 and 'resilience_builder' not in self.badges_earned:
-            self.badges_earned.append('resilience_builder')
-            new_badges.append({'code': 'resilience_builder', 'name': '💪 Resilience Builder', 'desc': 'You learn from what doesn\'t work'})
+    def check_and_award_badges(self, save=True, challenge_reflections=None, changed=None):
+        """
+        Check for new badge eligibility (rules live in apps/users/badges.py).
+
+        Pass `changed` (badge counter names) to only re-check rules watching
+        those counters, and `challenge_reflections` when the count is already
+        known (e.g. from the progress summary) to skip counting progress rows.
+        """
+        counters = {TOTAL_REFLECTIONS: self.total_reflections}
+        if changed is None or CHALLENGE_REFLECTIONS in changed:
+            if challenge_reflections is None:
+                challenge_reflections = self.project_progress.filter(
+                    status='completed',
+                    reflection_text__isnull=False
+                ).exclude(reflection_text='').count()
+            counters[CHALLENGE_REFLECTIONS] = challenge_reflections
+
+        new_rules = evaluate_badges(set(self.badges_earned), counters, changed)
+        for rule in new_rules:
+            self.badges_earned.append(rule.code)
         
-        if new_badges:
-            self.save()
+        if new_rules and save:
+            self.save(update_fields=['badges_earned', 'updated_at'])
         
-        return new_badges
+        return [rule.award() for rule in new_rules]
     
     def get_pathway_percentage(self, pathway_value, max_value=100):
         """Calculate percentage for progress bar display"""
         return min(100, int((pathway_value / max_value) * 100))
     
+    # Fields apply_project_completion_boost may change, written in one UPDATE
+    COMPLETION_BOOST_FIELDS = [
+        'creative_thinking', 'practical_making', 'problem_solving', 'resilience',
+        'total_reflections', 'current_stage', 'badges_earned', 'updated_at',
+    ]
+
     def apply_project_completion_boost(self, project, has_thoughtful_reflection=False):
         """
         Apply skill pathway boosts when a project is completed
         Returns: dict of growth messages to show the child
+
+        Boosts, stage and badges are computed on a row-locked copy of the
+        profile from the maintained progress counters, then written with a
+        single UPDATE, so concurrent reflections can't overwrite each other.
         """
         skill_dims = project.skill_dimensions or {}
         growth_messages = []
         
         # Reflection multiplier: 1.5x if thoughtful reflection
         multiplier = 1.5 if has_thoughtful_reflection else 1.0
-        
-        # Apply boosts to each pathway
-        if skill_dims.get('creative_thinking'):
-            boost = int(skill_dims['creative_thinking'] * multiplier)
-            self.creative_thinking += boost
-            if boost > 0:
-                growth_messages.append(f'🧠 Creative Thinking +{boost}')
-        
-        if skill_dims.get('practical_making'):
-            boost = int(skill_dims['practical_making'] * multiplier)
-            self.practical_making += boost
-            if boost > 0:
-                growth_messages.append(f'🛠 Practical Making +{boost}')
-        
-        if skill_dims.get('problem_solving'):
-            boost = int(skill_dims['problem_solving'] * multiplier)
-            self.problem_solving += boost
-            if boost > 0:
-                growth_messages.append(f'🔍 Problem Solving +{boost}')
-        
-        if skill_dims.get('resilience'):
-            boost = int(skill_dims['resilience'] * multiplier)
-            self.resilience += boost
-            if boost > 0:
-                growth_messages.append(f'💪 Resilience +{boost}')
-        
-        # Bonus resilience for reflecting
-        if has_thoughtful_reflection:
-            self.resilience += 2
-            self.total_reflections += 1
-            growth_messages.append('💭 Reflection bonus!')
-        
-        self.save()
-        
-        # Check for stage advancement
-        stage_advanced = self.update_stage()
-        
-        # Check for new badges
-        new_badges = self.check_and_award_badges()
+
+        with transaction.atomic():
+            child = ChildProfile.objects.select_for_update().get(pk=self.pk)
+            
+            # Apply boosts to each pathway
+            if skill_dims.get('creative_thinking'):
+                boost = int(skill_dims['creative_thinking'] * multiplier)
+                child.creative_thinking += boost
+                if boost > 0:
+                    growth_messages.append(f'🧠 Creative Thinking +{boost}')
+            
+            if skill_dims.get('practical_making'):
+                boost = int(skill_dims['practical_making'] * multiplier)
+                child.practical_making += boost
+                if boost > 0:
+                    growth_messages.append(f'🛠 Practical Making +{boost}')
+            
+            if skill_dims.get('problem_solving'):
+                boost = int(skill_dims['problem_solving'] * multiplier)
+                child.problem_solving += boost
+                if boost > 0:
+                    growth_messages.append(f'🔍 Problem Solving +{boost}')
+            
+            if skill_dims.get('resilience'):
+                boost = int(skill_dims['resilience'] * multiplier)
+                child.resilience += boost
+                if boost > 0:
+                    growth_messages.append(f'💪 Resilience +{boost}')
+            
+            # Bonus resilience for reflecting
+            if has_thoughtful_reflection:
+                child.resilience += 2
+                child.total_reflections += 1
+                growth_messages.append('💭 Reflection bonus!')
+            
+            # Check for stage advancement and new badges from the summary counters
+            summary = child.get_progress_summary()
+            stage_advanced = child.update_stage(save=False)
+            # Only reflection counters move here, so only their badge rules are re-checked
+            changed = (TOTAL_REFLECTIONS, CHALLENGE_REFLECTIONS) if has_thoughtful_reflection else ()
+            new_badges = child.check_and_award_badges(
+                save=False,
+                # Maintained with the same rule as the fallback query: completed + reflection text
+                challenge_reflections=summary.reflection_count,
+                changed=changed,
+            )
+            
+            child.save(update_fields=self.COMPLETION_BOOST_FIELDS)
+
+        # Keep the caller's instance in step with what was written
+        for field in self.COMPLETION_BOOST_FIELDS:
+            setattr(self, field, getattr(child, field))
         
         return {
             'growth_messages': growth_messages,
@@ -324,6 +351,55 @@ class Subscription(models.Model):
         verbose_name_plural = "Subscriptions"
 
 
+class StripeWebhookEvent(models.Model):
+    """
+    Durable inbox for verified Stripe webhook events.
+
+    The webhook endpoint records the event (the unique event_id makes
+    Stripe's retries no-ops) and applies it unless an earlier event for the
+    same ordering_key (the Stripe subscription or customer) is outstanding.
+    The process_stripe_events worker applies the rest in batches, oldest
+    first per ordering_key, retrying failures with backoff. Subscription
+    refreshes queued by pages (subscription_sync.py) go through it too.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_PROCESSED = 'processed'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_PROCESSED, 'Processed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    ordering_key = models.CharField(max_length=255, blank=True, help_text='Stripe subscription (or customer) the event belongs to')
+    payload = models.JSONField(help_text='Full Stripe event as received')
+    stripe_created = models.DateTimeField(help_text='When Stripe created the event')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['stripe_created', 'id']
+        verbose_name = "Stripe Webhook Event"
+        verbose_name_plural = "Stripe Webhook Events"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_stripe_due_idx'),
+            models.Index(fields=['ordering_key', 'status'], name='users_stripe_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} ({self.status})"
+
+
 class Skill(models.Model):
     """Shared skill taxonomy across entire Imaginauts system"""
     name = models.CharField(max_length=100, unique=True)
@@ -462,6 +538,43 @@ class Project(models.Model):
         verbose_name_plural = "Projects"
 
 
+class ProjectAgeBand(models.Model):
+    """
+    Indexed age-band membership for projects.
+
+    Mirrors Project.age_ranges (the admin-edited source of truth) so that
+    age-band filtering is an index lookup instead of a substring scan over
+    the JSON column. Kept in sync by the Project post_save handler.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='age_bands')
+    age_band = models.CharField(max_length=50, choices=ChildProfile.AGE_RANGE_CHOICES)
+
+    class Meta:
+        unique_together = ('age_band', 'project')
+        verbose_name = 'Project Age Band'
+        verbose_name_plural = 'Project Age Bands'
+
+    def __str__(self):
+        return f"{self.project_id} → {self.age_band}"
+
+
+def sync_project_age_bands(project):
+    """Bring ProjectAgeBand rows in line with project.age_ranges"""
+    wanted = set(project.age_ranges or [])
+    existing = set(ProjectAgeBand.objects.filter(project=project).values_list('age_band', flat=True))
+
+    stale = existing - wanted
+    if stale:
+        ProjectAgeBand.objects.filter(project=project, age_band__in=stale).delete()
+
+    missing = wanted - existing
+    if missing:
+        ProjectAgeBand.objects.bulk_create(
+            [ProjectAgeBand(project=project, age_band=age_band) for age_band in sorted(missing)],
+            ignore_conflicts=True,
+        )
+
+
 class ProjectInstructionStep(models.Model):
     """Structured project instruction step with optional uploaded image."""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='instruction_step_items')
@@ -506,17 +619,356 @@ class ProjectProgress(models.Model):
     reflection_text = models.TextField(blank=True, help_text="Deeper reflection on learning")
     has_reflection = models.BooleanField(default=False, help_text="Whether child provided meaningful reflection")
     reflection_at = models.DateTimeField(null=True, blank=True)
+
+    # What the counters were credited with when the row was completed
+    credited_skills = models.JSONField(
+        default=dict, blank=True,
+        help_text="The project's skill_dimensions as added to the progress counters at completion",
+    )
     
     def __str__(self):
         return f"{self.child.username} - {self.project.title} ({self.status})"
+
+    # Fields the counter handlers diff against (see ProgressSummaryState / DailyActivityState)
+    BASELINE_FIELDS = (
+        'child_id', 'status', 'completed_at', 'has_reflection', 'reflection_text', 'reflection_at', 'credited_skills',
+    )
+
+    def _lock_baseline(self):
+        """
+        Lock the stored row and reload what it contributes to the counters.
+
+        Must run inside the transaction that saves or deletes the row. Two
+        requests that loaded the same row can't then both apply the same
+        transition: the second waits for the lock and diffs against the
+        first one's committed result. Returns False if the row is gone.
+        """
+        stored = ProjectProgress.objects.select_for_update().filter(pk=self.pk).only(*self.BASELINE_FIELDS).first()
+        if stored is None:
+            return False
+        self._summary_state = stored._summary_state
+        self._activity_state = stored._activity_state
+        self._loaded_status = stored._loaded_status
+        self._credited_skills = stored._credited_skills
+        return True
+
+    def _credit_skills(self, kwargs):
+        """
+        Record the skill points a completion adds to the counters.
+
+        Taken from the project when the row becomes completed and kept while
+        it stays completed, so later edits to the project's skill_dimensions
+        can't change what an un-completion or delete takes away.
+        """
+        was_completed = getattr(self, '_summary_state', ProgressSummaryState.EMPTY).completed
+        if self.status != self.STATUS_COMPLETED:
+            self.credited_skills = {}
+        elif was_completed:
+            # From the locked row, in case this copy was loaded before another save
+            self.credited_skills = _credited_before(self)
+        else:
+            self.credited_skills = dict(_progress_skill_dimensions(self))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'credited_skills'}
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or self.pk is None:
+            self._credit_skills(kwargs)
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic():
+                self._lock_baseline()
+                self._credit_skills(kwargs)
+                super().save(*args, **kwargs)
+        # The counter handlers have run; this is now the stored baseline
+        self._credited_skills = self.credited_skills
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            if not self._lock_baseline():
+                # Already deleted by a concurrent request; its handlers did the bookkeeping
+                return 0, {}
+            return super().delete(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row contributed to the child's summary so saves can apply deltas
+        if ProgressSummaryState.FIELDS.issubset(field_names):
+            instance._summary_state = ProgressSummaryState.of(instance)
+        if DailyActivityState.FIELDS.issubset(field_names):
+            instance._activity_state = DailyActivityState.of(instance)
+        # Status as loaded, so growth is only granted on the transition into completed
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        # Points to take back if the row stops counting as completed
+        if 'credited_skills' in field_names:
+            instance._credited_skills = instance.credited_skills
+        return instance
     
     class Meta:
         unique_together = ['child', 'project']
         ordering = ['-started_at']
+        indexes = [
+            # Parent dashboard needs-attention feed (per child, newest first). The
+            # NULLS LAST must match the feed's ORDER BY, or PostgreSQL can't read
+            # pages straight off the index
+            NullsLastIndex(
+                F('child'), F('status'), F('started_at').desc(nulls_last=True), F('id').desc(),
+                name='users_progress_attention_idx',
+            ),
+        ]
         verbose_name = "Project Progress"
         verbose_name_plural = "Project Progress"
 
 
+class ProgressSummaryState(namedtuple('ProgressSummaryState', ['completed', 'reflected', 'in_progress'])):
+    """What a single ProjectProgress row contributes to ChildProgressSummary (0 or 1 each)"""
+    FIELDS = frozenset({'status', 'reflection_text'})
+
+    @classmethod
+    def of(cls, progress):
+        return cls(
+            completed=int(progress.status == ProjectProgress.STATUS_COMPLETED),
+            # Same rule as the CHALLENGE_REFLECTIONS badge counter
+            reflected=int(progress.status == ProjectProgress.STATUS_COMPLETED and bool(progress.reflection_text)),
+            in_progress=int(progress.status == ProjectProgress.STATUS_IN_PROGRESS),
+        )
+
+
+ProgressSummaryState.EMPTY = ProgressSummaryState(0, 0, 0)
+
+
+class ChildProgressSummary(models.Model):
+    """
+    Materialized per-child progress counters.
+
+    Maintained incrementally by the ProjectProgress save/delete handlers so
+    dashboards and stage calculation read counters instead of aggregating
+    progress rows. Skill totals sum the credited_skills of completed rows,
+    which hold each project's skill_dimensions as they were at completion;
+    `rebuild_progress_summaries` recomputes everything from scratch.
+
+    completed_count counts rows with status "completed", the same as the
+    status filter the stage, growth map and parent dashboard counted before.
+    reflection_count counts completed rows with reflection text, the
+    CHALLENGE_REFLECTIONS badge counter. Stage calculation still takes
+    reflections from ChildProfile.total_reflections.
+    """
+    SKILL_KEYS = ('creative_thinking', 'practical_making', 'problem_solving', 'resilience')
+
+    child = models.OneToOneField(ChildProfile, on_delete=models.CASCADE, related_name='progress_summary')
+    completed_count = models.IntegerField(default=0)
+    reflection_count = models.IntegerField(default=0, help_text='Completed projects with a written reflection')
+    in_progress_count = models.IntegerField(default=0)
+    skill_totals = models.JSONField(default=dict, help_text='Summed skill_dimensions of completed projects')
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Child Progress Summary'
+        verbose_name_plural = 'Child Progress Summaries'
+
+    def __str__(self):
+        return f"{self.child_id} - {self.completed_count} completed, {self.reflection_count} reflections"
+
+    @classmethod
+    def apply_change(cls, child_id, old_state, new_state, skill_dimensions=None, create=True):
+        """Apply one progress row's state transition to the child's counters"""
+        if old_state == new_state:
+            return
+
+        with transaction.atomic():
+            queryset = cls.objects.select_for_update()
+            if create:
+                summary, _ = queryset.get_or_create(child_id=child_id)
+            else:
+                summary = queryset.filter(child_id=child_id).first()
+                if summary is None:
+                    return
+
+            summary.completed_count += new_state.completed - old_state.completed
+            summary.reflection_count += new_state.reflected - old_state.reflected
+            summary.in_progress_count += new_state.in_progress - old_state.in_progress
+
+            completed_delta = new_state.completed - old_state.completed
+            if completed_delta:
+                totals = dict(summary.skill_totals or {})
+                for key in cls.SKILL_KEYS:
+                    totals[key] = totals.get(key, 0) + completed_delta * int((skill_dimensions or {}).get(key, 0) or 0)
+                summary.skill_totals = totals
+
+            summary.last_activity_at = timezone.now()
+            summary.save()
+
+    @classmethod
+    def rebuild_for(cls, child_ids):
+        """Recompute summaries for the given children from their progress rows"""
+        summaries = {child_id: cls(child_id=child_id, skill_totals={key: 0 for key in cls.SKILL_KEYS}) for child_id in child_ids}
+        progress_rows = ProjectProgress.objects.filter(child_id__in=child_ids)
+
+        for progress in progress_rows.iterator():
+            summary = summaries[progress.child_id]
+            state = ProgressSummaryState.of(progress)
+            summary.completed_count += state.completed
+            summary.reflection_count += state.reflected
+            summary.in_progress_count += state.in_progress
+            if state.completed:
+                dimensions = progress.credited_skills or {}
+                for key in cls.SKILL_KEYS:
+                    summary.skill_totals[key] += int(dimensions.get(key, 0) or 0)
+
+            activity_at = max(
+                (value for value in (progress.started_at, progress.completed_at, progress.reflection_at) if value),
+                default=None,
+            )
+            if activity_at and (summary.last_activity_at is None or activity_at > summary.last_activity_at):
+                summary.last_activity_at = activity_at
+
+        with transaction.atomic():
+            cls.objects.filter(child_id__in=child_ids).delete()
+            cls.objects.bulk_create(summaries.values())
+        return len(summaries)
+
+
+class DailyActivityState(namedtuple('DailyActivityState', ['completed_day', 'reflected_day'])):
+    """The days (if any) a single ProjectProgress row counts towards in ChildDailyActivity"""
+    FIELDS = frozenset({'status', 'completed_at', 'reflection_text', 'reflection_at'})
+
+    @classmethod
+    def of(cls, progress):
+        completed = progress.status == ProjectProgress.STATUS_COMPLETED and progress.completed_at
+        reflected = progress.reflection_at and (progress.reflection_text or '').strip()
+        return cls(
+            completed_day=timezone.localdate(progress.completed_at) if completed else None,
+            reflected_day=timezone.localdate(progress.reflection_at) if reflected else None,
+        )
+
+
+DailyActivityState.EMPTY = DailyActivityState(None, None)
+
+
+class ChildDailyActivity(models.Model):
+    """
+    Per-child, per-day activity rollup.
+
+    Maintained incrementally by the ProjectProgress save/delete handlers
+    alongside ChildProgressSummary. A completion counts on the day of
+    completed_at and adds the row's credited_skills to that day; a
+    reflection counts on the day of reflection_at. Windowed figures (weekly
+    wins, 30/90-day trends) sum at most one row per child per day instead of
+    scanning progress history. `rebuild_progress_summaries` recomputes these
+    rows too.
+    """
+    SKILL_KEYS = ChildProgressSummary.SKILL_KEYS
+
+    child = models.ForeignKey(ChildProfile, on_delete=models.CASCADE, related_name='daily_activity')
+    day = models.DateField()
+    completions = models.IntegerField(default=0)
+    reflections = models.IntegerField(default=0)
+    creative_thinking = models.IntegerField(default=0)
+    practical_making = models.IntegerField(default=0)
+    problem_solving = models.IntegerField(default=0)
+    resilience = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['child', 'day']
+        ordering = ['child', 'day']
+        verbose_name = 'Child Daily Activity'
+        verbose_name_plural = 'Child Daily Activity'
+
+    def __str__(self):
+        return f"{self.child_id} {self.day}: {self.completions} completed, {self.reflections} reflections"
+
+    @classmethod
+    def apply_change(cls, child_id, old_state, new_state, old_skills=None, new_skills=None):
+        """
+        Move one progress row's contribution from its old days to its new ones.
+
+        old_skills are the points the row was credited with before the
+        change, new_skills the points it is credited with after it.
+        """
+        if old_state == new_state:
+            return
+
+        deltas = {}
+        if old_state.completed_day != new_state.completed_day:
+            for day, sign, skills in ((old_state.completed_day, -1, old_skills), (new_state.completed_day, 1, new_skills)):
+                if day is None:
+                    continue
+                changes = deltas.setdefault(day, {})
+                changes['completions'] = changes.get('completions', 0) + sign
+                for key in cls.SKILL_KEYS:
+                    points = sign * int((skills or {}).get(key, 0) or 0)
+                    changes[key] = changes.get(key, 0) + points
+        if old_state.reflected_day != new_state.reflected_day:
+            for day, sign in ((old_state.reflected_day, -1), (new_state.reflected_day, 1)):
+                if day is not None:
+                    changes = deltas.setdefault(day, {})
+                    changes['reflections'] = changes.get('reflections', 0) + sign
+
+        with transaction.atomic():
+            for day, changes in deltas.items():
+                changes = {field: delta for field, delta in changes.items() if delta}
+                if not changes:
+                    continue
+                rows = cls.objects.filter(child_id=child_id, day=day)
+                updates = {field: F(field) + delta for field, delta in changes.items()}
+                # A day with no row yet has nothing to take away
+                if not rows.update(**updates) and any(delta > 0 for delta in changes.values()):
+                    cls.objects.get_or_create(child_id=child_id, day=day)
+                    rows.update(**updates)
+
+    @classmethod
+    def rebuild_for(cls, child_ids):
+        """Recompute daily rollups for the given children from their progress rows"""
+        rows = {}
+        progress_rows = (
+            ProjectProgress.objects.filter(child_id__in=child_ids)
+            .only('child_id', 'status', 'completed_at', 'reflection_text', 'reflection_at', 'credited_skills')
+        )
+        for progress in progress_rows.iterator():
+            state = DailyActivityState.of(progress)
+            if state.completed_day:
+                row = rows.setdefault((progress.child_id, state.completed_day), cls(child_id=progress.child_id, day=state.completed_day))
+                row.completions += 1
+                dimensions = progress.credited_skills or {}
+                for key in cls.SKILL_KEYS:
+                    setattr(row, key, getattr(row, key) + int(dimensions.get(key, 0) or 0))
+            if state.reflected_day:
+                row = rows.setdefault((progress.child_id, state.reflected_day), cls(child_id=progress.child_id, day=state.reflected_day))
+                row.reflections += 1
+
+        with transaction.atomic():
+            cls.objects.filter(child_id__in=child_ids).delete()
+            cls.objects.bulk_create(rows.values(), batch_size=1000)
+        return len(rows)
+
+
+class ChildRecommendation(models.Model):
+    """
+    Precomputed top recommended projects for one child.
+
+    Written by the `precompute_recommendations` command. A row is only used
+    while it was scored against the current recommendation index
+    (catalog_hash) and the child's current quiz inputs (inputs_hash);
+    otherwise recommendations are scored online.
+    """
+    child = models.OneToOneField(ChildProfile, on_delete=models.CASCADE, related_name='recommendation')
+    project_ids = models.JSONField(default=list, help_text='Recommended project ids, best first')
+    catalog_hash = models.CharField(max_length=32, help_text='Fingerprint of the recommendation index the list was scored against')
+    inputs_hash = models.CharField(max_length=32, help_text="Fingerprint of the child's age band and quiz results")
+    computed_at = models.DateTimeField(help_text='When the run that produced this list started')
+
+    class Meta:
+        verbose_name = 'Child Recommendation'
+        verbose_name_plural = 'Child Recommendations'
+
+    def __str__(self):
+        return f"{self.child_id} - {len(self.project_ids)} projects"
+
+
 class ChildHelpRequest(models.Model):
     """Child support requests with optional project context."""
 
@@ -589,6 +1041,19 @@ class ProgressionStage(models.Model):
     
     def __str__(self):
         return f"{self.child.username} - Stage {self.current_stage}: {self.get_current_stage_display()}"
+
+    @classmethod
+    def stage_for_counts(cls, completed_count, reflection_count):
+        """Stage number earned by completed projects and reflections"""
+        if completed_count >= 25 and reflection_count >= 10:
+            return cls.INDEPENDENT_MAKER
+        elif completed_count >= 15 and reflection_count >= 3:
+            return cls.DESIGNER
+        elif completed_count >= 8:
+            return cls.BUILDER
+        elif completed_count >= 3:
+            return cls.EXPERIMENTER
+        return cls.EXPLORER
     
     def get_stage_info(self):
         """Get detailed info about current stage"""
@@ -692,7 +1157,15 @@ class GrowthPathway(models.Model):
     def __str__(self):
         return f"{self.child.username} - {self.get_pathway_type_display()} (Lvl {self.level})"
     
-    def add_points(self, points, reflection_boost=False):
+    # Points needed for each level (see apps/users/growth.py)
+    LEVEL_CURVE = PATHWAY_LEVEL_CURVE
+
+    @classmethod
+    def level_for_points(cls, points):
+        """(level, progress %) for a points total"""
+        return cls.LEVEL_CURVE.level_and_progress(points)
+    
+    def add_points(self, points, reflection_boost=False, save=True):
         """Add points and update progress level"""
         self.points += points
         
@@ -701,23 +1174,50 @@ class GrowthPathway(models.Model):
             self.points += int(points * 0.25)  # 25% bonus
             self.last_boosted_at = timezone.now()
         
-        # Calculate level based on points
-        # Each level requires progressively more points
-        level_thresholds = [0, 100, 250, 450, 700, 1000, 1350, 1750, 2200]
-        
-        for lvl, threshold in enumerate(level_thresholds, 1):
-            if self.points < threshold:
-                self.level = max(1, lvl - 1)
-                break
-        else:
-            self.level = 8
+        self.level, self.progress = self.level_for_points(self.points)
         
-        # Calculate progress to next level
-        current_threshold = level_thresholds[self.level - 1]
-        next_threshold = level_thresholds[min(self.level, 8)]
-        self.progress = int(((self.points - current_threshold) / (next_threshold - current_threshold)) * 100) if next_threshold > current_threshold else 100
-        
-        self.save()
+        if save:
+            self.save()
+
+    @classmethod
+    def apply_contributions(cls, child_id, contributions, reflection_boost=False):
+        """
+        Add points to several of a child's pathways at once.
+
+        Loads (and locks) the child's pathways in one query, applies the level
+        curve in memory and writes every changed row with a single bulk_update.
+        """
+        contributions = {pathway_type: points for pathway_type, points in contributions.items() if points > 0}
+        if not contributions:
+            return []
+
+        def locked_pathways():
+            return {
+                pathway.pathway_type: pathway
+                for pathway in cls.objects.select_for_update().filter(child_id=child_id, pathway_type__in=contributions)
+            }
+
+        with transaction.atomic():
+            pathways = locked_pathways()
+            missing = [pathway_type for pathway_type in contributions if pathway_type not in pathways]
+            if missing:
+                # This shouldn't happen if initialize_progression is called
+                cls.objects.bulk_create(
+                    [cls(child_id=child_id, pathway_type=pathway_type) for pathway_type in missing],
+                    ignore_conflicts=True,
+                )
+                pathways = locked_pathways()
+
+            now = timezone.now()
+            updated = []
+            for pathway_type, points in contributions.items():
+                pathway = pathways[pathway_type]
+                pathway.add_points(points, reflection_boost=reflection_boost, save=False)
+                pathway.updated_at = now
+                updated.append(pathway)
+
+            cls.objects.bulk_update(updated, ['points', 'level', 'progress', 'last_boosted_at', 'updated_at'])
+        return updated
 
 
 class ProjectSkillMapping(models.Model):
@@ -794,6 +1294,8 @@ def initialize_progression_for_child(sender, instance, created, **kwargs):
     When a new child is created, initialize their progression stage and growth pathways.
     """
     if created:
+        ChildProgressSummary.objects.get_or_create(child=instance)
+
         # Create progression stage
         ProgressionStage.objects.get_or_create(
             child=instance,
@@ -822,47 +1324,169 @@ def initialize_progression_for_child(sender, instance, created, **kwargs):
             )
 
 
+def _progress_skill_dimensions(progress):
+    from .catalog import get_catalog
+    entry = get_catalog().get(progress.project_id)
+    if entry is not None:
+        return entry.skill_dimensions
+    return Project.objects.filter(pk=progress.project_id).values_list('skill_dimensions', flat=True).first() or {}
+
+
+def _credited_before(progress):
+    """The credited_skills the stored row had before this save or delete"""
+    return getattr(progress, '_credited_skills', progress.credited_skills)
+
+
+@receiver(post_save, sender=ChildProfile)
+@receiver(post_delete, sender=ChildProfile)
+def invalidate_child_context_on_profile_change(sender, instance, raw=False, **kwargs):
+    """Profile edits and deletions invalidate the cached child context"""
+    if raw:
+        return
+    from .child_context import bump_child_context_version
+    bump_child_context_version(instance.pk)
+
+
+@receiver(post_save, sender=ProgressionStage)
+@receiver(post_delete, sender=ProgressionStage)
+def invalidate_child_context_on_stage_change(sender, instance, raw=False, **kwargs):
+    """The cached child context carries the stage number"""
+    if raw:
+        return
+    from .child_context import bump_child_context_version
+    bump_child_context_version(instance.child_id)
+
+
+@receiver(post_save, sender=ProjectProgress)
+def update_progress_summary_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """Apply this row's change to the child's materialized progress summary"""
+    if raw:
+        return
+
+    old_state = ProgressSummaryState.EMPTY if created else getattr(instance, '_summary_state', None)
+    if old_state is None:
+        # Saved without a loaded baseline (e.g. constructed by hand); recount this child
+        ChildProgressSummary.rebuild_for([instance.child_id])
+    else:
+        new_state = ProgressSummaryState.of(instance)
+        # Completing adds the points just credited; un-completing takes back the earlier ones
+        skill_dimensions = instance.credited_skills if new_state.completed else _credited_before(instance)
+        ChildProgressSummary.apply_change(instance.child_id, old_state, new_state, skill_dimensions)
+
+    instance._summary_state = ProgressSummaryState.of(instance)
+
+
+@receiver(post_delete, sender=ProjectProgress)
+def update_progress_summary_on_delete(sender, instance, **kwargs):
+    """Remove a deleted row's contribution (skipped when the child itself is being deleted)"""
+    old_state = getattr(instance, '_summary_state', None) or ProgressSummaryState.of(instance)
+    ChildProgressSummary.apply_change(
+        instance.child_id, old_state, ProgressSummaryState.EMPTY, _credited_before(instance), create=False
+    )
+
+
+@receiver(post_save, sender=ProjectProgress)
+def update_daily_activity_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """Move this row's completion/reflection counts to the days they now fall on"""
+    if raw:
+        return
+
+    old_state = DailyActivityState.EMPTY if created else getattr(instance, '_activity_state', None)
+    if old_state is None:
+        # Saved without a loaded baseline; recount this child
+        ChildDailyActivity.rebuild_for([instance.child_id])
+    else:
+        new_state = DailyActivityState.of(instance)
+        ChildDailyActivity.apply_change(
+            instance.child_id, old_state, new_state, _credited_before(instance), instance.credited_skills
+        )
+
+    instance._activity_state = DailyActivityState.of(instance)
+
+
+@receiver(post_delete, sender=ProjectProgress)
+def update_daily_activity_on_delete(sender, instance, **kwargs):
+    """Remove a deleted row's counts from its days"""
+    old_state = getattr(instance, '_activity_state', None) or DailyActivityState.of(instance)
+    ChildDailyActivity.apply_change(instance.child_id, old_state, DailyActivityState.EMPTY, _credited_before(instance))
+
+
 @receiver(post_save, sender=ProjectProgress)
-def update_growth_on_project_completion(sender, instance, created=False, **kwargs):
+@receiver(post_delete, sender=ProjectProgress)
+def invalidate_progress_version(sender, instance, raw=False, **kwargs):
+    """Any progress change invalidates the child's cached engine state"""
+    if raw:
+        return
+    from .query_engine import bump_progress_version
+    bump_progress_version(instance.child_id)
+
+
+DEFAULT_SKILL_MAPPING = {
+    'thinking_points': 20,
+    'making_points': 30,
+    'problem_solving_points': 20,
+    'resilience_points': 10,
+    'design_planning_points': 10,
+    'contribution_points': 5,
+}
+
+
+@receiver(post_save, sender=ProjectProgress)
+def update_growth_on_project_completion(sender, instance, created=False, raw=False, **kwargs):
     """
     When a project is completed, update the child's growth pathways.
     If they provided reflection, grant reflection bonus.
     """
-    # Only process when status changes to completed
-    if instance.status == ProjectProgress.STATUS_COMPLETED:
-        try:
-            skill_mapping = ProjectSkillMapping.objects.get(project=instance.project)
-        except ProjectSkillMapping.DoesNotExist:
-            # If no skill mapping exists, create a default one
-            skill_mapping, created = ProjectSkillMapping.objects.get_or_create(
-                project=instance.project,
-                defaults={
-                    'thinking_points': 20,
-                    'making_points': 30,
-                    'problem_solving_points': 20,
-                    'resilience_points': 10,
-                    'design_planning_points': 10,
-                    'contribution_points': 5,
-                }
-            )
-        
-        # Check if child has reflection
-        has_reflection = instance.has_reflection and len(instance.reflection_text.strip()) > 20
-        
-        # Update each growth pathway
-        contributions = skill_mapping.get_contributions()
-        for pathway_type, points in contributions.items():
-            if points > 0:
-                try:
-                    pathway = GrowthPathway.objects.get(
-                        child=instance.child,
-                        pathway_type=pathway_type
-                    )
-                    pathway.add_points(points, reflection_boost=has_reflection)
-                except GrowthPathway.DoesNotExist:
-                    # This shouldn't happen if initialize_progression is called
-                    pathway = GrowthPathway.objects.create(
-                        child=instance.child,
-                        pathway_type=pathway_type
-                    )
-                    pathway.add_points(points, reflection_boost=has_reflection)
+    if raw:
+        return
+
+    # Only process when status changes to completed, not on later saves
+    # of a completed row (ratings, reflections)
+    previous_status = None if created else getattr(instance, '_loaded_status', None)
+    instance._loaded_status = instance.status
+    if instance.status != ProjectProgress.STATUS_COMPLETED or previous_status == ProjectProgress.STATUS_COMPLETED:
+        return
+
+    skill_mapping = ProjectSkillMapping.objects.filter(project_id=instance.project_id).first()
+    if skill_mapping is None:
+        # If no skill mapping exists, create a default one
+        skill_mapping, _ = ProjectSkillMapping.objects.get_or_create(
+            project_id=instance.project_id,
+            defaults=DEFAULT_SKILL_MAPPING,
+        )
+
+    # Check if child has reflection
+    has_reflection = instance.has_reflection and len(instance.reflection_text.strip()) > 20
+
+    # Update every growth pathway in one batch
+    GrowthPathway.apply_contributions(
+        instance.child_id,
+        skill_mapping.get_contributions(),
+        reflection_boost=has_reflection,
+    )
+
+
+@receiver(post_save, sender=Project)
+def sync_age_bands_on_project_save(sender, instance, raw=False, **kwargs):
+    """Keep the indexed age-band rows in step with Project.age_ranges"""
+    if raw:
+        return
+    sync_project_age_bands(instance)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=ProjectSkill)
+@receiver(post_delete, sender=ProjectSkill)
+def invalidate_catalog_on_change(sender, **kwargs):
+    """Any project or skill-weight change invalidates the compiled catalog snapshot"""
+    from .catalog import bump_catalog_version
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Project.prerequisites.through)
+def invalidate_catalog_on_prerequisites_change(sender, action, **kwargs):
+    """Prerequisite edits are part of the catalog snapshot too"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        from .catalog import bump_catalog_version
+        bump_catalog_version()
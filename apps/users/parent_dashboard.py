@@ -0,0 +1,315 @@
+"""
+Parent Dashboard Aggregation
+
+Computes the parent dashboard's figures with one grouped SQL aggregate over
+the family's progress rows plus the maintained ChildProgressSummary counters,
+so the view holds a few values per child however long the family's history
+is. The only progress rows loaded are the handful actually shown (attention
+items and recent reflections), with .only() projections. The needs-attention
+feed is keyset-paginated (attention_page) for the JSON endpoint.
+
+Windowed figures (weekly wins, 30/90-day trends) come from the
+ChildDailyActivity rollups: a window of N days reads at most N rows per
+child and never touches raw progress history.
+"""
+
+from datetime import datetime, timedelta
+
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .models import ChildDailyActivity, ChildProgressSummary, ProjectProgress
+
+
+SKILL_LABELS = {
+    'creative_thinking': 'Creative Thinking',
+    'practical_making': 'Practical Making',
+    'problem_solving': 'Problem Solving',
+    'resilience': 'Resilience',
+}
+
+ATTENTION_LIMIT = 8
+ATTENTION_PAGE_SIZE = 20
+ATTENTION_PAGE_MAX = 100
+RECENT_REFLECTIONS_LIMIT = 8
+WEEK_DAYS = 7
+TREND_WINDOWS = (7, 30, 90)
+
+COMPLETED = Q(status=ProjectProgress.STATUS_COMPLETED)
+# Empty or whitespace only, as str.strip() sees it (SQL TRIM only strips spaces)
+REFLECTION_MISSING = Q(reflection_text__regex=r'^\s*$')
+RATING_MISSING = Q(rating__isnull=True) | Q(rating=0)
+
+
+def family_progress_stats(child_ids):
+    """
+    Per-child progress figures from a single GROUP BY query.
+
+    Returns {child_id: row} with total, needs_reflection and needs_rating
+    over all progress.
+    """
+    rows = (
+        ProjectProgress.objects.filter(child_id__in=child_ids)
+        .order_by()
+        .values('child_id')
+        .annotate(
+            total=Count('id'),
+            needs_reflection=Count('id', filter=COMPLETED & REFLECTION_MISSING),
+            needs_rating=Count('id', filter=COMPLETED & RATING_MISSING),
+        )
+    )
+    return {row['child_id']: row for row in rows}
+
+
+def window_start(days, today=None):
+    """First day of the `days`-day window ending today (inclusive)"""
+    return (today or timezone.localdate()) - timedelta(days=days - 1)
+
+
+def activity_totals(child_ids, days=WEEK_DAYS):
+    """
+    Per-child completions, reflections and skill points over the last `days`
+    days, summed from at most `days` ChildDailyActivity rows per child.
+    """
+    rows = (
+        ChildDailyActivity.objects.filter(child_id__in=child_ids, day__gte=window_start(days))
+        .order_by()
+        .values('child_id')
+        .annotate(
+            completions=Sum('completions'),
+            reflections=Sum('reflections'),
+            **{key: Sum(key) for key in SKILL_LABELS},
+        )
+    )
+    return {row['child_id']: row for row in rows}
+
+
+def activity_trend(child_ids, days):
+    """
+    Day-by-day family activity for the last `days` days, oldest first,
+    with zero-filled days, plus window totals.
+
+    child_ids may be a ChildProfile queryset, which runs as a subquery of
+    the rollup query.
+    """
+    start = window_start(days)
+    rows = (
+        ChildDailyActivity.objects.filter(child_id__in=child_ids, day__gte=start)
+        .order_by()
+        .values('day')
+        .annotate(
+            completions=Sum('completions'),
+            reflections=Sum('reflections'),
+            **{key: Sum(key) for key in SKILL_LABELS},
+        )
+    )
+    by_day = {row['day']: row for row in rows}
+
+    series = []
+    totals = {'completions': 0, 'reflections': 0, **{key: 0 for key in SKILL_LABELS}}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = by_day.get(day, {})
+        point = {'day': day.isoformat()}
+        for field in totals:
+            point[field] = row.get(field) or 0
+            totals[field] += point[field]
+        series.append(point)
+    return {'days': days, 'start': start.isoformat(), 'totals': totals, 'series': series}
+
+
+def _attention_queryset(child_ids):
+    """Completed progress missing a reflection or rating, in feed order"""
+    return (
+        ProjectProgress.objects.filter(COMPLETED, child_id__in=child_ids)
+        .filter(REFLECTION_MISSING | RATING_MISSING)
+        .annotate(reflection_missing=ExpressionWrapper(REFLECTION_MISSING, output_field=BooleanField()))
+        .select_related('child', 'project')
+        .only('rating', 'started_at', 'completed_at', 'child__username', 'project__title')
+        .order_by('child_id', F('started_at').desc(nulls_last=True), '-id')
+    )
+
+
+def encode_attention_cursor(progress):
+    """Opaque keyset cursor for the feed position just after `progress`"""
+    started_at = progress.started_at.isoformat() if progress.started_at else ''
+    return urlsafe_base64_encode(f'{progress.child_id}|{started_at}|{progress.id}'.encode())
+
+
+def decode_attention_cursor(cursor):
+    """(child_id, started_at, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        child_id, started_at, progress_id = urlsafe_base64_decode(cursor).decode().split('|')
+        return int(child_id), datetime.fromisoformat(started_at) if started_at else None, int(progress_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _after_cursor(child_id, started_at, progress_id):
+    """Rows sorting after the cursor in (child_id, started_at DESC NULLS LAST, id DESC) order"""
+    if started_at is None:
+        same_child = Q(started_at__isnull=True, id__lt=progress_id)
+    else:
+        same_child = (
+            Q(started_at__lt=started_at)
+            | Q(started_at__isnull=True)
+            | Q(started_at=started_at, id__lt=progress_id)
+        )
+    return Q(child_id__gt=child_id) | (Q(child_id=child_id) & same_child)
+
+
+def attention_page(child_ids, limit=ATTENTION_PAGE_SIZE, cursor=None):
+    """
+    One page of the needs-attention feed, one entry per progress row.
+
+    Ordering and LIMIT run in the database and later pages seek past the
+    cursor, so each page costs one query however long the history is.
+    Returns (progress_rows, next_cursor); next_cursor is None on the last
+    page.
+    """
+    queryset = _attention_queryset(child_ids)
+    if cursor:
+        queryset = queryset.filter(_after_cursor(*decode_attention_cursor(cursor)))
+    rows = list(queryset[:limit + 1])
+    next_cursor = encode_attention_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def attention_actions(progress):
+    actions = []
+    if progress.reflection_missing:
+        actions.append('Reflection needed')
+    if not progress.rating:
+        actions.append('Rating needed')
+    return actions
+
+
+def attention_items(child_ids, limit=ATTENTION_LIMIT):
+    """The dashboard's first `limit` needs-attention items, one per missing action"""
+    rows, _ = attention_page(child_ids, limit)
+    items = [
+        {
+            'child_name': progress.child.username,
+            'project_title': progress.project.title,
+            'action': action,
+        }
+        for progress in rows
+        for action in attention_actions(progress)
+    ]
+    return items[:limit]
+
+
+def recent_reflections(child_ids, limit=RECENT_REFLECTIONS_LIMIT):
+    """The family's latest reflections, loading only the fields the feed shows"""
+    return list(
+        ProjectProgress.objects.filter(child_id__in=child_ids)
+        .exclude(reflection_text__isnull=True)
+        .exclude(reflection_text='')
+        .select_related('child', 'project')
+        .only('reflection_text', 'reflection_at', 'completed_at', 'child__username', 'project__title')
+        .order_by('-reflection_at', '-completed_at')[:limit]
+    )
+
+
+def _praise_message(child, completed_count):
+    if completed_count >= 10:
+        return f"{child.username} is showing real maker confidence and consistency."
+    if completed_count >= 5:
+        return f"{child.username} is building strong momentum and healthy learning habits."
+    if completed_count >= 1:
+        return f"Great start — {child.username} is building curiosity through hands-on learning."
+    return f"{child.username} is ready to begin their first project journey."
+
+
+def build_parent_dashboard(children):
+    """
+    Dashboard context for a parent's children.
+
+    Returns child_summaries, weekly_wins, attention_items and
+    recent_reflections.
+    """
+    children = list(children)
+    weekly_wins = {
+        'total_completed': 0,
+        'total_reflections': 0,
+        'top_skill_label': None,
+        'top_skill_points': 0,
+        'spotlight_child': None,
+        'spotlight_count': 0,
+    }
+    if not children:
+        return {
+            'child_summaries': [],
+            'weekly_wins': weekly_wins,
+            'attention_items': [],
+            'recent_reflections': [],
+        }
+
+    child_ids = [child.id for child in children]
+    stats = family_progress_stats(child_ids)
+    week = activity_totals(child_ids, WEEK_DAYS)
+    summaries = {
+        summary.child_id: summary
+        for summary in ChildProgressSummary.objects.filter(child_id__in=child_ids)
+    }
+
+    weekly_skill_totals = {key: 0 for key in SKILL_LABELS}
+    spotlight_child = None
+    spotlight_count = 0
+    child_summaries = []
+
+    for child in children:
+        row = stats.get(child.id, {})
+        week_row = week.get(child.id, {})
+        week_completed = week_row.get('completions') or 0
+        weekly_wins['total_completed'] += week_completed
+        weekly_wins['total_reflections'] += week_row.get('reflections') or 0
+        for key in SKILL_LABELS:
+            weekly_skill_totals[key] += week_row.get(key) or 0
+        if week_completed > spotlight_count:
+            spotlight_child, spotlight_count = child, week_completed
+
+        summary = summaries.get(child.id) or child.get_progress_summary()
+        total_projects = row.get('total', 0)
+        completed_count = summary.completed_count
+
+        # Learned skills from completed projects (maintained on the summary row)
+        skill_totals = {key: int((summary.skill_totals or {}).get(key, 0) or 0) for key in SKILL_LABELS}
+        top_skills = [
+            {'key': key, 'label': SKILL_LABELS[key], 'score': score}
+            for key, score in sorted(skill_totals.items(), key=lambda x: x[1], reverse=True)
+            if score > 0
+        ][:3]
+
+        child_summaries.append({
+            'child': child,
+            'total_projects': total_projects,
+            'completed_count': completed_count,
+            'in_progress_count': summary.in_progress_count,
+            'needs_reflection_count': row.get('needs_reflection', 0),
+            'needs_rating_count': row.get('needs_rating', 0),
+            'completion_percent': int((completed_count / total_projects) * 100) if total_projects else 0,
+            'top_skills': top_skills,
+            'praise_message': _praise_message(child, completed_count),
+            'pathway_snapshot': [
+                ('Creative', min(max(child.creative_thinking, 0), 100)),
+                ('Making', min(max(child.practical_making, 0), 100)),
+                ('Problem Solving', min(max(child.problem_solving, 0), 100)),
+                ('Resilience', min(max(child.resilience, 0), 100)),
+            ],
+        })
+
+    top_skill_key, top_skill_points = max(weekly_skill_totals.items(), key=lambda x: x[1])
+    if top_skill_points > 0:
+        weekly_wins['top_skill_label'] = SKILL_LABELS[top_skill_key]
+        weekly_wins['top_skill_points'] = top_skill_points
+    weekly_wins['spotlight_child'] = spotlight_child
+    weekly_wins['spotlight_count'] = spotlight_count
+
+    return {
+        'child_summaries': child_summaries,
+        'weekly_wins': weekly_wins,
+        'attention_items': attention_items(child_ids),
+        'recent_reflections': recent_reflections(child_ids),
+    }
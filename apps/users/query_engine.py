@@ -3,13 +3,38 @@ Content Query Engine
 
 Intelligent filtering of projects based on child progression, age, and visibility.
 This is the core logic that powers all world views (Imaginauts, Navigators, Trailblazers).
+
+Projects are filtered in Python against the compiled catalog snapshot
+(see catalog.py), so the catalog itself costs no queries per request.
 """
 
+from django.db import transaction
 from django.utils import timezone
 from django.db.models import Q
+
+from zonuko.cache import bump_version, current_version, get_or_compute, make_key
+
+from .catalog import get_catalog
 from .models import Project
 
 
+EFFECTIVE_STAGE_CACHE_TTL = 60  # seconds; also bounds drift from scheduled publish times
+
+
+def _progress_version_key(child_id):
+    return f'users:progress_version:{child_id}'
+
+
+def get_progress_version(child_id):
+    """Per-child counter that moves whenever the child's ProjectProgress changes"""
+    return current_version(_progress_version_key(child_id))
+
+
+def bump_progress_version(child_id):
+    """Invalidate cached per-child engine state once the current transaction commits"""
+    transaction.on_commit(lambda: bump_version(_progress_version_key(child_id)))
+
+
 class ProjectQueryEngine:
     LAB_UNLOCK_COVERAGE_THRESHOLD = 0.75
     LAB_CORE_SKILL_WEIGHT_THRESHOLD = 4
@@ -23,15 +48,18 @@ class ProjectQueryEngine:
         coming_soon = engine.get_coming_soon()
     """
     
-    def __init__(self, child):
+    def __init__(self, child, catalog=None):
         """
         Initialize engine with a child profile.
         
         Args:
             child: ChildProfile instance
+            catalog: Optional CatalogSnapshot (defaults to the current one)
         """
         self.child = child
         self.age_band = child.age_range  # IMAGINAUTS, NAVIGATORS, TRAILBLAZERS
+        self.catalog = catalog or get_catalog()
+        self._effective_stage_memo = {}
         
         # Get child's current progression stage (defaults to 1 if not initialized)
         try:
@@ -39,14 +67,61 @@ class ProjectQueryEngine:
         except AttributeError:
             self.current_stage = 1
     
-    def _base_query(self):
-        """Base queryset with age band filtering"""
-        # Use icontains for SQLite compatibility (searching JSON array as string)
-        return Project.objects.filter(
-            age_ranges__icontains=self.age_band
-        ).select_related().prefetch_related('skills', 'prerequisites', 'projectskill_set')
-
-    def _get_effective_stage(self, base_queryset):
+    def _base_entries(self):
+        """Catalog entries for the child's age band, in default project ordering"""
+        return self.catalog.for_age_band(self.age_band)
+
+    def _published_entries(self):
+        """Age-band entries that are LIVE or SCHEDULED+published"""
+        now = timezone.now()
+        return [entry for entry in self._base_entries() if entry.is_published(now)]
+
+    @staticmethod
+    def _materialize(entries, limit=None):
+        if limit:
+            entries = entries[:limit]
+        return [entry.materialize() for entry in entries]
+
+    def _effective_stage_cache_key(self):
+        return make_key(
+            'users:effective_stage',
+            self.child.id,
+            self.age_band,
+            self.current_stage,
+            self.catalog.version,
+            get_progress_version(self.child.id),
+        )
+
+    def _get_effective_stage(self, published_entries, progress_lookup=None):
+        """
+        Determine effective unlock stage, memoized.
+
+        Cached on the engine instance and in the shared cache under the
+        child's progress version, so composing several engine calls on one
+        page (or across requests) evaluates the stage once until the child's
+        progress or the catalog changes.
+
+        Pass progress_lookup (project_id -> ProjectProgress) to reuse progress
+        rows that were already loaded instead of querying them again.
+        """
+        memoized = self._effective_stage_memo.get(self.current_stage)
+        if memoized is not None:
+            return memoized
+
+        if progress_lookup is not None:
+            effective_stage = self._compute_effective_stage(published_entries, progress_lookup)
+        else:
+            effective_stage = get_or_compute(
+                self._effective_stage_cache_key(),
+                lambda: self._compute_effective_stage(published_entries),
+                timeout=EFFECTIVE_STAGE_CACHE_TTL,
+                stale_ttl=0,
+            )
+
+        self._effective_stage_memo[self.current_stage] = effective_stage
+        return effective_stage
+
+    def _compute_effective_stage(self, published_entries, progress_lookup=None):
         """
         Determine effective unlock stage.
 
@@ -58,17 +133,19 @@ class ProjectQueryEngine:
         if self.current_stage >= 5:
             return effective_stage
 
-        current_stage_projects = list(
-            base_queryset.filter(minimum_stage__lte=self.current_stage).values_list('id', flat=True)
-        )
+        current_stage_projects = [
+            entry.id for entry in published_entries
+            if entry.minimum_stage <= self.current_stage
+        ]
 
         if not current_stage_projects:
             return min(5, self.current_stage + 1)
 
-        progress_lookup = {
-            progress.project_id: progress
-            for progress in self.child.project_progress.filter(project_id__in=current_stage_projects)
-        }
+        if progress_lookup is None:
+            progress_lookup = {
+                progress.project_id: progress
+                for progress in self.child.project_progress.filter(project_id__in=current_stage_projects)
+            }
 
         for project_id in current_stage_projects:
             progress = progress_lookup.get(project_id)
@@ -83,6 +160,23 @@ class ProjectQueryEngine:
                 return effective_stage
 
         return min(5, self.current_stage + 1)
+
+    def _available_entries(self, published_entries=None, progress_lookup=None):
+        if published_entries is None:
+            published_entries = self._published_entries()
+        effective_stage = self._get_effective_stage(published_entries, progress_lookup)
+        return [entry for entry in published_entries if entry.minimum_stage <= effective_stage]
+
+    def _teaser_entries(self, published_entries):
+        if self.current_stage >= 5:
+            return []
+        return [entry for entry in published_entries if entry.minimum_stage == self.current_stage + 1]
+
+    def _coming_soon_entries(self):
+        return [
+            entry for entry in self._base_entries()
+            if entry.visibility == Project.VISIBILITY_COMING_SOON
+        ]
     
     def get_available(self, limit=None):
         """
@@ -97,28 +191,9 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of available projects
+            List of available projects
         """
-        base_queryset = self._base_query().filter(
-            visibility__in=[
-                Project.VISIBILITY_LIVE,
-                Project.VISIBILITY_SCHEDULED
-            ]
-        ).exclude(
-            visibility=Project.VISIBILITY_SCHEDULED,
-            published_at__gt=timezone.now()
-        )
-
-        effective_stage = self._get_effective_stage(base_queryset)
-
-        queryset = base_queryset.filter(
-            minimum_stage__lte=effective_stage
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        return self._materialize(self._available_entries(), limit)
     
     def get_teasers(self, limit=None):
         """
@@ -130,27 +205,10 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of teaser projects
+            List of teaser projects
         """
         # Only show teasers for next stage if not at max stage (5)
-        if self.current_stage >= 5:
-            return Project.objects.none()
-        
-        queryset = self._base_query().filter(
-            minimum_stage=self.current_stage + 1,
-            visibility__in=[
-                Project.VISIBILITY_LIVE,
-                Project.VISIBILITY_SCHEDULED
-            ]
-        ).exclude(
-            visibility=Project.VISIBILITY_SCHEDULED,
-            published_at__gt=timezone.now()
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        return self._materialize(self._teaser_entries(self._published_entries()), limit)
     
     def get_coming_soon(self, limit=None):
         """
@@ -160,16 +218,9 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of coming soon projects
+            List of coming soon projects
         """
-        queryset = self._base_query().filter(
-            visibility=Project.VISIBILITY_COMING_SOON
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        return self._materialize(self._coming_soon_entries(), limit)
     
     def get_featured(self, limit=None):
         """
@@ -179,19 +230,13 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results (default 3)
             
         Returns:
-            QuerySet of featured projects
+            List of featured projects
         """
         if limit is None:
             limit = 3
         
-        queryset = self.get_available().filter(
-            is_featured=True
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        entries = [entry for entry in self._available_entries() if entry.is_featured]
+        return self._materialize(entries, limit)
     
     def get_by_skill(self, skill, limit=None):
         """
@@ -202,23 +247,17 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of projects with this skill
+            List of projects with this skill
         """
         if isinstance(skill, str):
             from .models import Skill
             try:
                 skill = Skill.objects.get(name=skill)
             except Skill.DoesNotExist:
-                return Project.objects.none()
-        
-        queryset = self.get_available().filter(
-            skills=skill
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
+                return []
         
-        return queryset
+        entries = [entry for entry in self._available_entries() if skill.id in entry.skill_weights]
+        return self._materialize(entries, limit)
     
     def get_by_category(self, category, limit=None):
         """
@@ -229,16 +268,10 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of projects in this category
+            List of projects in this category
         """
-        queryset = self.get_available().filter(
-            category=category
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        entries = [entry for entry in self._available_entries() if entry.category == category]
+        return self._materialize(entries, limit)
     
     def get_by_difficulty(self, difficulty, limit=None):
         """
@@ -249,41 +282,23 @@ class ProjectQueryEngine:
             limit: Optional limit to number of results
             
         Returns:
-            QuerySet of projects at this difficulty
+            List of projects at this difficulty
         """
         if difficulty not in [1, 2, 3]:
-            return Project.objects.none()
-        
-        queryset = self.get_available().filter(
-            difficulty=difficulty
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
+            return []
         
-        return queryset
+        entries = [entry for entry in self._available_entries() if entry.difficulty == difficulty]
+        return self._materialize(entries, limit)
     
     def get_sparks(self, limit=None):
         """Get available Spark projects (quick 5-10 min)"""
-        queryset = self.get_available().filter(
-            type=Project.TYPE_SPARK
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        entries = [entry for entry in self._available_entries() if entry.type == Project.TYPE_SPARK]
+        return self._materialize(entries, limit)
     
     def get_labs(self, limit=None):
         """Get available Lab projects (full 30-60+ min)"""
-        queryset = self.get_available().filter(
-            type=Project.TYPE_LAB
-        ).distinct()
-        
-        if limit:
-            queryset = queryset[:limit]
-        
-        return queryset
+        entries = [entry for entry in self._available_entries() if entry.type == Project.TYPE_LAB]
+        return self._materialize(entries, limit)
     
     def get_dashboard_content(self):
         """
@@ -307,7 +322,7 @@ class ProjectQueryEngine:
         - Prioritizes Sparks first when available
         - Unlocks Labs based on skills learned from completed Sparks
         """
-        available_projects = list(self.get_available())
+        available_projects = self.get_available()
         available_project_ids = [project.id for project in available_projects]
 
         progress_lookup = {
@@ -337,35 +352,134 @@ class ProjectQueryEngine:
             'progress_lookup': progress_lookup,
         }
 
+    def get_dashboard_bundle(self, new_limit=4, teaser_limit=None, coming_soon_limit=None):
+        """
+        Build every child dashboard section from a single progress query.
+
+        Loads all of the child's ProjectProgress rows once and derives the
+        stage, project lists and counters in memory against the catalog
+        snapshot, so a dashboard render costs one query here regardless of
+        how many sections it shows.
+
+        The engine's current_stage is recalculated from the loaded counts
+        before the lists are derived, so unlocks reflect the child's actual
+        work; callers persist `calculated_stage` if it drifted.
+
+        Returns:
+            dict with available_projects, in_progress_projects, new_projects,
+            teasers, coming_soon, completed_projects, completed_count,
+            reflection_count, calculated_stage and progress_lookup
+        """
+        from .models import ProgressionStage
+
+        progress_rows = list(self.child.project_progress.all())
+        progress_lookup = {progress.project_id: progress for progress in progress_rows}
+
+        completed_progress = [progress for progress in progress_rows if self._is_completed(progress)]
+        completed_project_ids = {progress.project_id for progress in completed_progress}
+        reflection_count = sum(
+            1 for progress in progress_rows
+            if progress.has_reflection and progress.reflection_text
+        )
+
+        calculated_stage = ProgressionStage.stage_for_counts(len(completed_project_ids), reflection_count)
+        self.current_stage = calculated_stage
+
+        published_entries = self._published_entries()
+        available_projects = self._materialize(self._available_entries(published_entries, progress_lookup))
+        for project in available_projects:
+            project.progress = progress_lookup.get(project.id)
+
+        in_progress_projects = [
+            project for project in available_projects
+            if project.progress and project.progress.status == 'in_progress'
+        ]
+        not_started_projects = [
+            project for project in available_projects
+            if not project.progress or project.progress.status == 'not_started'
+        ]
+        new_projects = self._select_paced_new_projects(
+            not_started_projects,
+            limit=new_limit,
+            completed_project_ids=completed_project_ids,
+        )
+
+        self._attach_projects(completed_progress)
+        completed_progress.sort(key=self._completed_sort_key, reverse=True)
+
+        return {
+            'available_projects': available_projects,
+            'in_progress_projects': in_progress_projects,
+            'new_projects': new_projects,
+            'teasers': self._materialize(self._teaser_entries(published_entries), teaser_limit),
+            'coming_soon': self._materialize(self._coming_soon_entries(), coming_soon_limit),
+            'completed_projects': completed_progress,
+            'completed_count': len(completed_project_ids),
+            'reflection_count': reflection_count,
+            'calculated_stage': calculated_stage,
+            'progress_lookup': progress_lookup,
+        }
+
+    @staticmethod
+    def _is_completed(progress):
+        return bool(progress.completed_at) or progress.status == 'completed'
+
+    @staticmethod
+    def _completed_sort_key(progress):
+        """Newest completion first, then newest reflection, then newest start (missing dates last)"""
+        return tuple(
+            (value is not None, value.timestamp() if value else 0)
+            for value in (progress.completed_at, progress.reflection_at, progress.started_at)
+        )
+
+    def _attach_projects(self, progress_rows):
+        """Attach project copies from the snapshot, loading any stragglers in one query"""
+        missing_ids = set()
+        for progress in progress_rows:
+            entry = self.catalog.get(progress.project_id)
+            if entry:
+                progress.project = entry.materialize()
+            else:
+                missing_ids.add(progress.project_id)
+
+        if missing_ids:
+            projects_by_id = Project.objects.in_bulk(missing_ids)
+            for progress in progress_rows:
+                if progress.project_id in projects_by_id:
+                    progress.project = projects_by_id[progress.project_id]
+
     def _completed_progress_q(self):
         return Q(completed_at__isnull=False) | Q(status='completed')
 
-    def _get_spark_skill_profile(self):
+    def _get_spark_skill_profile(self, completed_project_ids=None):
         """
         Build a lightweight skill profile from completed Spark projects.
 
+        Args:
+            completed_project_ids: Optional pre-loaded set of completed project ids
+
         Returns:
             tuple[dict[int, int], int]
             - skill_weights_by_id: cumulative weight per skill
             - completed_sparks_count: distinct completed spark projects
         """
-        completed_spark_projects = list(
-            Project.objects.filter(
-                id__in=self.child.project_progress.filter(self._completed_progress_q()).values_list('project_id', flat=True).distinct(),
-                type=Project.TYPE_SPARK,
-                age_ranges__icontains=self.age_band,
-            ).prefetch_related('projectskill_set')
-        )
+        if completed_project_ids is None:
+            completed_project_ids = set(
+                self.child.project_progress.filter(self._completed_progress_q()).values_list('project_id', flat=True)
+            )
+        completed_spark_entries = [
+            entry for entry in self._base_entries()
+            if entry.id in completed_project_ids and entry.type == Project.TYPE_SPARK
+        ]
 
         skill_weights_by_id = {}
-        for project in completed_spark_projects:
-            for project_skill in project.projectskill_set.all():
-                skill_id = project_skill.skill_id
-                skill_weights_by_id[skill_id] = skill_weights_by_id.get(skill_id, 0) + int(project_skill.weight or 0)
+        for entry in completed_spark_entries:
+            for skill_id, weight in entry.skill_weights.items():
+                skill_weights_by_id[skill_id] = skill_weights_by_id.get(skill_id, 0) + weight
 
-        return skill_weights_by_id, len(completed_spark_projects)
+        return skill_weights_by_id, len(completed_spark_entries)
 
-    def _select_paced_new_projects(self, not_started_projects, limit=4):
+    def _select_paced_new_projects(self, not_started_projects, limit=4, completed_project_ids=None):
         """
         Select a staggered set of new projects.
 
@@ -382,7 +496,7 @@ class ProjectQueryEngine:
         spark_candidates = [project for project in not_started_projects if project.type == Project.TYPE_SPARK]
         lab_candidates = [project for project in not_started_projects if project.type == Project.TYPE_LAB]
 
-        skill_weights_by_id, completed_sparks_count = self._get_spark_skill_profile()
+        skill_weights_by_id, completed_sparks_count = self._get_spark_skill_profile(completed_project_ids)
         mastered_skill_ids = {skill_id for skill_id, weight in skill_weights_by_id.items() if weight >= 3}
 
         spark_slots = total_slots
@@ -409,25 +523,26 @@ class ProjectQueryEngine:
 
         if lab_slots > 0 and lab_candidates:
             for project in lab_candidates:
-                project_skill_rows = list(project.projectskill_set.all())
-                project_skill_ids = {project_skill.skill_id for project_skill in project_skill_rows}
+                entry = self.catalog.get(project.id)
+                project_skill_weights = dict(entry.skill_weights) if entry else {}
+                project_skill_ids = set(project_skill_weights)
 
                 if not project_skill_ids:
                     fallback_labs.append(project)
                     continue
 
                 core_skill_ids = {
-                    project_skill.skill_id
-                    for project_skill in project_skill_rows
-                    if int(project_skill.weight or 0) >= self.LAB_CORE_SKILL_WEIGHT_THRESHOLD
+                    skill_id
+                    for skill_id, weight in project_skill_weights.items()
+                    if weight >= self.LAB_CORE_SKILL_WEIGHT_THRESHOLD
                 }
 
-                if not core_skill_ids and project_skill_rows:
-                    max_weight = max(int(project_skill.weight or 0) for project_skill in project_skill_rows)
+                if not core_skill_ids and project_skill_weights:
+                    max_weight = max(project_skill_weights.values())
                     core_skill_ids = {
-                        project_skill.skill_id
-                        for project_skill in project_skill_rows
-                        if int(project_skill.weight or 0) == max_weight
+                        skill_id
+                        for skill_id, weight in project_skill_weights.items()
+                        if weight == max_weight
                     }
 
                 matched_skill_ids = project_skill_ids.intersection(mastered_skill_ids)
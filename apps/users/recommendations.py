@@ -0,0 +1,247 @@
+"""
+Project Recommendations
+
+Scores projects against a child's quiz interests using a sparse
+project × feature matrix compiled once per catalog snapshot (see
+catalog.py). Features are a project's category and tags, the only inputs
+the scoring rule reads; the matrix is stored by column (feature -> [(row, weight)]),
+split per age band, so scoring a child is a sparse matrix-vector product
+that only touches the rows sharing a feature with the child's interest
+vector. The top-k is then taken with a heap instead of sorting every
+project.
+
+Scoring matches the original dashboard rule: +3 when the project's category
+is one of the child's interests, +1 for every interest found in its tags.
+Ties keep catalog order (featured, priority, newest first), so children with
+no quiz data get the first live projects for their age band.
+
+The precompute_recommendations command stores each child's top
+PRECOMPUTE_LIMIT in ChildRecommendation with compute_recommendations();
+get_recommendations() serves those lists and only scores online when a
+row is missing or stale: scored against a different index (compared by
+content fingerprint, so it holds across processes and cache flushes) or
+before the child's quiz inputs changed.
+"""
+
+import hashlib
+import heapq
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from django.db import close_old_connections
+from django.db.models import F, Q
+
+from .catalog import get_catalog
+from .models import ChildProfile, ChildRecommendation, Project
+
+
+CATEGORY_WEIGHT = 3
+TAG_WEIGHT = 1
+
+CATEGORY = 'category'
+TAG = 'tag'
+
+PRECOMPUTE_LIMIT = 12  # projects stored per child
+
+_index = None
+_index_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RecommendationIndex:
+    """Sparse feature matrix over the live projects of one catalog snapshot"""
+    catalog: object
+    fingerprint: str  # content hash of the rows and their features
+    entries: tuple  # row -> CatalogEntry, in catalog order
+    rows_by_age_band: MappingProxyType  # age band -> tuple of rows, ascending
+    columns_by_age_band: MappingProxyType  # age band -> {(kind, value): tuple of (row, weight)}
+
+    def score(self, vector, age_band):
+        """Sparse matrix-vector product: {row: score} for the age band's rows with a non-zero score"""
+        columns = self.columns_by_age_band.get(age_band, {})
+        scores = {}
+        for feature, value in vector.items():
+            for row, weight in columns.get(feature, ()):
+                scores[row] = scores.get(row, 0) + weight * value
+        return scores
+
+    def top_k(self, vector, age_band, limit):
+        """The `limit` best rows for an age band, highest score first, ties in catalog order"""
+        band_rows = self.rows_by_age_band.get(age_band, ())
+        if limit <= 0 or not band_rows:
+            return []
+
+        scores = self.score(vector, age_band) if vector else {}
+        positive = [(-score, row) for row, score in scores.items() if score > 0]
+        best = [row for _, row in heapq.nsmallest(limit, positive)]
+
+        # Pad with unscored projects, which all tie at zero
+        if len(best) < limit:
+            for row in band_rows:
+                if row not in scores or scores[row] <= 0:
+                    best.append(row)
+                    if len(best) == limit:
+                        break
+        return best
+
+
+def build_index(catalog):
+    """Compile the feature matrix for a catalog snapshot's live projects"""
+    entries = tuple(entry for entry in catalog.entries if entry.visibility == Project.VISIBILITY_LIVE)
+
+    digest = hashlib.md5()
+    rows_by_age_band = {}
+    columns_by_age_band = {}
+    for row, entry in enumerate(entries):
+        features = [((CATEGORY, entry.category), CATEGORY_WEIGHT)]
+        features += [((TAG, tag), TAG_WEIGHT) for tag in sorted({tag for tag in entry.tags if isinstance(tag, str)})]
+        digest.update(json.dumps([entry.id, sorted(entry.age_ranges), features], default=str).encode())
+        for age_band in entry.age_ranges:
+            rows_by_age_band.setdefault(age_band, []).append(row)
+            columns = columns_by_age_band.setdefault(age_band, {})
+            for feature, weight in features:
+                columns.setdefault(feature, []).append((row, weight))
+
+    return RecommendationIndex(
+        catalog=catalog,
+        fingerprint=digest.hexdigest(),
+        entries=entries,
+        rows_by_age_band=MappingProxyType({band: tuple(rows) for band, rows in rows_by_age_band.items()}),
+        columns_by_age_band=MappingProxyType({
+            band: MappingProxyType({feature: tuple(cells) for feature, cells in columns.items()})
+            for band, columns in columns_by_age_band.items()
+        }),
+    )
+
+
+def get_index():
+    """The index for the current catalog snapshot, rebuilt when the snapshot changes"""
+    global _index
+
+    catalog = get_catalog()
+    index = _index
+    if index is not None and index.catalog is catalog:
+        return index
+
+    with _index_lock:
+        index = _index
+        if index is None or index.catalog is not catalog:
+            index = build_index(catalog)
+            _index = index
+    return index
+
+
+def interest_vector(child):
+    """
+    A child's feature vector: each distinct interest once as a category and
+    once per occurrence as a tag (the original rule counted repeated
+    interests for tags only). Empty until the quiz is completed.
+    """
+    if not (child.quiz_completed and child.interests):
+        return {}
+    counts = Counter(interest for interest in child.interests if isinstance(interest, str))
+    vector = {(CATEGORY, interest): 1 for interest in counts}
+    vector.update({(TAG, interest): count for interest, count in counts.items()})
+    return vector
+
+
+def recommend_project_ids(child, limit=6, index=None):
+    """Ids of the child's top `limit` recommended projects, best first"""
+    index = index or get_index()
+    return [index.entries[row].id for row in index.top_k(interest_vector(child), child.age_range, limit)]
+
+
+def recommend_projects(child, limit=6, index=None):
+    """Private Project copies for the child's top recommendations, best first"""
+    index = index or get_index()
+    rows = index.top_k(interest_vector(child), child.age_range, limit)
+    return [index.entries[row].materialize() for row in rows]
+
+
+def inputs_hash(child):
+    """Fingerprint of everything interest_vector() and the age band filter read"""
+    inputs = [child.age_range, bool(child.quiz_completed), child.interests or []]
+    return hashlib.md5(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_recommendations(child, limit=6):
+    """
+    The child's recommended projects (private copies), best first.
+
+    Served from the precomputed ChildRecommendation row when it is current
+    for this catalog version and the child's quiz inputs; scored online
+    otherwise.
+    """
+    index = get_index()
+    stored = ChildRecommendation.objects.filter(child_id=child.id).first()
+    usable = (
+        stored is not None
+        and stored.catalog_hash == index.fingerprint
+        and stored.inputs_hash == inputs_hash(child)
+        # A shorter list means the age band had no more projects to offer
+        and (limit <= len(stored.project_ids) or len(stored.project_ids) < PRECOMPUTE_LIMIT)
+    )
+    if not usable:
+        return recommend_projects(child, limit, index)
+
+    entries = [index.catalog.get(project_id) for project_id in stored.project_ids[:limit]]
+    return [entry.materialize() for entry in entries if entry is not None]
+
+
+def children_needing_refresh(catalog_hash):
+    """
+    Ids of children without a current precomputed list: never computed,
+    scored against another index, or computed from different quiz inputs
+    (inputs_hash mismatch). Other profile or progress changes don't affect
+    recommendations, so they don't make a list stale.
+    """
+    stale = list(
+        ChildProfile.objects.filter(Q(recommendation__isnull=True) | ~Q(recommendation__catalog_hash=catalog_hash))
+        .values_list('id', flat=True)
+    )
+    current = (
+        ChildProfile.objects.filter(recommendation__catalog_hash=catalog_hash)
+        .only('id', 'age_range', 'quiz_completed', 'interests')
+        .annotate(stored_inputs_hash=F('recommendation__inputs_hash'))
+    )
+    stale += [child.id for child in current.iterator(chunk_size=2000) if inputs_hash(child) != child.stored_inputs_hash]
+    return sorted(stale)
+
+
+def compute_recommendations(child_ids, limit=PRECOMPUTE_LIMIT):
+    """
+    Score a chunk of children. Returns (catalog_hash, rows) with rows of
+    (child_id, project_ids, inputs_hash); safe to run in a worker process.
+    """
+    close_old_connections()
+    index = get_index()
+    rows = []
+    children = ChildProfile.objects.filter(id__in=child_ids).only('id', 'age_range', 'quiz_completed', 'interests')
+    for child in children:
+        rows.append((child.id, recommend_project_ids(child, limit, index), inputs_hash(child)))
+    close_old_connections()
+    return index.fingerprint, rows
+
+
+def store_recommendations(rows, catalog_hash, computed_at):
+    """Upsert computed lists into ChildRecommendation"""
+    ChildRecommendation.objects.bulk_create(
+        [
+            ChildRecommendation(
+                child_id=child_id,
+                project_ids=project_ids,
+                catalog_hash=catalog_hash,
+                inputs_hash=digest,
+                computed_at=computed_at,
+            )
+            for child_id, project_ids, digest in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['child'],
+        update_fields=['project_ids', 'catalog_hash', 'inputs_hash', 'computed_at'],
+        batch_size=1000,
+    )
+    return len(rows)
@@ -0,0 +1,381 @@
+"""
+Stripe Webhook Event Processing
+
+The webhook endpoint verifies the signature and hands the event to
+receive_event(), which records it in the StripeWebhookEvent inbox and
+applies it on the same request unless an earlier event for the same
+subscription is still outstanding; after a successful apply it also applies
+the later events that were waiting behind it. Stripe's duplicate deliveries
+hit the unique event_id and are dropped.
+
+Whatever isn't applied inline (held back behind a retry, or failed) is left
+for the process_stripe_events worker (the "worker" process in the Procfile),
+which drains the inbox with process_batch():
+
+- due events are claimed in batches (SELECT ... FOR UPDATE SKIP LOCKED on
+  PostgreSQL, a per-row compare-and-set UPDATE elsewhere), so several
+  workers can run at once
+- events are applied oldest first per ordering_key (the Stripe subscription,
+  or the customer when there is none), and an event waits while an earlier
+  one for the same key is still pending a retry
+- a failing event is retried with exponential backoff and marked failed
+  after MAX_ATTEMPTS; a failed event keeps holding back its key until it is
+  retried or resolved from the admin
+- events claimed by a worker that died are released after LOCK_TIMEOUT
+- a subscription snapshot (customer.subscription.*) that arrives after a
+  newer one for the same key was applied is marked processed without being
+  applied, so a late delivery can't roll the subscription back
+"""
+
+import traceback
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import StripeWebhookEvent, Subscription
+from .stripe_offline import get_stripe
+
+
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30  # doubled on every failed attempt
+RETRY_MAX_SECONDS = 3600
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def from_timestamp(value):
+    """Aware UTC datetime from a Stripe unix timestamp"""
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+def handle_checkout_session(session):
+    """Handle successful checkout"""
+    customer_id = session.get('customer')
+    subscription_id = session.get('subscription')
+    reference = session.get('client_reference_id')
+
+    # Checkout is opened with our Subscription pk as client_reference_id;
+    # older sessions were opened for an existing Stripe customer instead
+    subscription = None
+    if reference and str(reference).isdigit():
+        subscription = Subscription.objects.filter(pk=int(reference)).first()
+    if subscription is None and customer_id:
+        subscription = Subscription.objects.filter(stripe_customer_id=customer_id).first()
+    if subscription is None:
+        print(f"Subscription not found for customer {customer_id}")
+        return
+
+    new_customer = bool(customer_id) and customer_id != subscription.stripe_customer_id
+    if customer_id:
+        subscription.stripe_customer_id = customer_id
+    subscription.stripe_subscription_id = subscription_id
+    subscription.start_trial()
+    print(f"Trial started for subscription {subscription.id}")
+
+    if new_customer:
+        tag_customer(subscription)
+
+
+def tag_customer(subscription):
+    """
+    Label a customer that Checkout created with our user id and founding
+    status, as creating the customer ourselves used to. Best effort: the
+    trial doesn't wait on it.
+    """
+    try:
+        get_stripe().Customer.modify(
+            subscription.stripe_customer_id,
+            metadata={
+                'user_id': subscription.parent_profile.user_id,
+                'founding_member': subscription.founding_member,
+            },
+        )
+    except Exception as e:
+        print(f"Could not tag Stripe customer for subscription {subscription.id}: {e}")
+
+
+def apply_stripe_subscription(subscription, stripe_subscription):
+    """Copy status and period dates from a Stripe subscription (as a dict) and save"""
+    subscription.stripe_subscription_id = stripe_subscription['id']
+    subscription.status = stripe_subscription['status']
+
+    if stripe_subscription.get('trial_end'):
+        subscription.trial_end = from_timestamp(stripe_subscription['trial_end'])
+
+    if stripe_subscription.get('current_period_end'):
+        subscription.current_period_end = from_timestamp(stripe_subscription['current_period_end'])
+
+    subscription.save()
+
+
+def handle_subscription_updated(stripe_subscription):
+    """Handle subscription updates"""
+    subscription_id = stripe_subscription['id']
+
+    try:
+        subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
+        apply_stripe_subscription(subscription, stripe_subscription)
+        print(f"Subscription {subscription.id} updated to {subscription.status}")
+    except Subscription.DoesNotExist:
+        print(f"Subscription not found: {subscription_id}")
+
+
+def handle_subscription_deleted(stripe_subscription):
+    """Handle subscription cancellation"""
+    subscription_id = stripe_subscription['id']
+
+    try:
+        subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
+        subscription.status = 'canceled'
+        subscription.save()
+        print(f"Subscription {subscription.id} canceled")
+    except Subscription.DoesNotExist:
+        print(f"Subscription not found: {subscription_id}")
+
+
+def handle_subscription_refresh(refresh):
+    """Pull a subscription's state from Stripe (queued by subscription_sync.request_refresh)"""
+    from .subscription_sync import refresh_subscription
+    refresh_subscription(refresh['subscription_pk'])
+
+
+# Queued by us, not Stripe: a refresh of one subscription's state, applied by the worker
+SUBSCRIPTION_REFRESH = 'zonuko.subscription.refresh'
+
+# Event type -> handler taking the event's data.object as a plain dict
+HANDLERS = {
+    'checkout.session.completed': handle_checkout_session,
+    'customer.subscription.updated': handle_subscription_updated,
+    'customer.subscription.deleted': handle_subscription_deleted,
+    SUBSCRIPTION_REFRESH: handle_subscription_refresh,
+}
+
+
+# Events carrying the whole subscription state; an older one is superseded by any newer one
+SNAPSHOT_EVENT_TYPES = ('customer.subscription.updated', 'customer.subscription.deleted')
+
+
+def ordering_key(event):
+    """The Stripe subscription (or customer) whose events must apply in order"""
+    obj = event['data']['object']
+    if obj.get('object') == 'subscription':
+        return obj.get('id') or ''
+    return obj.get('subscription') or obj.get('customer') or ''
+
+
+def record_event(event):
+    """
+    Store a verified event (as a plain dict) in the inbox.
+
+    Returns the stored StripeWebhookEvent, or None for event types we don't
+    handle and for duplicate deliveries of an event already recorded.
+    """
+    if event['type'] not in HANDLERS:
+        return None
+    created = event.get('created')
+    try:
+        with transaction.atomic():
+            return StripeWebhookEvent.objects.create(
+                event_id=event['id'],
+                event_type=event['type'],
+                ordering_key=ordering_key(event),
+                payload=event,
+                stripe_created=from_timestamp(created) if created else timezone.now(),
+            )
+    except IntegrityError:
+        return None
+
+
+def _sorts_before(event):
+    """Events for the same key that Stripe created before `event`"""
+    return Q(stripe_created__lt=event.stripe_created) | Q(stripe_created=event.stripe_created, id__lt=event.id)
+
+
+def _claim(event, now):
+    """Compare-and-set one pending event to processing. Returns True if this caller got it"""
+    claimed = StripeWebhookEvent.objects.filter(pk=event.pk, status=StripeWebhookEvent.STATUS_PENDING).update(
+        status=StripeWebhookEvent.STATUS_PROCESSING, locked_at=now
+    )
+    if claimed:
+        event.status = StripeWebhookEvent.STATUS_PROCESSING
+        event.locked_at = now
+    return bool(claimed)
+
+
+def _next_waiting(event, now):
+    """
+    The next event for `event`'s key if it is pending and due, else None.
+    Events that are retrying, failed or claimed elsewhere stop the walk.
+    """
+    following = (
+        StripeWebhookEvent.objects.filter(ordering_key=event.ordering_key)
+        .exclude(_sorts_before(event))
+        .exclude(pk=event.pk)
+        .exclude(status=StripeWebhookEvent.STATUS_PROCESSED)
+        .order_by('stripe_created', 'id')
+        .first()
+    )
+    if following and following.status == StripeWebhookEvent.STATUS_PENDING and following.next_attempt_at <= now:
+        return following
+    return None
+
+
+def receive_event(event):
+    """
+    Record a verified event and apply it straight away when nothing earlier
+    for its ordering key is outstanding. Once it is applied, later events
+    for the key that were waiting behind it are applied too, in order.
+    Returns True if the event itself was applied; whatever is left (held
+    back, or failed and due a retry) is picked up by process_stripe_events.
+    """
+    stored = record_event(event)
+    if stored is None:
+        return False
+
+    if stored.ordering_key:
+        outstanding = (
+            StripeWebhookEvent.objects.filter(_sorts_before(stored), ordering_key=stored.ordering_key)
+            .exclude(status=StripeWebhookEvent.STATUS_PROCESSED)
+        )
+        if outstanding.exists():
+            return False
+
+    if not (_claim(stored, timezone.now()) and process_event(stored)):
+        return False
+
+    current = stored
+    while current.ordering_key:
+        now = timezone.now()
+        current = _next_waiting(current, now)
+        if current is None or not (_claim(current, now) and process_event(current)):
+            break
+    return True
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def release_stale_events(now):
+    """Put events claimed by a worker that stopped responding back in the queue"""
+    return StripeWebhookEvent.objects.filter(
+        status=StripeWebhookEvent.STATUS_PROCESSING,
+        locked_at__lt=now - LOCK_TIMEOUT,
+    ).update(status=StripeWebhookEvent.STATUS_PENDING, locked_at=None)
+
+
+def claim_batch(batch_size, now):
+    """Claim up to `batch_size` due events whose ordering key isn't blocked"""
+    due = list(
+        StripeWebhookEvent.objects.filter(
+            status=StripeWebhookEvent.STATUS_PENDING,
+            next_attempt_at__lte=now,
+        )
+        .order_by('stripe_created', 'id')
+        .values_list('id', 'ordering_key', 'stripe_created')[:batch_size]
+    )
+    if not due:
+        return []
+
+    # An event for the same key that is waiting for a retry, being applied by
+    # another worker or failed for good holds back every later event for that
+    # key. Due events outside this batch all sort after it, so they never block.
+    blocked_from = {}
+    blockers = StripeWebhookEvent.objects.filter(
+        Q(status__in=[StripeWebhookEvent.STATUS_PROCESSING, StripeWebhookEvent.STATUS_FAILED])
+        | Q(status=StripeWebhookEvent.STATUS_PENDING, next_attempt_at__gt=now),
+        ordering_key__in={key for _, key, _ in due if key},
+    ).values_list('ordering_key', 'stripe_created', 'id')
+    for key, created, event_id in blockers:
+        if key not in blocked_from or (created, event_id) < blocked_from[key]:
+            blocked_from[key] = (created, event_id)
+    candidates = [
+        event_id for event_id, key, created in due
+        if not key or key not in blocked_from or (created, event_id) < blocked_from[key]
+    ]
+
+    claim = {'status': StripeWebhookEvent.STATUS_PROCESSING, 'locked_at': now}
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            claimed = list(
+                StripeWebhookEvent.objects.select_for_update(skip_locked=True)
+                .filter(id__in=candidates, status=StripeWebhookEvent.STATUS_PENDING)
+                .values_list('id', flat=True)
+            )
+            StripeWebhookEvent.objects.filter(id__in=claimed).update(**claim)
+    else:
+        claimed = [
+            event_id for event_id in candidates
+            if StripeWebhookEvent.objects.filter(id=event_id, status=StripeWebhookEvent.STATUS_PENDING).update(**claim)
+        ]
+
+    return list(StripeWebhookEvent.objects.filter(id__in=claimed).order_by('stripe_created', 'id'))
+
+
+def is_superseded(event):
+    """True for a subscription snapshot older than one already applied for its key"""
+    if event.event_type not in SNAPSHOT_EVENT_TYPES or not event.ordering_key:
+        return False
+    return StripeWebhookEvent.objects.filter(
+        ordering_key=event.ordering_key,
+        event_type__in=SNAPSHOT_EVENT_TYPES,
+        status=StripeWebhookEvent.STATUS_PROCESSED,
+        stripe_created__gt=event.stripe_created,
+    ).exists()
+
+
+def process_event(event):
+    """Apply one claimed event. Returns True on success"""
+    handler = HANDLERS.get(event.event_type)
+    if handler and is_superseded(event):
+        print(f"Stripe event {event.event_id} is older than one already applied; skipped")
+        handler = None
+    event.attempts += 1
+    event.locked_at = None
+    try:
+        with transaction.atomic():
+            if handler:
+                handler(event.payload['data']['object'])
+            event.status = StripeWebhookEvent.STATUS_PROCESSED
+            event.processed_at = timezone.now()
+            event.last_error = ''
+            event.save(update_fields=['status', 'attempts', 'locked_at', 'processed_at', 'last_error'])
+        return True
+    except Exception as e:
+        event.last_error = traceback.format_exc()[-4000:]
+        if event.attempts >= MAX_ATTEMPTS:
+            event.status = StripeWebhookEvent.STATUS_FAILED
+        else:
+            event.status = StripeWebhookEvent.STATUS_PENDING
+            event.next_attempt_at = timezone.now() + retry_delay(event.attempts)
+        event.save(update_fields=['status', 'attempts', 'locked_at', 'last_error', 'next_attempt_at'])
+        print(f"Stripe event {event.event_id} failed (attempt {event.attempts}): {e}")
+        return False
+
+
+def process_batch(batch_size=100):
+    """
+    Claim and apply one batch of events.
+
+    Returns a Counter of processed / retrying / failed / deferred events.
+    """
+    now = timezone.now()
+    release_stale_events(now)
+
+    results = Counter()
+    failed_keys = set()
+    for event in claim_batch(batch_size, now):
+        if event.ordering_key and event.ordering_key in failed_keys:
+            # Wait behind the failed event for the same subscription
+            StripeWebhookEvent.objects.filter(pk=event.pk).update(
+                status=StripeWebhookEvent.STATUS_PENDING, locked_at=None
+            )
+            results['deferred'] += 1
+        elif process_event(event):
+            results['processed'] += 1
+        else:
+            failed_keys.add(event.ordering_key)
+            results['failed' if event.status == StripeWebhookEvent.STATUS_FAILED else 'retrying'] += 1
+    return results
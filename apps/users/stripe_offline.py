@@ -0,0 +1,222 @@
+"""
+Offline Stripe Stand-in and Webhook Recorder
+
+With STRIPE_OFFLINE=True, get_stripe() returns OfflineStripe instead of the
+stripe SDK. It implements the calls Zonuko makes (Customer.create/retrieve,
+Subscription.retrieve, checkout.Session.create) against in-process memory,
+and "delivers" the webhook events Stripe would send after a checkout
+straight into the StripeWebhookEvent inbox. Checkout, the success page and
+the event worker can then be exercised and benchmarked with no network.
+
+WebhookRecorder appends every verified webhook payload to the JSONL file
+named by STRIPE_WEBHOOK_RECORD_PATH. The replay_stripe_events command
+re-signs a recorded stream with STRIPE_WEBHOOK_SECRET and posts it back
+through the real webhook endpoint.
+"""
+
+import hashlib
+import hmac
+import itertools
+import json
+import threading
+import time
+
+import stripe
+from django.conf import settings
+
+
+def get_stripe():
+    """The stripe SDK, or the offline stand-in when STRIPE_OFFLINE is set"""
+    if getattr(settings, 'STRIPE_OFFLINE', False):
+        return offline_stripe
+    return stripe
+
+
+class OfflineObject(dict):
+    """Stripe-style object: item access, .get() and attribute access"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def sign_payload(payload, secret, timestamp=None):
+    """Stripe-Signature header value for a payload, as Stripe computes it"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    signature = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={signature}'
+
+
+class _Resource:
+    def __init__(self, backend):
+        self._backend = backend
+
+
+class _Customers(_Resource):
+    def create(self, email=None, name=None, metadata=None, **params):
+        return self._backend.create_customer(email=email, name=name, metadata=metadata or {})
+
+    def modify(self, customer_id, metadata=None, **params):
+        return self._backend.update_customer(customer_id, metadata=metadata or {})
+
+    def retrieve(self, customer_id, expand=None, **params):
+        customer = self._backend.get('customers', customer_id)
+        if expand and 'subscriptions' in expand:
+            customer = OfflineObject(customer, subscriptions=OfflineObject(
+                object='list',
+                data=[sub for sub in self._backend.subscriptions_for(customer_id)],
+            ))
+        return customer
+
+
+class _Subscriptions(_Resource):
+    def retrieve(self, subscription_id, **params):
+        return self._backend.get('subscriptions', subscription_id)
+
+
+class _CheckoutSessions(_Resource):
+    def create(self, **params):
+        return self._backend.complete_checkout(params)
+
+
+class _Checkout:
+    def __init__(self, backend):
+        self.Session = _CheckoutSessions(backend)
+
+
+class OfflineStripe:
+    """
+    In-memory stand-in for the parts of the stripe SDK Zonuko uses.
+
+    A checkout completes immediately: the session's url is its success_url,
+    and the checkout.session.completed and customer.subscription.updated
+    events are queued in the webhook inbox (and recorded, if a recorder is
+    configured) as if Stripe had delivered them.
+    """
+
+    Webhook = stripe.Webhook
+    error = stripe.error
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._objects = {'customers': {}, 'subscriptions': {}}
+        self.events = []
+        self.Customer = _Customers(self)
+        self.Subscription = _Subscriptions(self)
+        self.checkout = _Checkout(self)
+
+    def reset(self):
+        with self._lock:
+            self._objects = {'customers': {}, 'subscriptions': {}}
+            self.events = []
+
+    def _id(self, prefix):
+        return f'{prefix}_offline{next(self._ids):08d}'
+
+    def get(self, kind, object_id):
+        with self._lock:
+            obj = self._objects[kind].get(object_id)
+        if obj is None:
+            raise stripe.error.InvalidRequestError(f'No such {kind[:-1]}: {object_id!r}', 'id')
+        return obj
+
+    def subscriptions_for(self, customer_id):
+        with self._lock:
+            return [sub for sub in self._objects['subscriptions'].values() if sub['customer'] == customer_id]
+
+    def create_customer(self, email=None, name=None, metadata=None):
+        customer = OfflineObject(id=self._id('cus'), object='customer', email=email, name=name, metadata=metadata or {})
+        with self._lock:
+            self._objects['customers'][customer['id']] = customer
+        return customer
+
+    def update_customer(self, customer_id, metadata=None):
+        customer = self.get('customers', customer_id)
+        with self._lock:
+            customer['metadata'] = {**customer.get('metadata', {}), **(metadata or {})}
+        return customer
+
+    def complete_checkout(self, params):
+        customer_id = params.get('customer')
+        if not customer_id:
+            customer_id = self.create_customer(email=params.get('customer_email'))['id']
+        subscription_data = params.get('subscription_data') or {}
+        now = int(time.time())
+        period_end = now + int(subscription_data.get('trial_period_days') or 30) * 86400
+
+        subscription = OfflineObject(
+            id=self._id('sub'),
+            object='subscription',
+            customer=customer_id,
+            status='trialing' if subscription_data.get('trial_period_days') else 'active',
+            trial_end=period_end if subscription_data.get('trial_period_days') else None,
+            current_period_end=period_end,
+            metadata=subscription_data.get('metadata') or {},
+        )
+        session = OfflineObject(
+            id=self._id('cs'),
+            object='checkout.session',
+            customer=customer_id,
+            subscription=subscription['id'],
+            client_reference_id=params.get('client_reference_id'),
+            customer_email=params.get('customer_email'),
+            metadata=params.get('metadata') or {},
+            url=params.get('success_url'),
+        )
+        with self._lock:
+            self._objects['subscriptions'][subscription['id']] = subscription
+
+        self.deliver('checkout.session.completed', session, created=now)
+        self.deliver('customer.subscription.updated', subscription, created=now + 1)
+        return session
+
+    def deliver(self, event_type, obj, created=None):
+        """Hand an event to the webhook inbox, as Stripe's delivery would"""
+        from .stripe_events import receive_event
+
+        event = {
+            'id': self._id('evt'),
+            'object': 'event',
+            'type': event_type,
+            'created': created or int(time.time()),
+            'data': {'object': json.loads(json.dumps(obj))},
+        }
+        with self._lock:
+            self.events.append(event)
+        recorder.record(json.dumps(event))
+        receive_event(event)
+        return event
+
+
+offline_stripe = OfflineStripe()
+
+
+class WebhookRecorder:
+    """Appends webhook payloads to STRIPE_WEBHOOK_RECORD_PATH as JSON lines"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def record(self, payload):
+        path = getattr(settings, 'STRIPE_WEBHOOK_RECORD_PATH', '')
+        if not path:
+            return False
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
+        # One event per line, whatever the original formatting
+        line = json.dumps(json.loads(payload), separators=(',', ':'))
+        with self._lock, open(path, 'a', encoding='utf-8') as handle:
+            handle.write(line + '\n')
+        return True
+
+
+recorder = WebhookRecorder()
+
+
+def load_recording(path):
+    """Events from a recorder file, in recorded order"""
+    with open(path, encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle if line.strip()]
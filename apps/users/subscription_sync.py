@@ -0,0 +1,102 @@
+"""
+Subscription State Sync
+
+Subscription rows are kept current by Stripe webhooks (see stripe_events.py),
+so pages read them straight from the database. When a page finds a
+subscription that webhooks haven't caught up with yet (typically the success
+page, moments after checkout), request_refresh() queues a refresh in the
+webhook inbox and returns; the process_stripe_events worker pulls the state
+from Stripe, with the inbox's retries. At most
+one refresh per subscription is queued every REFRESH_COOLDOWN seconds: the
+queued event's id names the subscription and the cooldown window, so the
+inbox's unique event_id drops repeats across all workers.
+
+configure_stripe_client() gives every Stripe call in the process one pooled
+keep-alive HTTP session with a bounded timeout (STRIPE_HTTP_TIMEOUT).
+"""
+
+import time
+
+import requests
+import stripe
+from django.conf import settings
+
+from .models import Subscription
+from .stripe_events import SUBSCRIPTION_REFRESH, apply_stripe_subscription, record_event
+from .stripe_offline import get_stripe
+
+
+REFRESH_COOLDOWN = 60  # seconds between refreshes of one subscription
+HTTP_POOL_SIZE = 10
+
+
+def configure_stripe_client():
+    """Share one pooled keep-alive session between all Stripe API calls"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    stripe.default_http_client = stripe.RequestsClient(timeout=settings.STRIPE_HTTP_TIMEOUT, session=session)
+
+
+def _as_dict(stripe_object):
+    return stripe_object.to_dict() if hasattr(stripe_object, 'to_dict') else dict(stripe_object)
+
+
+def refresh_subscription(subscription_pk):
+    """
+    Pull one subscription's current state from Stripe and save it.
+
+    Returns True if anything was fetched. Stripe errors propagate, so the
+    inbox retries the refresh with backoff.
+    """
+    subscription = Subscription.objects.filter(pk=subscription_pk).first()
+    if subscription is None:
+        return False
+
+    api = get_stripe()
+    if subscription.stripe_subscription_id:
+        stripe_subscription = api.Subscription.retrieve(subscription.stripe_subscription_id)
+    elif subscription.stripe_customer_id:
+        customer = api.Customer.retrieve(subscription.stripe_customer_id, expand=['subscriptions'])
+        if not customer.subscriptions.data:
+            return False
+        stripe_subscription = customer.subscriptions.data[0]
+    else:
+        return False
+
+    apply_stripe_subscription(subscription, _as_dict(stripe_subscription))
+    return True
+
+
+def request_refresh(subscription):
+    """
+    Queue a refresh for the worker unless one was queued in this cooldown
+    window. Returns the queued inbox event, or None.
+
+    Until checkout.session.completed has linked a Stripe customer there is
+    nothing to look up; that webhook brings the state itself.
+    """
+    if not (subscription.stripe_subscription_id or subscription.stripe_customer_id):
+        return None
+    now = int(time.time())
+    return record_event({
+        'id': f'refresh_{subscription.pk}_{now // REFRESH_COOLDOWN}',
+        'type': SUBSCRIPTION_REFRESH,
+        'created': now,
+        # No subscription or customer id, so no ordering key: a refresh reads the
+        # current state whenever it runs, and a failing one never holds up webhooks
+        'data': {'object': {'object': 'subscription_refresh', 'subscription_pk': subscription.pk}},
+    })
+
+
+def get_subscription_state(parent_profile):
+    """
+    The parent's webhook-maintained subscription (or None).
+
+    Inactive rows get a refresh queued, so a webhook that is late or lost is
+    caught up without the request waiting on Stripe.
+    """
+    subscription = Subscription.objects.filter(parent_profile=parent_profile).first()
+    if subscription is not None and not subscription.is_active:
+        request_refresh(subscription)
+    return subscription
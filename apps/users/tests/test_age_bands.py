@@ -0,0 +1,37 @@
+from django.test import TestCase
+
+from apps.users.models import Project, ProjectAgeBand
+
+
+class ProjectAgeBandSyncTests(TestCase):
+    def bands(self, project):
+        return set(ProjectAgeBand.objects.filter(project=project).values_list('age_band', flat=True))
+
+    def create(self, title, age_ranges):
+        return Project.objects.create(
+            title=title, description='A project', category='science', type='spark', age_ranges=age_ranges,
+        )
+
+    def test_rows_follow_age_ranges(self):
+        project = self.create('Bridge', ['IMAGINAUTS', 'NAVIGATORS'])
+        self.assertEqual(self.bands(project), {'IMAGINAUTS', 'NAVIGATORS'})
+
+        project.age_ranges = ['NAVIGATORS', 'TRAILBLAZERS']
+        project.save()
+        self.assertEqual(self.bands(project), {'NAVIGATORS', 'TRAILBLAZERS'})
+
+        project.age_ranges = []
+        project.save()
+        self.assertEqual(self.bands(project), set())
+
+    def test_filter_matches_age_ranges(self):
+        projects = [
+            self.create('Bridge', ['IMAGINAUTS']),
+            self.create('Volcano', ['IMAGINAUTS', 'NAVIGATORS']),
+            self.create('Robot', ['TRAILBLAZERS']),
+        ]
+        for band in ('IMAGINAUTS', 'NAVIGATORS', 'TRAILBLAZERS'):
+            self.assertEqual(
+                set(Project.objects.filter(age_bands__age_band=band).values_list('id', flat=True)),
+                {project.id for project in projects if band in project.age_ranges},
+            )
@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from apps.users.badges import (
+    BADGE_RULES, CHALLENGE_REFLECTIONS, TOTAL_REFLECTIONS, earned_badge_details, evaluate_badges,
+)
+from apps.users.models import ChildProfile
+
+
+def codes(rules):
+    return [rule.code for rule in rules]
+
+
+class EvaluateBadgesTests(SimpleTestCase):
+    def test_matches_checking_every_rule(self):
+        for total in range(0, 35):
+            for challenge in (0, 9, 10, 12):
+                counters = {TOTAL_REFLECTIONS: total, CHALLENGE_REFLECTIONS: challenge}
+                for earned in (set(), {'deep_thinker'}, {'thoughtful_builder', 'resilience_builder'}):
+                    with self.subTest(total=total, challenge=challenge, earned=earned):
+                        expected = [
+                            rule.code for rule in BADGE_RULES
+                            if counters[rule.counter] >= rule.threshold and rule.code not in earned
+                        ]
+                        self.assertEqual(codes(evaluate_badges(earned, counters)), expected)
+
+    def test_only_changed_counters_are_checked(self):
+        counters = {TOTAL_REFLECTIONS: 10, CHALLENGE_REFLECTIONS: 10}
+        self.assertEqual(codes(evaluate_badges(set(), counters, [TOTAL_REFLECTIONS])), ['deep_thinker', 'thoughtful_builder'])
+        self.assertEqual(codes(evaluate_badges(set(), counters, [CHALLENGE_REFLECTIONS])), ['resilience_builder'])
+        self.assertEqual(evaluate_badges(set(), counters, []), [])
+        # A changed counter without a value is skipped
+        self.assertEqual(evaluate_badges(set(), {TOTAL_REFLECTIONS: 10}, [CHALLENGE_REFLECTIONS]), [])
+
+    def test_award_order_follows_registry(self):
+        counters = {CHALLENGE_REFLECTIONS: 10, TOTAL_REFLECTIONS: 30}
+        self.assertEqual(codes(evaluate_badges(set(), counters)), codes(BADGE_RULES))
+
+    def test_earned_details_skip_retired_codes(self):
+        self.assertEqual(
+            earned_badge_details(['retired_badge', 'deep_thinker']),
+            [{'name': BADGE_RULES[0].name, 'desc': BADGE_RULES[0].desc}],
+        )
+
+
+class CheckAndAwardBadgesTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS',
+        )
+
+    def test_awards_each_badge_once(self):
+        self.child.total_reflections = 12
+        awarded = self.child.check_and_award_badges()
+        self.assertEqual([badge['code'] for badge in awarded], ['deep_thinker', 'thoughtful_builder'])
+        self.child.refresh_from_db()
+        self.assertEqual(self.child.badges_earned, ['deep_thinker', 'thoughtful_builder'])
+        self.assertEqual(self.child.check_and_award_badges(), [])
+
+    def test_known_counts_skip_the_progress_query(self):
+        self.child.total_reflections = 5
+        with self.assertNumQueries(0):
+            awarded = self.child.check_and_award_badges(save=False, changed=[TOTAL_REFLECTIONS])
+        self.assertEqual([badge['code'] for badge in awarded], ['deep_thinker'])
+        with self.assertNumQueries(0):
+            awarded = self.child.check_and_award_badges(save=False, challenge_reflections=10)
+        self.assertEqual([badge['code'] for badge in awarded], ['resilience_builder'])
+        with self.assertNumQueries(1):
+            self.child.check_and_award_badges(save=False)
@@ -0,0 +1,68 @@
+from django.test import TestCase
+
+from apps.users.catalog import get_catalog
+from apps.users.models import Project, ProjectSkill, Skill
+from zonuko.cache import get_cache
+
+
+def create_project(title, **fields):
+    fields = {
+        'description': 'A project', 'category': 'science', 'type': 'spark',
+        'age_ranges': ['IMAGINAUTS'], 'visibility': Project.VISIBILITY_LIVE, **fields,
+    }
+    return Project.objects.create(title=title, **fields)
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = create_project('Bridge', skill_dimensions={'resilience': 2})
+            self.other = create_project('Volcano', age_ranges=['NAVIGATORS'])
+            self.skill = Skill.objects.create(name='Balance')
+
+    def test_snapshot_is_reused_until_the_catalog_changes(self):
+        snapshot = get_catalog()
+        with self.assertNumQueries(0):
+            self.assertIs(get_catalog(), snapshot)
+        self.assertEqual([entry.id for entry in snapshot.for_age_band('IMAGINAUTS')], [self.project.id])
+        self.assertEqual(dict(snapshot.get(self.project.id).skill_dimensions), {'resilience': 2})
+
+    def test_project_edit_invalidates_after_commit(self):
+        snapshot = get_catalog()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.project.title = 'Stronger bridge'
+            self.project.age_ranges = ['IMAGINAUTS', 'NAVIGATORS']
+            self.project.save()
+        # Not visible until the edit commits
+        self.assertIs(get_catalog(), snapshot)
+
+        for callback in callbacks:
+            callback()
+        entry = get_catalog().get(self.project.id)
+        self.assertEqual(entry.project.title, 'Stronger bridge')
+        self.assertEqual(entry.age_ranges, frozenset({'IMAGINAUTS', 'NAVIGATORS'}))
+        self.assertEqual(
+            {entry.id for entry in get_catalog().for_age_band('NAVIGATORS')}, {self.project.id, self.other.id},
+        )
+
+    def test_skill_weight_and_prerequisite_edits_invalidate(self):
+        get_catalog()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectSkill.objects.create(project=self.project, skill=self.skill, weight=4)
+        self.assertEqual(dict(get_catalog().get(self.project.id).skill_weights), {self.skill.id: 4})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.prerequisites.add(self.other)
+        self.assertEqual(get_catalog().get(self.project.id).prerequisite_ids, frozenset({self.other.id}))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.delete()
+        self.assertIsNone(get_catalog().get(self.other.id))
+
+    def test_materialize_returns_a_private_copy(self):
+        entry = get_catalog().get(self.project.id)
+        copy = entry.materialize()
+        copy.progress = 'mine'
+        self.assertIsNot(copy, entry.project)
+        self.assertFalse(hasattr(entry.project, 'progress'))
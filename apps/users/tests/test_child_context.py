@@ -0,0 +1,49 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.users.child_context import CHILD_CONTEXT_NAMESPACE, get_child_context
+from apps.users.models import ChildProfile, ProgressionStage
+from zonuko.cache import get_cache, invalidate_namespace
+
+
+class ChildContextTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS',
+        )
+
+    def test_cached_after_first_load(self):
+        with self.assertNumQueries(1):
+            context = get_child_context(self.child.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_child_context(self.child.id), context)
+        self.assertEqual(context.username, 'Kid')
+        self.assertEqual(context.progression_stage, ProgressionStage.EXPLORER)
+
+    def test_profile_and_stage_changes_invalidate(self):
+        get_child_context(self.child.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.username = 'Maker'
+            self.child.save()
+        self.assertEqual(get_child_context(self.child.id).username, 'Maker')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stage = ProgressionStage.objects.get(child=self.child)
+            stage.current_stage = ProgressionStage.BUILDER
+            stage.save()
+        self.assertEqual(get_child_context(self.child.id).progression_stage, ProgressionStage.BUILDER)
+
+    def test_namespace_invalidation_drops_entries(self):
+        get_child_context(self.child.id)
+        invalidate_namespace(CHILD_CONTEXT_NAMESPACE)
+        with self.assertNumQueries(1):
+            get_child_context(self.child.id)
+
+    def test_deleted_child_raises(self):
+        get_child_context(self.child.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.child.delete()
+        with self.assertRaises(ChildProfile.DoesNotExist):
+            get_child_context(self.child.id)
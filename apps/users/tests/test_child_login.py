@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+
+from apps.users.forms import ChildLoginForm, ChildProfileForm
+from apps.users.models import ChildProfile
+
+
+@override_settings(LOGIN_THROTTLE_ENABLED=False)
+class CaseInsensitiveUsernameTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=self.user.parent_profile, username='SkyBuilder', pin='1234', age_range='IMAGINAUTS',
+        )
+
+    def login(self, username, pin='1234'):
+        form = ChildLoginForm({'username': username, 'pin': pin}, client_ip='10.0.0.1')
+        return form, form.is_valid()
+
+    def test_login_ignores_case(self):
+        for username in ('SkyBuilder', 'skybuilder', 'SKYBUILDER'):
+            form, valid = self.login(username)
+            self.assertTrue(valid, username)
+            self.assertEqual(form.cleaned_data['child'], self.child)
+        self.assertFalse(self.login('skybuilder', pin='9999')[1])
+        self.assertFalse(self.login('skybuilde')[1])
+
+    def test_login_is_one_lookup(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.login('SKYBUILDER')[1])
+
+    def test_lowercase_column_follows_renames(self):
+        self.assertEqual(self.child.username_lower, 'skybuilder')
+        self.child.username = 'RiverMaker'
+        self.child.save(update_fields=['username'])
+        self.assertEqual(ChildProfile.objects.get(pk=self.child.pk).username_lower, 'rivermaker')
+        self.assertTrue(self.login('rivermaker')[1])
+
+    def test_usernames_differing_in_case_are_rejected(self):
+        form = ChildProfileForm({
+            'username': 'SKYBUILDER', 'age_range': 'IMAGINAUTS', 'avatar': 'scientist',
+            'pin': '4321', 'pin_confirm': '4321',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('username', form.errors)
+
+        # Editing the same child keeps its own name
+        form = ChildProfileForm({'username': 'skybuilder', 'age_range': 'IMAGINAUTS', 'avatar': 'scientist'}, instance=self.child)
+        self.assertNotIn('username', form.errors)
+
+        with self.assertRaises(IntegrityError):
+            ChildProfile.objects.create(
+                parent=self.user.parent_profile, username='skyBUILDER', pin='1234', age_range='IMAGINAUTS',
+            )
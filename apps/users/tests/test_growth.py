@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.models import (
+    DEFAULT_SKILL_MAPPING, ChildProfile, GrowthPathway, Project, ProjectProgress, ProjectSkillMapping,
+)
+
+
+class PathwayCompletionTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS',
+        )
+        self.project = Project.objects.create(
+            title='Bridge', description='A project', category='science', type='spark',
+            age_ranges=['IMAGINAUTS'], visibility=Project.VISIBILITY_LIVE,
+        )
+        ProjectSkillMapping.objects.create(project=self.project, thinking_points=40, making_points=120)
+
+    def points(self):
+        return {
+            pathway.pathway_type: (pathway.points, pathway.level, pathway.progress)
+            for pathway in GrowthPathway.objects.filter(child=self.child)
+        }
+
+    def test_points_granted_once_on_completion(self):
+        progress = ProjectProgress.objects.create(
+            child=self.child, project=self.project, status=ProjectProgress.STATUS_IN_PROGRESS,
+        )
+        before = self.points()
+
+        progress.status = ProjectProgress.STATUS_COMPLETED
+        progress.completed_at = timezone.now()
+        progress.save()
+        after = self.points()
+        self.assertEqual(after[GrowthPathway.THINKING][0], before.get(GrowthPathway.THINKING, (0,))[0] + 40)
+        self.assertEqual(after[GrowthPathway.MAKING], (120, 2, 13))
+
+        # Later saves of the completed row (rating, reflection) grant nothing more
+        progress.rating = 5
+        progress.save()
+        ProjectProgress.objects.get(pk=progress.pk).save()
+        self.assertEqual(self.points(), after)
+
+    def test_reflection_boost(self):
+        ProjectProgress.objects.create(
+            child=self.child, project=self.project, status=ProjectProgress.STATUS_COMPLETED,
+            completed_at=timezone.now(), has_reflection=True,
+            reflection_text='I learned the triangles make it stronger',
+        )
+        pathway = GrowthPathway.objects.get(child=self.child, pathway_type=GrowthPathway.MAKING)
+        self.assertEqual(pathway.points, 150)
+        self.assertIsNotNone(pathway.last_boosted_at)
+
+    def test_missing_mapping_uses_default(self):
+        self.project.skill_mapping.delete()
+        ProjectProgress.objects.create(
+            child=self.child, project=self.project, status=ProjectProgress.STATUS_COMPLETED,
+            completed_at=timezone.now(),
+        )
+        pathway = GrowthPathway.objects.get(child=self.child, pathway_type=GrowthPathway.MAKING)
+        self.assertEqual(pathway.points, DEFAULT_SKILL_MAPPING['making_points'])
+
+    def test_apply_contributions_is_one_batch(self):
+        GrowthPathway.objects.filter(child=self.child).delete()
+        contributions = {pathway_type: 50 for pathway_type, _label in GrowthPathway.PATHWAY_CHOICES}
+        contributions[GrowthPathway.CONTRIBUTION] = 0
+        # lock, create the missing rows, lock again, bulk update (+ savepoint)
+        with self.assertNumQueries(6):
+            updated = GrowthPathway.apply_contributions(self.child.id, contributions)
+        self.assertEqual(len(updated), 5)
+        self.assertFalse(GrowthPathway.objects.filter(child=self.child, pathway_type=GrowthPathway.CONTRIBUTION).exists())
+
+        with self.assertNumQueries(4):
+            GrowthPathway.apply_contributions(self.child.id, contributions)
+        self.assertEqual(
+            set(GrowthPathway.objects.filter(child=self.child).values_list('points', flat=True)), {100},
+        )
+        self.assertEqual(GrowthPathway.apply_contributions(self.child.id, {GrowthPathway.MAKING: 0}), [])
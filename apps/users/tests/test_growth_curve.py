@@ -0,0 +1,53 @@
+import random
+
+from django.test import SimpleTestCase
+
+from apps.users.growth import PATHWAY_LEVEL_CURVE, LevelCurve
+
+
+def reference_level_and_progress(points):
+    """The scan GrowthPathway.add_points used before the precomputed curve"""
+    level_thresholds = [0, 100, 250, 450, 700, 1000, 1350, 1750, 2200]
+    for lvl, threshold in enumerate(level_thresholds, 1):
+        if points < threshold:
+            level = max(1, lvl - 1)
+            break
+    else:
+        level = 8
+    current_threshold = level_thresholds[level - 1]
+    next_threshold = level_thresholds[min(level, 8)]
+    if next_threshold > current_threshold:
+        return level, int(((points - current_threshold) / (next_threshold - current_threshold)) * 100)
+    return level, 100
+
+
+class LevelCurveTests(SimpleTestCase):
+    def test_matches_linear_scan(self):
+        curve = PATHWAY_LEVEL_CURVE
+        edges = [value + delta for value in curve.thresholds for delta in (-1, 0, 1)]
+        for points in [0, 5000] + edges + list(range(0, 2400, 7)):
+            with self.subTest(points=points):
+                self.assertEqual(
+                    curve.level_and_progress(points),
+                    reference_level_and_progress(points),
+                )
+
+    def test_levels_for_points_matches_single_lookups(self):
+        rng = random.Random(12)
+        totals = [rng.randint(0, 2500) for _ in range(500)] + list(PATHWAY_LEVEL_CURVE.thresholds) + [0, 0, 2200]
+        rng.shuffle(totals)
+        self.assertEqual(
+            PATHWAY_LEVEL_CURVE.levels_for_points(totals),
+            [PATHWAY_LEVEL_CURVE.level_and_progress(points) for points in totals],
+        )
+        self.assertEqual(PATHWAY_LEVEL_CURVE.levels_for_points(iter([450, 99])), [(4, 0), (1, 99)])
+        self.assertEqual(PATHWAY_LEVEL_CURVE.levels_for_points([]), [])
+
+    def test_level_is_capped(self):
+        self.assertEqual(PATHWAY_LEVEL_CURVE.level(10 ** 6), 8)
+        self.assertEqual(PATHWAY_LEVEL_CURVE.level(-5), 1)
+
+    def test_custom_curve(self):
+        curve = LevelCurve((0, 10, 30, 60), max_level=3)
+        self.assertEqual(curve.level_and_progress(20), (2, 50))
+        self.assertEqual(curve.levels_for_points([45, 5, 20]), [(3, 50), (1, 50), (2, 50)])
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import urlsafe_base64_encode
+
+from apps.users.models import ChildProfile, Project, ProjectProgress
+from apps.users.parent_dashboard import (
+    attention_page, decode_attention_cursor, encode_attention_cursor, family_progress_stats,
+)
+
+
+def create_family(child_names, project_count):
+    user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+    children = [
+        ChildProfile.objects.create(parent=user.parent_profile, username=name, pin='1234', age_range='IMAGINAUTS')
+        for name in child_names
+    ]
+    projects = [
+        Project.objects.create(
+            title=f'Project {i}', description='A project', category='science', type='spark',
+            age_ranges=['IMAGINAUTS'], visibility=Project.VISIBILITY_LIVE,
+        )
+        for i in range(project_count)
+    ]
+    return user, children, projects
+
+
+class FamilyProgressStatsTests(TestCase):
+    def setUp(self):
+        _user, (self.child,), projects = create_family(['Ada'], 6)
+        now = timezone.now()
+        rows = [
+            ('completed', 'Made it stronger', 4),
+            ('completed', '', 5),
+            ('completed', '\n\t ', 3),
+            ('completed', ' ', None),
+            ('completed', 'Done', 0),
+            ('in_progress', '', None),
+        ]
+        for project, (status, reflection_text, rating) in zip(projects, rows):
+            ProjectProgress.objects.create(
+                child=self.child, project=project, status=status, started_at=now,
+                completed_at=now if status == 'completed' else None,
+                reflection_text=reflection_text, rating=rating,
+            )
+
+    def test_counts_match_python_strip_rules(self):
+        expected = ProjectProgress.objects.filter(child=self.child)
+        stats = family_progress_stats([self.child.id])[self.child.id]
+        self.assertEqual(stats['total'], expected.count())
+        self.assertEqual(
+            stats['needs_reflection'],
+            sum(1 for p in expected if p.status == 'completed' and not p.reflection_text.strip()),
+        )
+        self.assertEqual(stats['needs_rating'], sum(1 for p in expected if p.status == 'completed' and not p.rating))
+
+    def test_whitespace_reflection_needs_attention(self):
+        progress = ProjectProgress.objects.get(child=self.child, reflection_text='Made it stronger')
+        before = family_progress_stats([self.child.id])[self.child.id]['needs_reflection']
+        progress.reflection_text = '\n\t '
+        progress.save()
+        after = family_progress_stats([self.child.id])[self.child.id]['needs_reflection']
+        self.assertEqual(after, before + 1)
+
+
+class AttentionPageTests(TestCase):
+    def setUp(self):
+        _user, self.children, projects = create_family(['Ada', 'Ben'], 9)
+        self.child_ids = [child.id for child in self.children]
+
+        # Tied and missing start times exercise every branch of the keyset filter
+        now = timezone.now()
+        started = [now, now, now - timedelta(days=1), None, None, now - timedelta(days=2), now, None, now]
+        for child in self.children:
+            for project, started_at in zip(projects, started):
+                ProjectProgress.objects.create(
+                    child=child, project=project, status=ProjectProgress.STATUS_COMPLETED,
+                    started_at=started_at, completed_at=now,
+                    reflection_text='' if project.id % 2 else 'Done',
+                    rating=None if project.id % 3 else 4,
+                )
+
+    def walk(self, limit):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page, cursor = attention_page(self.child_ids, limit, cursor)
+            rows += page
+            pages += 1
+            if cursor is None:
+                return rows, pages
+
+    def test_pages_cover_the_feed_once_in_order(self):
+        everything, _ = attention_page(self.child_ids, limit=1000)
+        self.assertTrue(everything)
+        for limit in (1, 2, 3, 5, len(everything), len(everything) + 1):
+            rows, pages = self.walk(limit)
+            self.assertEqual([row.id for row in rows], [row.id for row in everything])
+            self.assertEqual(pages, max(1, -(-len(everything) // limit)))
+
+    def test_missing_start_times_sort_last(self):
+        everything, _ = attention_page(self.child_ids, limit=1000)
+        for child_id in self.child_ids:
+            started = [row.started_at for row in everything if row.child_id == child_id]
+            dated = [value for value in started if value is not None]
+            self.assertEqual(started, sorted(dated, reverse=True) + [None] * (len(started) - len(dated)))
+
+    def test_cursor_round_trip(self):
+        for row in ProjectProgress.objects.filter(child_id__in=self.child_ids):
+            self.assertEqual(
+                decode_attention_cursor(encode_attention_cursor(row)),
+                (row.child_id, row.started_at, row.id),
+            )
+
+    def test_malformed_cursor(self):
+        for cursor in ('x', 'not-base64!', urlsafe_base64_encode(b'1|2'), urlsafe_base64_encode(b'a|b|c')):
+            with self.assertRaises(ValueError):
+                decode_attention_cursor(cursor)
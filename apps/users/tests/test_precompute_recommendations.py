@@ -0,0 +1,104 @@
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.users import recommendations
+from apps.users.models import ChildProfile, ChildRecommendation, Project
+from apps.users.recommendations import (
+    PRECOMPUTE_LIMIT, children_needing_refresh, get_index, get_recommendations, recommend_project_ids,
+)
+from zonuko.cache import get_cache
+
+INTERESTS = [['science'], ['art', 'robots'], ['space', 'space'], []]
+
+
+class PrecomputeRecommendationsTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        categories = [value for value, _label in Project.CATEGORY_CHOICES]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.projects = [
+                Project.objects.create(
+                    title=f'Project {i}', description='A project', type='spark',
+                    category=categories[i % len(categories)], tags=[['robots'], ['space'], []][i % 3],
+                    age_ranges=['IMAGINAUTS'] if i % 4 else ['NAVIGATORS'], order_priority=i,
+                    visibility=Project.VISIBILITY_LIVE,
+                )
+                for i in range(30)
+            ]
+        self.children = [
+            ChildProfile.objects.create(
+                parent=user.parent_profile, username=f'kid{number}', pin='1234',
+                age_range='NAVIGATORS' if number == 3 else 'IMAGINAUTS',
+                interests=interests, quiz_completed=bool(interests),
+            )
+            for number, interests in enumerate(INTERESTS)
+        ]
+
+    def precompute(self, *args):
+        call_command('precompute_recommendations', '--workers', '1', *args, stdout=io.StringIO())
+
+    def stored(self, child):
+        return ChildRecommendation.objects.get(child=child).project_ids
+
+    def test_stored_lists_match_live_scoring(self):
+        self.precompute()
+        for child in self.children:
+            self.assertEqual(self.stored(child), recommend_project_ids(child, PRECOMPUTE_LIMIT))
+        # NAVIGATORS only has 8 projects to offer
+        self.assertEqual(len(self.stored(self.children[3])), 8)
+
+    def test_current_lists_are_served_without_scoring(self):
+        self.precompute()
+        child = self.children[1]
+        with mock.patch.object(recommendations, 'recommend_projects', wraps=recommendations.recommend_projects) as live:
+            served = get_recommendations(child, limit=6)
+            # The band's whole list is stored, so larger limits are served too
+            get_recommendations(self.children[3], limit=20)
+        live.assert_not_called()
+        self.assertEqual([project.id for project in served], recommend_project_ids(child, 6))
+
+        # More than was stored falls back to live scoring
+        with mock.patch.object(recommendations, 'recommend_projects', wraps=recommendations.recommend_projects) as live:
+            self.assertEqual(len(get_recommendations(child, limit=PRECOMPUTE_LIMIT + 1)), PRECOMPUTE_LIMIT + 1)
+        live.assert_called_once()
+
+    def test_refresh_picks_up_quiz_and_catalog_changes(self):
+        fingerprint = get_index().fingerprint
+        self.assertEqual(children_needing_refresh(fingerprint), sorted(child.id for child in self.children))
+        self.precompute()
+        self.assertEqual(children_needing_refresh(fingerprint), [])
+
+        # Changes that don't touch the quiz inputs leave the list current
+        child = self.children[0]
+        child.total_reflections = 4
+        child.save()
+        self.assertEqual(children_needing_refresh(fingerprint), [])
+
+        child.interests = ['robots']
+        child.save()
+        self.assertEqual(children_needing_refresh(fingerprint), [child.id])
+        self.assertEqual(
+            [project.id for project in get_recommendations(child)], recommend_project_ids(child, 6),
+        )
+        self.precompute()
+        self.assertEqual(self.stored(child), recommend_project_ids(child, PRECOMPUTE_LIMIT))
+
+        project = self.projects[5]
+        project.tags = ['volcanoes']
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        fingerprint = get_index().fingerprint
+        self.assertEqual(children_needing_refresh(fingerprint), sorted(child.id for child in self.children))
+
+    def test_unscored_edits_keep_the_fingerprint(self):
+        fingerprint = get_index().fingerprint
+        project = self.projects[2]
+        project.description = 'A rewritten description'
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(get_index().fingerprint, fingerprint)
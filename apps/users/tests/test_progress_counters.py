@@ -0,0 +1,135 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.models import ChildDailyActivity, ChildProfile, ChildProgressSummary, Project, ProjectProgress
+
+
+STATUSES = [
+    ProjectProgress.STATUS_NOT_STARTED,
+    ProjectProgress.STATUS_IN_PROGRESS,
+    ProjectProgress.STATUS_COMPLETED,
+]
+REFLECTIONS = ['', '   ', 'I learned how to make the bridge hold more weight']
+
+
+class IncrementalCountersTests(TestCase):
+    """The signal-maintained summary and daily rollups must equal a full rebuild"""
+
+    def setUp(self):
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS',
+        )
+        # Run the on-commit catalog version bump, so the skill dimensions the
+        # counters read come from these projects and not an earlier test's
+        with self.captureOnCommitCallbacks(execute=True):
+            self.projects = [
+                Project.objects.create(
+                    title=f'Project {i}', description='A project', category='science', type='spark',
+                    age_ranges=['IMAGINAUTS'], visibility=Project.VISIBILITY_LIVE,
+                    skill_dimensions={'creative_thinking': 1 + i % 3, 'resilience': i % 2},
+                )
+                for i in range(8)
+            ]
+
+    def snapshot(self):
+        summary = ChildProgressSummary.objects.get(child=self.child)
+        days = sorted(
+            (row.day, row.completions, row.reflections, row.creative_thinking, row.practical_making,
+             row.problem_solving, row.resilience)
+            for row in ChildDailyActivity.objects.filter(child=self.child)
+            # Rows emptied by decrements are left behind; a rebuild doesn't create them
+            if any((row.completions, row.reflections, row.creative_thinking, row.practical_making,
+                    row.problem_solving, row.resilience))
+        )
+        counts = (summary.completed_count, summary.reflection_count, summary.in_progress_count, summary.skill_totals)
+        return counts, days
+
+    def random_moment(self, rng):
+        return timezone.now() - timedelta(days=rng.randint(0, 9), hours=rng.randint(0, 23))
+
+    def randomize(self, progress, rng):
+        progress.status = rng.choice(STATUSES)
+        progress.completed_at = self.random_moment(rng) if rng.random() < 0.7 else None
+        progress.reflection_text = rng.choice(REFLECTIONS)
+        progress.has_reflection = bool(progress.reflection_text.strip())
+        progress.reflection_at = self.random_moment(rng) if progress.has_reflection else None
+
+    def test_random_changes_match_rebuild(self):
+        rng = random.Random(2024)
+        for _ in range(250):
+            rows = list(ProjectProgress.objects.filter(child=self.child))
+            used = {row.project_id for row in rows}
+            free = [project for project in self.projects if project.id not in used]
+            roll = rng.random()
+
+            if free and (roll < 0.2 or not rows):
+                progress = ProjectProgress(child=self.child, project=rng.choice(free))
+                self.randomize(progress, rng)
+                progress.save()
+            elif roll < 0.3:
+                rng.choice(rows).delete()
+            elif roll < 0.35:
+                # Catalog edits mustn't change what earlier completions took or give back
+                project = rng.choice(self.projects)
+                project.skill_dimensions = {key: rng.randint(0, 3) for key in ChildProgressSummary.SKILL_KEYS}
+                with self.captureOnCommitCallbacks(execute=True):
+                    project.save()
+            else:
+                # Two copies of one row saved in turn, as two requests would
+                progress = rng.choice(rows)
+                stale = ProjectProgress.objects.get(pk=progress.pk)
+                for instance in (progress, stale):
+                    self.randomize(instance, rng)
+                    instance.save()
+
+        incremental = self.snapshot()
+        ChildProgressSummary.rebuild_for([self.child.id])
+        ChildDailyActivity.rebuild_for([self.child.id])
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_reflection_count_matches_challenge_query(self):
+        rng = random.Random(7)
+        for project in self.projects:
+            progress = ProjectProgress(child=self.child, project=project)
+            self.randomize(progress, rng)
+            progress.save()
+
+        expected = (
+            ProjectProgress.objects.filter(child=self.child, status=ProjectProgress.STATUS_COMPLETED)
+            .exclude(reflection_text='')
+            .count()
+        )
+        self.assertEqual(ChildProgressSummary.objects.get(child=self.child).reflection_count, expected)
+
+    def test_uncompleting_takes_back_the_credited_skills(self):
+        project = self.projects[1]
+        progress = ProjectProgress.objects.create(
+            child=self.child, project=project, status=ProjectProgress.STATUS_COMPLETED, completed_at=timezone.now(),
+        )
+        credited = {'creative_thinking': 2, 'resilience': 1}
+        self.assertEqual(progress.credited_skills, credited)
+
+        project.skill_dimensions = {'creative_thinking': 3, 'problem_solving': 2}
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+
+        progress = ProjectProgress.objects.get(pk=progress.pk)
+        progress.completed_at += timedelta(days=1)
+        progress.save()
+        self.assertEqual(progress.credited_skills, credited)
+
+        progress.status = ProjectProgress.STATUS_IN_PROGRESS
+        progress.save()
+        self.assertEqual(progress.credited_skills, {})
+        summary = ChildProgressSummary.objects.get(child=self.child)
+        self.assertEqual(summary.skill_totals, dict.fromkeys(ChildProgressSummary.SKILL_KEYS, 0))
+        self.assertEqual(self.snapshot()[1], [])
+
+        progress.status = ProjectProgress.STATUS_COMPLETED
+        progress.save()
+        self.assertEqual(progress.credited_skills, project.skill_dimensions)
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.users.models import (
+    ChildProfile, InspirationShare, Project, ProjectInstructionStep, ProjectProgress, ProjectSkill,
+    ProjectSkillMapping, Skill,
+)
+from zonuko.cache import get_cache
+from zonuko.query_budget import assert_query_budget, report
+
+
+class ViewQueryBudgetTests(TestCase):
+    """Each view stays within its VIEW_QUERY_BUDGETS entry with a long progress history"""
+
+    PROJECTS = 40
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        cls.children = [
+            ChildProfile.objects.create(
+                parent=cls.user.parent_profile, username=name, pin='1234', age_range='IMAGINAUTS',
+                quiz_completed=True, interests=['science'],
+            )
+            for name in ('Ada', 'Ben', 'Cy')
+        ]
+        skills = [Skill.objects.create(name=f'Skill {i}') for i in range(5)]
+        cls.projects = []
+        for i in range(cls.PROJECTS):
+            project = Project.objects.create(
+                title=f'Project {i}', description='A project', category='science', type='spark',
+                age_ranges=['IMAGINAUTS'], visibility=Project.VISIBILITY_LIVE, tags=['science'],
+                skill_dimensions={'creative_thinking': 2, 'resilience': 1},
+            )
+            for skill in skills[i % 3:i % 3 + 2]:
+                ProjectSkill.objects.create(project=project, skill=skill, weight=3)
+            ProjectSkillMapping.objects.create(project=project, thinking_points=5, making_points=3)
+            for order in range(1, 4):
+                ProjectInstructionStep.objects.create(project=project, order=order, title=f'Step {order}')
+            cls.projects.append(project)
+
+        now = timezone.now()
+        for child in cls.children:
+            for i, project in enumerate(cls.projects[:30]):
+                completed = i % 4 != 0
+                progress = ProjectProgress.objects.create(
+                    child=child, project=project,
+                    status=ProjectProgress.STATUS_COMPLETED if completed else ProjectProgress.STATUS_IN_PROGRESS,
+                    started_at=now - timedelta(days=i), completed_at=now - timedelta(days=i) if completed else None,
+                    reflection_text='I made it stronger' if i % 3 else '', rating=4 if i % 2 else None,
+                )
+                if completed and i % 5 == 0:
+                    InspirationShare.objects.create(child=child, project_progress=progress)
+
+    def setUp(self):
+        get_cache().clear()
+
+    def child_client(self):
+        session = self.client.session
+        session['child_id'] = self.children[0].id
+        session.save()
+        return self.client
+
+    def assert_view_within_budget(self, view_name, url):
+        # Budgets are for warm caches; the first request builds the catalog snapshot
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with assert_query_budget(view_name):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_child_dashboard(self):
+        self.child_client()
+        self.assert_view_within_budget('users:child_dashboard', reverse('users:child_dashboard'))
+
+    def test_project_detail(self):
+        self.child_client()
+        url = reverse('users:project_detail', args=[self.projects[1].id])
+        self.assert_view_within_budget('users:project_detail', url)
+
+    def test_growth_map(self):
+        self.child_client()
+        self.assert_view_within_budget('users:growth_map', reverse('users:growth_map'))
+
+    def test_parent_dashboard(self):
+        self.client.force_login(self.user)
+        self.assert_view_within_budget('users:dashboard', reverse('users:dashboard'))
+
+    def test_attention_items_api(self):
+        self.client.force_login(self.user)
+        self.assert_view_within_budget('users:attention_items_api', reverse('users:attention_items_api'))
+        # Later pages cost the same
+        cursor = self.client.get(reverse('users:attention_items_api'), {'limit': 5}).json()['next_cursor']
+        self.assertIsNotNone(cursor)
+        with assert_query_budget('users:attention_items_api'):
+            self.client.get(reverse('users:attention_items_api'), {'limit': 5, 'cursor': cursor})
+
+    def test_family_activity_api(self):
+        self.client.force_login(self.user)
+        url = reverse('users:family_activity_api')
+        self.assert_view_within_budget('users:family_activity_api', f'{url}?days=30')
+        with assert_query_budget('users:family_activity_api'):
+            response = self.client.get(url, {'days': 30, 'child': self.children[1].id})
+        completed = ProjectProgress.objects.filter(child=self.children[1], status=ProjectProgress.STATUS_COMPLETED)
+        self.assertEqual(response.json()['totals']['completions'], completed.count())
+
+    def test_family_activity_api_hides_other_families(self):
+        other = User.objects.create_user('other@example.com', 'other@example.com', 'password')
+        self.client.force_login(other)
+        url = reverse('users:family_activity_api')
+        self.assertEqual(self.client.get(url, {'child': self.children[0].id}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'child': 'x'}).status_code, 404)
+        self.assertEqual(self.client.get(url).json()['totals']['completions'], 0)
+
+    @override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGETS={'users:growth_map': 1})
+    def test_middleware_logs_requests_over_budget(self):
+        self.addCleanup(report.reset)
+        client = Client()  # loads the middleware with the overridden settings
+        session = client.session
+        session['child_id'] = self.children[0].id
+        session.save()
+        with self.assertLogs('zonuko.query_budget', 'WARNING') as logs:
+            response = client.get(reverse('users:growth_map'))
+        self.assertEqual(response['X-Query-Budget'], '1')
+        self.assertIn('Query budget exceeded for users:growth_map', logs.output[0])
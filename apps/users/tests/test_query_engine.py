@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.catalog import get_catalog
+from apps.users.models import ChildProfile, ProgressionStage, Project, ProjectProgress
+from apps.users.query_engine import ProjectQueryEngine
+from zonuko.cache import get_cache
+
+
+class EngineTestCase(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.child = ChildProfile.objects.create(
+            parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS',
+        )
+        now = timezone.now()
+        layout = [
+            # (minimum_stage, type, visibility, published_at)
+            *[(1, Project.TYPE_SPARK, Project.VISIBILITY_LIVE, None)] * 4,
+            (1, Project.TYPE_LAB, Project.VISIBILITY_LIVE, None),
+            *[(2, Project.TYPE_SPARK, Project.VISIBILITY_LIVE, None)] * 3,
+            (2, Project.TYPE_LAB, Project.VISIBILITY_SCHEDULED, now - timedelta(days=1)),
+            (2, Project.TYPE_SPARK, Project.VISIBILITY_SCHEDULED, now + timedelta(days=1)),
+            *[(3, Project.TYPE_SPARK, Project.VISIBILITY_LIVE, None)] * 3,
+            *[(1, Project.TYPE_SPARK, Project.VISIBILITY_COMING_SOON, None)] * 2,
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.projects = [
+                Project.objects.create(
+                    title=f'Project {i}', description='A project', category='science', type=project_type,
+                    age_ranges=['IMAGINAUTS'], minimum_stage=stage, visibility=visibility, published_at=published_at,
+                )
+                for i, (stage, project_type, visibility, published_at) in enumerate(layout)
+            ]
+
+    def set_progress(self, completed, in_progress=()):
+        now = timezone.now()
+        for offset, project in enumerate(completed):
+            ProjectProgress.objects.create(
+                child=self.child, project=project, status=ProjectProgress.STATUS_COMPLETED,
+                started_at=now - timedelta(hours=offset + 1), completed_at=now - timedelta(hours=offset),
+            )
+        for project in in_progress:
+            ProjectProgress.objects.create(
+                child=self.child, project=project, status=ProjectProgress.STATUS_IN_PROGRESS, started_at=now,
+            )
+
+    def set_stage(self, stage):
+        ProgressionStage.objects.filter(child=self.child).update(current_stage=stage)
+        return ChildProfile.objects.select_related('progression_stage').get(pk=self.child.pk)
+
+
+def ids(projects):
+    return [project.id for project in projects]
+
+
+class DashboardBundleTests(EngineTestCase):
+    def test_bundle_matches_the_separate_engine_calls(self):
+        self.set_progress(self.projects[:3], in_progress=self.projects[5:6])
+        get_catalog()
+
+        with self.assertNumQueries(1):
+            bundle = ProjectQueryEngine(self.child).get_dashboard_bundle()
+        self.assertEqual(bundle['calculated_stage'], ProgressionStage.EXPERIMENTER)
+        self.assertEqual(bundle['completed_count'], 3)
+
+        engine = ProjectQueryEngine(self.set_stage(bundle['calculated_stage']))
+        lists = engine.get_dashboard_lists()
+        for key in ('available_projects', 'in_progress_projects', 'new_projects'):
+            self.assertEqual(ids(bundle[key]), ids(lists[key]), key)
+        self.assertEqual(ids(bundle['teasers']), ids(engine.get_teasers()))
+        self.assertEqual(ids(bundle['coming_soon']), ids(engine.get_coming_soon()))
+        self.assertEqual(
+            [progress.project_id for progress in bundle['completed_projects']], ids(self.projects[:3]),
+        )
+
+    def test_future_scheduled_projects_stay_hidden(self):
+        self.set_progress(self.projects[:3])
+        bundle = ProjectQueryEngine(self.child).get_dashboard_bundle()
+        available = set(ids(bundle['available_projects']))
+        self.assertIn(self.projects[8].id, available)
+        self.assertNotIn(self.projects[9].id, available)
+
+
+class EffectiveStageMemoTests(EngineTestCase):
+    def setUp(self):
+        super().setUp()
+        get_catalog()
+
+    def test_engine_calls_share_one_progress_query(self):
+        child = self.set_stage(ProgressionStage.EXPLORER)
+        engine = ProjectQueryEngine(child)
+        with self.assertNumQueries(1):
+            engine.get_available()
+            engine.get_featured()
+            engine.get_sparks()
+            engine.get_labs()
+            engine.get_by_category('science')
+
+        # A later request reads the shared cache
+        with self.assertNumQueries(0):
+            ProjectQueryEngine(child).get_available()
+
+    def test_progress_changes_move_the_effective_stage(self):
+        stage_two = self.projects[5].id
+        self.assertNotIn(stage_two, ids(ProjectQueryEngine(self.set_stage(ProgressionStage.EXPLORER)).get_available()))
+
+        # Finishing every stage-one project assists the child into stage two
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_progress(self.projects[:5])
+        child = self.set_stage(ProgressionStage.EXPLORER)
+        self.assertIn(stage_two, ids(ProjectQueryEngine(child).get_available()))
@@ -0,0 +1,85 @@
+import random
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.users.models import ChildProfile, Project
+from apps.users.recommendations import get_index, recommend_project_ids
+from zonuko.cache import get_cache
+
+BANDS = ['IMAGINAUTS', 'NAVIGATORS', 'TRAILBLAZERS']
+CATEGORIES = [value for value, _label in Project.CATEGORY_CHOICES]
+TAGS = CATEGORIES + ['robots', 'space', 'music', 'bridges']
+
+
+def old_recommendations(child, limit):
+    """The scoring loop get_recommended_projects ran before the feature index"""
+    projects = list(Project.objects.filter(visibility=Project.VISIBILITY_LIVE, age_bands__age_band=child.age_range))
+    if not (child.quiz_completed and child.interests):
+        return [project.id for project in projects[:limit]]
+    interest_matches = []
+    for project in projects:
+        score = 0
+        if project.category in child.interests:
+            score += 3
+        for interest in child.interests:
+            if interest in project.tags:
+                score += 1
+        interest_matches.append((project, score))
+    interest_matches.sort(key=lambda x: x[1], reverse=True)
+    return [project.id for project, _score in interest_matches[:limit]]
+
+
+class RecommendationParityTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        rng = random.Random(24)
+        self.user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(60):
+                Project.objects.create(
+                    title=f'Project {i}', description='A project', type='spark',
+                    category=rng.choice(CATEGORIES),
+                    tags=rng.sample(TAGS, rng.randint(0, 3)),
+                    age_ranges=rng.sample(BANDS, rng.randint(1, 2)),
+                    # Distinct priorities give the catalog and the old query one order
+                    order_priority=rng.randint(0, 10_000) * 100 + i,
+                    is_featured=rng.random() < 0.1,
+                    visibility=Project.VISIBILITY_LIVE if rng.random() < 0.85 else Project.VISIBILITY_HIDDEN,
+                )
+        self.rng = rng
+
+    def child(self, number, interests, quiz_completed=True):
+        return ChildProfile.objects.create(
+            parent=self.user.parent_profile, username=f'kid{number}', pin='1234',
+            age_range=self.rng.choice(BANDS), interests=interests, quiz_completed=quiz_completed,
+        )
+
+    def test_matches_old_scoring(self):
+        for number in range(120):
+            interests = [self.rng.choice(TAGS) for _ in range(self.rng.randint(0, 4))]
+            child = self.child(number, interests, quiz_completed=self.rng.random() < 0.8)
+            for limit in (1, 6, 100):
+                with self.subTest(interests=interests, band=child.age_range, limit=limit):
+                    self.assertEqual(recommend_project_ids(child, limit), old_recommendations(child, limit))
+
+    def test_repeated_interests_count_once_for_category(self):
+        child = self.child(1, ['space', 'space', 'art', 'art'])
+        self.assertEqual(recommend_project_ids(child, 10), old_recommendations(child, 10))
+
+    def test_scoring_runs_no_queries(self):
+        child = self.child(1, ['robots', 'science'])
+        get_index()
+        with self.assertNumQueries(0):
+            recommend_project_ids(child, 6)
+
+    def test_index_follows_catalog_changes(self):
+        child = self.child(1, ['volcanoes'])
+        before = get_index()
+        project = Project.objects.filter(age_bands__age_band=child.age_range, visibility=Project.VISIBILITY_LIVE).last()
+        project.tags = ['volcanoes', 'volcanoes']
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertIsNot(get_index(), before)
+        self.assertEqual(recommend_project_ids(child, 6), old_recommendations(child, 6))
+        self.assertEqual(recommend_project_ids(child, 1), [project.id])
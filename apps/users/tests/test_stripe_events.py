@@ -0,0 +1,123 @@
+import contextlib
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.users import stripe_events
+from apps.users.models import StripeWebhookEvent, Subscription
+from apps.users.stripe_events import MAX_ATTEMPTS, process_batch, receive_event, record_event
+
+
+def subscription_event(number, status, created, subscription_id='sub_1'):
+    return {
+        'id': f'evt_{number}',
+        'object': 'event',
+        'type': 'customer.subscription.updated',
+        'created': created,
+        'data': {'object': {'object': 'subscription', 'id': subscription_id, 'status': status}},
+    }
+
+
+class OutOfOrderWebhookTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.subscription = Subscription.objects.create(
+            parent_profile=user.parent_profile, stripe_subscription_id='sub_1', status='incomplete',
+        )
+        # Handlers and the worker report with print()
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def status(self):
+        self.subscription.refresh_from_db()
+        return self.subscription.status
+
+    def event_status(self, number):
+        return StripeWebhookEvent.objects.get(event_id=f'evt_{number}').status
+
+    def failing_handler(self):
+        return mock.patch.dict(
+            stripe_events.HANDLERS, {'customer.subscription.updated': mock.Mock(side_effect=RuntimeError('down'))}
+        )
+
+    def test_in_order_events_apply_inline(self):
+        self.assertTrue(receive_event(subscription_event(1, 'trialing', 100)))
+        self.assertTrue(receive_event(subscription_event(2, 'active', 200)))
+        self.assertEqual(self.status(), 'active')
+        self.assertFalse(receive_event(subscription_event(2, 'active', 200)))  # redelivery
+
+    def test_worker_applies_oldest_first(self):
+        record_event(subscription_event(2, 'active', 200))
+        record_event(subscription_event(1, 'trialing', 100))
+        self.assertEqual(process_batch()['processed'], 2)
+        self.assertEqual(self.status(), 'active')
+
+    def test_event_waits_behind_retrying_event(self):
+        with self.failing_handler():
+            self.assertFalse(receive_event(subscription_event(1, 'trialing', 100)))
+        self.assertFalse(receive_event(subscription_event(2, 'active', 200)))
+        self.assertEqual(self.event_status(2), StripeWebhookEvent.STATUS_PENDING)
+
+        # The retry isn't due yet, so the later event stays held back
+        self.assertEqual(process_batch()['processed'], 0)
+        self.assertEqual(self.status(), 'incomplete')
+
+        StripeWebhookEvent.objects.filter(event_id='evt_1').update(next_attempt_at=self.subscription.created_at)
+        self.assertEqual(process_batch()['processed'], 2)
+        self.assertEqual(self.status(), 'active')
+
+    def test_failed_event_blocks_its_key_until_retried(self):
+        with self.failing_handler():
+            receive_event(subscription_event(1, 'trialing', 100))
+        StripeWebhookEvent.objects.filter(event_id='evt_1').update(
+            status=StripeWebhookEvent.STATUS_FAILED, attempts=MAX_ATTEMPTS,
+        )
+        receive_event(subscription_event(2, 'active', 200))
+        receive_event(subscription_event(3, 'canceled', 50, subscription_id='sub_other'))
+
+        results = process_batch()
+        self.assertEqual(results['processed'], 0)
+        self.assertEqual(self.event_status(2), StripeWebhookEvent.STATUS_PENDING)
+        self.assertEqual(self.event_status(3), StripeWebhookEvent.STATUS_PROCESSED)  # other keys aren't held up
+
+        StripeWebhookEvent.objects.filter(event_id='evt_1').update(
+            status=StripeWebhookEvent.STATUS_PENDING, next_attempt_at=self.subscription.created_at,
+        )
+        self.assertEqual(process_batch()['processed'], 2)
+        self.assertEqual(self.status(), 'active')
+
+    def test_late_older_snapshot_is_skipped(self):
+        receive_event(subscription_event(2, 'canceled', 200))
+        self.assertTrue(receive_event(subscription_event(1, 'active', 100)))
+        self.assertEqual(self.event_status(1), StripeWebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(self.status(), 'canceled')
+
+    def test_waiting_events_apply_once_the_earlier_one_succeeds(self):
+        # checkout.session.completed for the subscription is still being retried
+        checkout = {
+            'id': 'evt_1', 'object': 'event', 'type': 'checkout.session.completed', 'created': 100,
+            'data': {'object': {'object': 'checkout.session', 'subscription': 'sub_1', 'customer': 'cus_1',
+                                'client_reference_id': str(self.subscription.pk)}},
+        }
+        with mock.patch.dict(stripe_events.HANDLERS, {'checkout.session.completed': mock.Mock(side_effect=RuntimeError('down'))}):
+            self.assertFalse(receive_event(checkout))
+        self.assertFalse(receive_event(subscription_event(2, 'trialing', 200)))
+        self.assertFalse(receive_event(subscription_event(3, 'active', 300)))
+        self.assertEqual(self.status(), 'incomplete')
+
+        # The worker retries it once due, and the events behind it follow in order
+        StripeWebhookEvent.objects.filter(event_id='evt_1').update(next_attempt_at=self.subscription.created_at)
+        self.assertEqual(process_batch()['processed'], 3)
+        self.assertEqual(self.status(), 'active')
+
+    def test_inline_apply_drains_events_held_behind_it(self):
+        # evt_2 and evt_3 were recorded and held while evt_1 was being applied elsewhere
+        record_event(subscription_event(2, 'trialing', 200))
+        record_event(subscription_event(3, 'active', 300))
+        self.assertTrue(receive_event(subscription_event(1, 'incomplete', 100)))
+        self.assertEqual(self.event_status(2), StripeWebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(self.event_status(3), StripeWebhookEvent.STATUS_PROCESSED)
+        self.assertEqual(self.status(), 'active')
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.users.models import StripeWebhookEvent, Subscription
+from apps.users.stripe_events import process_batch, record_event
+from apps.users.stripe_offline import load_recording, offline_stripe, sign_payload
+
+SECRET = 'whsec_test'
+
+
+@override_settings(STRIPE_OFFLINE=True, STRIPE_WEBHOOK_SECRET=SECRET)
+class OfflineStripeTests(TestCase):
+    def setUp(self):
+        offline_stripe.reset()
+        self.addCleanup(offline_stripe.reset)
+        self.user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.client.force_login(self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.recording = os.path.join(directory.name, 'webhooks.jsonl')
+        # Checkout, the handlers and the worker report with print()
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def subscription(self):
+        return Subscription.objects.get(parent_profile=self.user.parent_profile)
+
+    def checkout(self):
+        with self.settings(STRIPE_WEBHOOK_RECORD_PATH=self.recording):
+            return self.client.get(reverse('users:start_subscription'))
+
+    def test_checkout_completes_without_network(self):
+        response = self.checkout()
+        self.assertRedirects(response, 'http://testserver/members/subscription/success/', fetch_redirect_response=False)
+
+        subscription = self.subscription()
+        self.assertEqual(subscription.status, 'trialing')
+        self.assertTrue(subscription.stripe_customer_id.startswith('cus_offline'))
+        self.assertEqual(
+            [event['type'] for event in offline_stripe.events],
+            ['checkout.session.completed', 'customer.subscription.updated'],
+        )
+        self.assertFalse(StripeWebhookEvent.objects.exclude(status=StripeWebhookEvent.STATUS_PROCESSED).exists())
+
+        stripe_sub = offline_stripe.Subscription.retrieve(subscription.stripe_subscription_id)
+        self.assertEqual(stripe_sub.status, 'trialing')
+        customer = offline_stripe.Customer.retrieve(subscription.stripe_customer_id, expand=['subscriptions'])
+        self.assertEqual([sub['id'] for sub in customer.subscriptions.data], [stripe_sub.id])
+
+    def test_recording_replays_through_the_webhook(self):
+        self.checkout()
+        self.assertEqual(load_recording(self.recording), offline_stripe.events)
+
+        StripeWebhookEvent.objects.all().delete()
+        Subscription.objects.filter(pk=self.subscription().pk).update(status='incomplete', stripe_subscription_id='')
+
+        out = io.StringIO()
+        call_command('replay_stripe_events', self.recording, '--process', '--secret', SECRET, stdout=out)
+        self.assertIn('0 rejected', out.getvalue())
+        self.assertEqual(self.subscription().status, 'trialing')
+        self.assertEqual(StripeWebhookEvent.objects.count(), 2)
+
+        # Replayed again, the same events are ignored as redeliveries
+        call_command('replay_stripe_events', self.recording, '--secret', SECRET, stdout=out)
+        self.assertEqual(StripeWebhookEvent.objects.count(), 2)
+
+    def test_webhook_records_only_verified_payloads(self):
+        payload = json.dumps({
+            'id': 'evt_1', 'object': 'event', 'type': 'customer.subscription.updated', 'created': 100,
+            'data': {'object': {'object': 'subscription', 'id': 'sub_1', 'status': 'active'}},
+        })
+        url = reverse('users:stripe_webhook')
+        with self.settings(STRIPE_WEBHOOK_RECORD_PATH=self.recording):
+            forged = self.client.post(url, payload, content_type='application/json',
+                                      HTTP_STRIPE_SIGNATURE=sign_payload(payload, 'whsec_other'))
+            self.assertEqual(forged.status_code, 400)
+            self.assertFalse(os.path.exists(self.recording))
+
+            signed = self.client.post(url, payload, content_type='application/json',
+                                      HTTP_STRIPE_SIGNATURE=sign_payload(payload, SECRET))
+            self.assertEqual(signed.status_code, 200)
+        self.assertEqual(load_recording(self.recording), [json.loads(payload)])
+
+    def test_events_sharing_a_timestamp_do_not_starve_the_batch(self):
+        for number in (1, 2):
+            record_event({
+                'id': f'evt_{number}', 'object': 'event', 'type': 'customer.subscription.updated', 'created': 100,
+                'data': {'object': {'object': 'subscription', 'id': 'sub_1', 'status': 'active'}},
+            })
+        self.assertEqual(process_batch(batch_size=1)['processed'], 1)
+        self.assertEqual(process_batch(batch_size=1)['processed'], 1)
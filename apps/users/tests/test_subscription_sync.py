@@ -0,0 +1,73 @@
+import contextlib
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from apps.users import stripe_events, subscription_sync
+from apps.users.models import StripeWebhookEvent, Subscription
+from apps.users.stripe_events import SUBSCRIPTION_REFRESH, process_batch, receive_event
+from apps.users.subscription_sync import get_subscription_state
+
+
+class SubscriptionSyncTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        self.parent = self.user.parent_profile
+        self.subscription = Subscription.objects.create(
+            parent_profile=self.parent, stripe_subscription_id='sub_1', stripe_customer_id='cus_1',
+            status='incomplete', founding_member=True,
+        )
+        self.stripe = mock.Mock()
+        self.stripe.Subscription.retrieve.return_value = {'id': 'sub_1', 'status': 'active'}
+        for module in (subscription_sync, stripe_events):
+            patcher = mock.patch.object(module, 'get_stripe', return_value=self.stripe)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+        quiet.__enter__()
+        self.addCleanup(quiet.__exit__, None, None, None)
+
+    def refreshes(self):
+        return StripeWebhookEvent.objects.filter(event_type=SUBSCRIPTION_REFRESH)
+
+    def test_page_queues_refresh_without_calling_stripe(self):
+        get_subscription_state(self.parent)
+        get_subscription_state(self.parent)
+        self.stripe.Subscription.retrieve.assert_not_called()
+        self.assertEqual(self.refreshes().count(), 1)  # one per cooldown window
+
+        self.assertEqual(process_batch()['processed'], 1)
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.status, 'active')
+
+    def test_active_subscription_is_left_alone(self):
+        Subscription.objects.filter(pk=self.subscription.pk).update(status='active')
+        get_subscription_state(self.parent)
+        self.assertFalse(self.refreshes().exists())
+
+    def test_failing_refresh_retries_without_blocking_webhooks(self):
+        self.stripe.Subscription.retrieve.side_effect = ConnectionError('timeout')
+        get_subscription_state(self.parent)
+        self.assertEqual(process_batch()['retrying'], 1)
+
+        webhook = {
+            'id': 'evt_1', 'object': 'event', 'type': 'customer.subscription.updated', 'created': 2_000_000_000,
+            'data': {'object': {'object': 'subscription', 'id': 'sub_1', 'status': 'past_due'}},
+        }
+        self.assertTrue(receive_event(webhook))
+        self.subscription.refresh_from_db()
+        self.assertEqual(self.subscription.status, 'past_due')
+
+    def test_checkout_tags_the_new_customer(self):
+        Subscription.objects.filter(pk=self.subscription.pk).update(stripe_customer_id='', stripe_subscription_id='')
+        checkout = {
+            'id': 'evt_checkout', 'object': 'event', 'type': 'checkout.session.completed', 'created': 100,
+            'data': {'object': {'object': 'checkout.session', 'customer': 'cus_new', 'subscription': 'sub_new',
+                                'client_reference_id': str(self.subscription.pk)}},
+        }
+        self.assertTrue(receive_event(checkout))
+        self.stripe.Customer.modify.assert_called_once_with(
+            'cus_new', metadata={'user_id': self.user.id, 'founding_member': True},
+        )
@@ -0,0 +1,57 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.users.models import ChildDailyActivity, ChildProfile, ChildProgressSummary, Project, ProjectProgress
+from zonuko.cache import get_cache
+
+
+class SyntheticDataResetTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def generate(self, **options):
+        call_command('generate_synthetic_data', projects=30, skills=5, children=12, stdout=io.StringIO(), **options)
+
+    def test_reset_removes_synthetic_rows_and_keeps_real_counters(self):
+        self.generate()
+        user = User.objects.create_user('parent@example.com', 'parent@example.com', 'password')
+        child = ChildProfile.objects.create(parent=user.parent_profile, username='Kid', pin='1234', age_range='IMAGINAUTS')
+        # Run the on-commit catalog version bump, so completions are credited
+        # from this project's skill dimensions
+        with self.captureOnCommitCallbacks(execute=True):
+            real_project = Project.objects.create(
+                title='Bridge', description='A project', category='science', type='spark',
+                age_ranges=['IMAGINAUTS'], skill_dimensions={'resilience': 2},
+            )
+        synthetic_project = Project.objects.filter(title__startswith='Synthetic ').first()
+        for project in (real_project, synthetic_project):
+            ProjectProgress.objects.create(
+                child=child, project=project, status=ProjectProgress.STATUS_COMPLETED, completed_at=timezone.now(),
+            )
+
+        self.generate(reset=True)
+
+        self.assertEqual(ChildProfile.objects.exclude(pk=child.pk).count(), 12)
+        self.assertEqual(Project.objects.filter(title__startswith='Synthetic ').count(), 30)
+        self.assertFalse(ProjectProgress.objects.filter(child=child, project__title__startswith='Synthetic ').exists())
+
+        summary = ChildProgressSummary.objects.get(child=child)
+        self.assertEqual(summary.completed_count, 1)
+        self.assertEqual(summary.skill_totals['resilience'], 2)
+        self.assertEqual(list(ChildDailyActivity.objects.filter(child=child).values_list('completions', flat=True)), [1])
+
+        # The counter handlers are connected again
+        ProjectProgress.objects.get(child=child).delete()
+        self.assertEqual(ChildProgressSummary.objects.get(child=child).completed_count, 0)
+
+        # The generated rollups match a rebuild
+        child_ids = list(ChildProfile.objects.values_list('id', flat=True))
+        generated = list(ChildProgressSummary.objects.order_by('child_id').values_list('completed_count', 'skill_totals'))
+        ChildProgressSummary.rebuild_for(child_ids)
+        self.assertEqual(
+            generated, list(ChildProgressSummary.objects.order_by('child_id').values_list('completed_count', 'skill_totals')),
+        )
@@ -7,6 +7,8 @@ app_name = "users"
 urlpatterns = [
     path("", views.placeholder, name="placeholder"),
     path("dashboard/", views.dashboard, name="dashboard"),
+    path("api/family-activity/", views.family_activity_api, name="family_activity_api"),
+    path("api/attention-items/", views.attention_items_api, name="attention_items_api"),
     path("subscription/start/", views.create_checkout_session, name="start_subscription"),
     path("subscription/success/", views.subscription_success, name="subscription_success"),
     path("webhook/stripe/", views.stripe_webhook, name="stripe_webhook"),
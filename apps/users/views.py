@@ -6,19 +6,38 @@ from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
+from .badges import earned_badge_details
+from .child_context import get_child_context
 from .models import ChildProfile, Subscription, Project, ProjectProgress, ChildHelpRequest
 from .forms import ChildProfileForm, ChildLoginForm, ChildHelpRequestForm
-from django.db.models import Q, Count
-from datetime import timedelta
+from .parent_dashboard import (
+    ATTENTION_PAGE_MAX, ATTENTION_PAGE_SIZE, TREND_WINDOWS,
+    activity_trend, attention_actions, attention_page, build_parent_dashboard,
+)
+from .recommendations import get_recommendations
+from .stripe_events import receive_event
+from .stripe_offline import get_stripe, recorder
+from .subscription_sync import configure_stripe_client, get_subscription_state
+from django.db import transaction
+from django.db.models import Q
 from functools import wraps
+from zonuko.throttle import get_client_ip
 import stripe
 import json
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
+configure_stripe_client()
 
 
-def child_session_required(view_func=None, *, api=False):
-    """Require a valid child session for kid-facing routes and APIs."""
+def child_session_required(view_func=None, *, api=False, cached=False, with_stage=False):
+    """
+    Require a valid child session for kid-facing routes and APIs.
+
+    cached=True sets request.child to a cached ChildContext instead of a
+    ChildProfile (no query on a cache hit), for views that only need the
+    child's identity and stage. with_stage=True loads progression_stage in
+    the same query as the profile.
+    """
     def decorator(func):
         @wraps(func)
         def _wrapped(request, *args, **kwargs):
@@ -29,7 +48,12 @@ def child_session_required(view_func=None, *, api=False):
                 return redirect('users:child_login')
 
             try:
-                child = ChildProfile.objects.get(id=child_id)
+                if cached:
+                    child = get_child_context(child_id)
+                elif with_stage:
+                    child = ChildProfile.objects.select_related('progression_stage').get(id=child_id)
+                else:
+                    child = ChildProfile.objects.get(id=child_id)
             except ChildProfile.DoesNotExist:
                 request.session.flush()
                 if api:
@@ -52,165 +76,83 @@ def dashboard(request):
     """Member dashboard"""
     user = request.user
     parent_profile = getattr(user, 'parent_profile', None)
-    children = parent_profile.children.all() if parent_profile else []
-
-    child_summaries = []
-    recent_reflections = []
-    attention_items = []
-    weekly_wins = {
-        'total_completed': 0,
-        'total_reflections': 0,
-        'top_skill_label': None,
-        'top_skill_points': 0,
-        'spotlight_child': None,
-        'spotlight_count': 0,
-    }
-
-    skill_labels = {
-        'creative_thinking': 'Creative Thinking',
-        'practical_making': 'Practical Making',
-        'problem_solving': 'Problem Solving',
-        'resilience': 'Resilience',
-    }
-
-    if children:
-        child_ids = [child.id for child in children]
-        progress_qs = ProjectProgress.objects.filter(child_id__in=child_ids).select_related('child', 'project')
-        progress_list = list(progress_qs)
-        week_ago = timezone.now() - timedelta(days=7)
-
-        weekly_completed = [
-            p for p in progress_list
-            if p.completed_at and p.completed_at >= week_ago and p.status == ProjectProgress.STATUS_COMPLETED
-        ]
-        weekly_reflections = [
-            p for p in progress_list
-            if p.reflection_at and p.reflection_at >= week_ago and p.reflection_text and p.reflection_text.strip()
-        ]
-
-        weekly_skill_totals = {key: 0 for key in skill_labels.keys()}
-        for progress in weekly_completed:
-            dimensions = progress.project.skill_dimensions or {}
-            for key in weekly_skill_totals.keys():
-                weekly_skill_totals[key] += int(dimensions.get(key, 0) or 0)
-
-        top_skill_key = None
-        top_skill_points = 0
-        if weekly_skill_totals:
-            top_skill_key, top_skill_points = max(weekly_skill_totals.items(), key=lambda x: x[1])
-            if top_skill_points == 0:
-                top_skill_key = None
-
-        weekly_child_counts = {}
-        for progress in weekly_completed:
-            weekly_child_counts[progress.child_id] = weekly_child_counts.get(progress.child_id, 0) + 1
-
-        spotlight_child = None
-        spotlight_count = 0
-        if weekly_child_counts:
-            spotlight_child_id, spotlight_count = max(weekly_child_counts.items(), key=lambda x: x[1])
-            spotlight_child = next((child for child in children if child.id == spotlight_child_id), None)
-
-        weekly_wins = {
-            'total_completed': len(weekly_completed),
-            'total_reflections': len(weekly_reflections),
-            'top_skill_label': skill_labels.get(top_skill_key) if top_skill_key else None,
-            'top_skill_points': top_skill_points,
-            'spotlight_child': spotlight_child,
-            'spotlight_count': spotlight_count,
-        }
+    children = list(parent_profile.children.all()) if parent_profile else []
 
-        progress_by_child = {}
-        for progress in progress_list:
-            progress_by_child.setdefault(progress.child_id, []).append(progress)
-
-        for child in children:
-            child_progress = progress_by_child.get(child.id, [])
-            completed_progress = [p for p in child_progress if p.status == ProjectProgress.STATUS_COMPLETED]
-            total_projects = len(child_progress)
-            completed_count = len(completed_progress)
-            in_progress_count = sum(1 for p in child_progress if p.status == ProjectProgress.STATUS_IN_PROGRESS)
-            needs_reflection_count = sum(
-                1 for p in child_progress
-                if p.status == ProjectProgress.STATUS_COMPLETED and not (p.reflection_text and p.reflection_text.strip())
-            )
-            needs_rating_count = sum(1 for p in child_progress if p.status == ProjectProgress.STATUS_COMPLETED and not p.rating)
-            completion_percent = int((completed_count / total_projects) * 100) if total_projects else 0
-
-            # Aggregate learned skills from completed projects
-            skill_totals = {key: 0 for key in skill_labels.keys()}
-            for progress in completed_progress:
-                dimensions = progress.project.skill_dimensions or {}
-                for key in skill_totals.keys():
-                    skill_totals[key] += int(dimensions.get(key, 0) or 0)
-
-            top_skills = [
-                {'key': key, 'label': skill_labels[key], 'score': score}
-                for key, score in sorted(skill_totals.items(), key=lambda x: x[1], reverse=True)
-                if score > 0
-            ][:3]
-
-            if completed_count >= 10:
-                praise_message = f"{child.username} is showing real maker confidence and consistency."
-            elif completed_count >= 5:
-                praise_message = f"{child.username} is building strong momentum and healthy learning habits."
-            elif completed_count >= 1:
-                praise_message = f"Great start — {child.username} is building curiosity through hands-on learning."
-            else:
-                praise_message = f"{child.username} is ready to begin their first project journey."
-
-            pathway_snapshot = [
-                ('Creative', min(max(getattr(child, 'creative_thinking', 0), 0), 100)),
-                ('Making', min(max(getattr(child, 'practical_making', 0), 0), 100)),
-                ('Problem Solving', min(max(getattr(child, 'problem_solving', 0), 0), 100)),
-                ('Resilience', min(max(getattr(child, 'resilience', 0), 0), 100)),
-            ]
-
-            child_summaries.append({
-                'child': child,
-                'total_projects': total_projects,
-                'completed_count': completed_count,
-                'in_progress_count': in_progress_count,
-                'needs_reflection_count': needs_reflection_count,
-                'needs_rating_count': needs_rating_count,
-                'completion_percent': completion_percent,
-                'top_skills': top_skills,
-                'praise_message': praise_message,
-                'pathway_snapshot': pathway_snapshot,
-            })
-
-            for progress in completed_progress:
-                if not (progress.reflection_text and progress.reflection_text.strip()):
-                    attention_items.append({
-                        'child_name': child.username,
-                        'project_title': progress.project.title,
-                        'action': 'Reflection needed',
-                    })
-                if not progress.rating:
-                    attention_items.append({
-                        'child_name': child.username,
-                        'project_title': progress.project.title,
-                        'action': 'Rating needed',
-                    })
-
-        recent_reflections = list(
-            progress_qs.exclude(reflection_text__isnull=True)
-            .exclude(reflection_text='')
-            .order_by('-reflection_at', '-completed_at')[:8]
-        )
+    # Grouped aggregates and summary counters; bounded by children, not history
+    family = build_parent_dashboard(children)
     
     context = {
         "parent_profile": parent_profile,
         "children": children,
-        "child_summaries": child_summaries,
-        "recent_reflections": recent_reflections,
-        "attention_items": attention_items[:8],
-        "weekly_wins": weekly_wins,
+        "child_summaries": family['child_summaries'],
+        "recent_reflections": family['recent_reflections'],
+        "attention_items": family['attention_items'],
+        "weekly_wins": family['weekly_wins'],
         "has_subscription": parent_profile.has_active_subscription if parent_profile else False,
     }
     return render(request, "users/dashboard.html", context)
 
 
+@login_required
+def family_activity_api(request):
+    """Family activity trend (?days=7|30|90, optional ?child=<id>) from the daily rollups"""
+    try:
+        days = int(request.GET.get('days', 7))
+    except ValueError:
+        days = None
+    if days not in TREND_WINDOWS:
+        return JsonResponse({'error': f'days must be one of {", ".join(map(str, TREND_WINDOWS))}'}, status=400)
+
+    child_id = request.GET.get('child')
+    if child_id:
+        # The ownership check stands in for the parent profile lookup
+        owned = ChildProfile.objects.filter(id=child_id, parent__user=request.user) if child_id.isdigit() else None
+        if owned is None or not owned.exists():
+            return JsonResponse({'error': 'Child not found'}, status=404)
+        return JsonResponse(activity_trend([int(child_id)], days))
+
+    parent_profile = getattr(request.user, 'parent_profile', None)
+    if parent_profile is None:
+        return JsonResponse({'error': 'No parent profile'}, status=403)
+
+    return JsonResponse(activity_trend(parent_profile.children.all(), days))
+
+
+@login_required
+def attention_items_api(request):
+    """Needs-attention feed for the parent's children, paged with ?cursor= (and optional ?limit=)"""
+    parent_profile = getattr(request.user, 'parent_profile', None)
+    if parent_profile is None:
+        return JsonResponse({'error': 'No parent profile'}, status=403)
+
+    try:
+        limit = min(max(int(request.GET.get('limit', ATTENTION_PAGE_SIZE)), 1), ATTENTION_PAGE_MAX)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+
+    child_ids = list(parent_profile.children.values_list('id', flat=True))
+    try:
+        rows, next_cursor = attention_page(child_ids, limit, request.GET.get('cursor'))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+
+    return JsonResponse({
+        'items': [
+            {
+                'progress_id': progress.id,
+                'child_id': progress.child_id,
+                'child_name': progress.child.username,
+                'project_id': progress.project_id,
+                'project_title': progress.project.title,
+                'completed_at': progress.completed_at.isoformat() if progress.completed_at else None,
+                'actions': attention_actions(progress),
+            }
+            for progress in rows
+        ],
+        'next_cursor': next_cursor,
+    })
+
+
 def placeholder(request):
     return redirect('/members/dashboard/')
 
@@ -245,39 +187,29 @@ def create_checkout_session(request):
             price = 1499  # £14.99 for regular members
             description = 'Monthly access to STEAM learning projects'
         
-        # Create or get Stripe customer
+        # Stripe creates the customer during checkout; the webhook links it
+        # back to this row through client_reference_id
         subscription = getattr(parent_profile, 'subscription', None)
-        
-        if not subscription or not subscription.stripe_customer_id:
-            customer = stripe.Customer.create(
-                email=user.email,
-                name=parent_profile.display_name or user.email,
-                metadata={'user_id': user.id, 'founding_member': is_founding}
+        if not subscription:
+            subscription = Subscription.objects.create(
+                parent_profile=parent_profile,
+                founding_member=is_founding
             )
-            customer_id = customer.id
-            
-            # Create subscription record if doesn't exist
-            if not subscription:
-                subscription = Subscription.objects.create(
-                    parent_profile=parent_profile,
-                    stripe_customer_id=customer_id,
-                    founding_member=is_founding
-                )
-            else:
-                subscription.stripe_customer_id = customer_id
-                subscription.founding_member = is_founding
-                subscription.save()
-        else:
-            customer_id = subscription.stripe_customer_id
-            # Update founding member status
+        elif subscription.founding_member != is_founding:
             subscription.founding_member = is_founding
-            subscription.save()
+            subscription.save(update_fields=['founding_member', 'updated_at'])
+        
+        if subscription.stripe_customer_id:
+            customer_params = {'customer': subscription.stripe_customer_id}
+        else:
+            customer_params = {'customer_email': user.email}
         
         print(f"Creating checkout for {user.email} - Founding: {is_founding}, Price: £{price/100:.2f}")
         
         # Create checkout session with 7-day trial
-        checkout_session = stripe.checkout.Session.create(
-            customer=customer_id,
+        checkout_session = get_stripe().checkout.Session.create(
+            **customer_params,
+            client_reference_id=str(subscription.pk),
             payment_method_types=['card'],
             line_items=[{
                 'price_data': {
@@ -315,70 +247,24 @@ def create_checkout_session(request):
 @login_required
 def subscription_success(request):
     """Success page after subscription"""
-    # In development, manually activate the trial since webhooks don't work on localhost
-    user = request.user
-    try:
-        parent_profile = getattr(user, 'parent_profile', None)
-        if not parent_profile:
-            return render(request, 'users/subscription_success.html')
-        
-        subscription = getattr(parent_profile, 'subscription', None)
-        
-        if subscription and subscription.stripe_subscription_id:
-            # Fetch the latest subscription data from Stripe
-            stripe_sub = stripe.Subscription.retrieve(subscription.stripe_subscription_id)
-            
-            # Update our database with the subscription details
-            subscription.status = stripe_sub.status
-            
-            # Use .get() to safely access optional fields
-            trial_end = stripe_sub.get('trial_end')
-            if trial_end:
-                from datetime import datetime
-                subscription.trial_end = datetime.fromtimestamp(trial_end)
-            
-            period_end = stripe_sub.get('current_period_end')
-            if period_end:
-                from datetime import datetime
-                subscription.current_period_end = datetime.fromtimestamp(period_end)
-            
-            subscription.save()
-        elif subscription:
-            # If we don't have the subscription ID yet, try to fetch it from Stripe
-            customer = stripe.Customer.retrieve(subscription.stripe_customer_id, expand=['subscriptions'])
-            
-            if customer.subscriptions.data:
-                stripe_sub = customer.subscriptions.data[0]
-                subscription.stripe_subscription_id = stripe_sub.id
-                subscription.status = stripe_sub.status
-                
-                # Use .get() to safely access optional fields
-                trial_end = stripe_sub.get('trial_end')
-                if trial_end:
-                    from datetime import datetime
-                    subscription.trial_end = datetime.fromtimestamp(trial_end)
-                
-                period_end = stripe_sub.get('current_period_end')
-                if period_end:
-                    from datetime import datetime  
-                    subscription.current_period_end = datetime.fromtimestamp(period_end)
-                
-                subscription.save()
-    except Exception as e:
-        # Log error but don't break the page
-        print(f"Error updating subscription: {e}")
+    # Subscription state arrives through webhooks; if they haven't caught up
+    # yet a refresh from Stripe is queued for the worker, not run here
+    parent_profile = getattr(request.user, 'parent_profile', None)
+    if parent_profile:
+        get_subscription_state(parent_profile)
     
     return render(request, 'users/subscription_success.html')
 
 
 @csrf_exempt
 def stripe_webhook(request):
-    """Handle Stripe webhook events"""
+    """Verify a Stripe webhook event, store it in the inbox and apply it"""
     payload = request.body
     sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
     
     try:
-        event = stripe.Webhook.construct_event(
+        # Verifies the signature; raises on a forged or malformed payload
+        stripe.Webhook.construct_event(
             payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError:
@@ -386,67 +272,15 @@ def stripe_webhook(request):
     except stripe.error.SignatureVerificationError:
         return HttpResponse(status=400)
     
-    # Handle the event
-    if event['type'] == 'checkout.session.completed':
-        session = event['data']['object']
-        handle_checkout_session(session)
-    elif event['type'] == 'customer.subscription.updated':
-        subscription = event['data']['object']
-        handle_subscription_updated(subscription)
-    elif event['type'] == 'customer.subscription.deleted':
-        subscription = event['data']['object']
-        handle_subscription_deleted(subscription)
+    # Keep a copy for replay_stripe_events when STRIPE_WEBHOOK_RECORD_PATH is set
+    recorder.record(payload)
     
-    return HttpResponse(status=200)
-
-
-def handle_checkout_session(session):
-    """Handle successful checkout"""
-    customer_id = session.get('customer')
-    subscription_id = session.get('subscription')
+    # Store the event and apply it now if it is next in line for its
+    # subscription; the process_stripe_events worker retries anything left
+    # over. Redeliveries of an event already stored are ignored
+    receive_event(json.loads(payload))
     
-    try:
-        subscription = Subscription.objects.get(stripe_customer_id=customer_id)
-        subscription.stripe_subscription_id = subscription_id
-        subscription.start_trial()
-        print(f"Trial started for subscription {subscription.id}")
-    except Subscription.DoesNotExist:
-        print(f"Subscription not found for customer {customer_id}")
-
-
-def handle_subscription_updated(stripe_subscription):
-    """Handle subscription updates"""
-    subscription_id = stripe_subscription['id']
-    
-    try:
-        subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
-        subscription.status = stripe_subscription['status']
-        
-        if stripe_subscription.get('trial_end'):
-            from datetime import datetime
-            subscription.trial_end = datetime.fromtimestamp(stripe_subscription['trial_end'])
-        
-        if stripe_subscription.get('current_period_end'):
-            from datetime import datetime
-            subscription.current_period_end = datetime.fromtimestamp(stripe_subscription['current_period_end'])
-        
-        subscription.save()
-        print(f"Subscription {subscription.id} updated to {subscription.status}")
-    except Subscription.DoesNotExist:
-        print(f"Subscription not found: {subscription_id}")
-
-
-def handle_subscription_deleted(stripe_subscription):
-    """Handle subscription cancellation"""
-    subscription_id = stripe_subscription['id']
-    
-    try:
-        subscription = Subscription.objects.get(stripe_subscription_id=subscription_id)
-        subscription.status = 'canceled'
-        subscription.save()
-        print(f"Subscription {subscription.id} canceled")
-    except Subscription.DoesNotExist:
-        print(f"Subscription not found: {subscription_id}")
+    return HttpResponse(status=200)
 
 
 @login_required
@@ -534,20 +368,24 @@ def child_login(request):
         return redirect('users:child_dashboard')
     
     if request.method == 'POST':
-        form = ChildLoginForm(request.POST)
+        form = ChildLoginForm(request.POST, client_ip=get_client_ip(request))
         if form.is_valid():
             child = form.cleaned_data['child']
             # Store child ID in session
             request.session['child_id'] = child.id
             request.session['child_username'] = child.username
             return redirect('users:child_dashboard')
+        if form.throttle:
+            response = render(request, 'users/child_login.html', {'form': form}, status=429)
+            response['Retry-After'] = str(form.throttle.retry_after)
+            return response
     else:
         form = ChildLoginForm()
     
     return render(request, 'users/child_login.html', {'form': form})
 
 
-@child_session_required
+@child_session_required(with_stage=True)
 def child_dashboard(request):
     """
     Child dashboard - their world based on age_range.
@@ -573,27 +411,17 @@ def child_dashboard(request):
             current_stage=ProgressionStage.EXPLORER
         )
 
+    # Build every dashboard section from one progress query against the catalog snapshot
+    from apps.users.query_engine import ProjectQueryEngine
+    engine = ProjectQueryEngine(child)
+    bundle = engine.get_dashboard_bundle(new_limit=2, teaser_limit=2, coming_soon_limit=1)
+    completed_count = bundle['completed_count']
+    reflection_count = bundle['reflection_count']
+
     # Keep numeric progression stage in sync with actual completed/reflected work
     # so next-stage projects unlock correctly.
-    completed_count = child.project_progress.filter(
-        Q(completed_at__isnull=False) | Q(status=ProjectProgress.STATUS_COMPLETED)
-    ).values('project_id').distinct().count()
-    reflection_count = child.project_progress.filter(
-        has_reflection=True,
-        reflection_text__isnull=False
-    ).exclude(reflection_text='').count()
-
     from apps.users.models import ProgressionStage
-    if completed_count >= 25 and reflection_count >= 10:
-        calculated_stage_number = ProgressionStage.INDEPENDENT_MAKER
-    elif completed_count >= 15 and reflection_count >= 3:
-        calculated_stage_number = ProgressionStage.DESIGNER
-    elif completed_count >= 8:
-        calculated_stage_number = ProgressionStage.BUILDER
-    elif completed_count >= 3:
-        calculated_stage_number = ProgressionStage.EXPERIMENTER
-    else:
-        calculated_stage_number = ProgressionStage.EXPLORER
+    calculated_stage_number = bundle['calculated_stage']
 
     if stage.current_stage != calculated_stage_number:
         stage.current_stage = calculated_stage_number
@@ -627,19 +455,12 @@ def child_dashboard(request):
     remaining_reflections_for_next_stage = max(0, (target['reflections'] - reflection_count)) if target else 0
     next_stage_name = target['name'] if target else 'Mastery'
     
-    # Use query engine to get projects for this child
-    from apps.users.query_engine import ProjectQueryEngine
-    engine = ProjectQueryEngine(child)
-    dashboard_lists = engine.get_dashboard_lists(new_limit=2)
-    in_progress_projects = dashboard_lists['in_progress_projects']
-    new_projects = dashboard_lists['new_projects']
+    in_progress_projects = bundle['in_progress_projects']
+    new_projects = bundle['new_projects']
     
-    # Completed projects should come from all child's progress, not just available ones
+    # Completed projects come from all child's progress, not just available ones
     # (child may have completed a project that's now above their stage due to stage changes)
-    # Include both: projects with completed_at timestamp OR status='completed'
-    completed_projects = child.project_progress.filter(
-        Q(completed_at__isnull=False) | Q(status=ProjectProgress.STATUS_COMPLETED)
-    ).select_related('project').order_by('-completed_at', '-reflection_at', '-started_at')
+    completed_projects = bundle['completed_projects']
     
     # Base context for all age groups
     context = {
@@ -648,8 +469,8 @@ def child_dashboard(request):
         'current_stage_number': current_stage_number,
         'in_progress_projects': in_progress_projects,
         'new_projects': new_projects,
-        'locked_teaser': engine.get_teasers(limit=2),
-        'coming_soon': engine.get_coming_soon(limit=1),
+        'locked_teaser': bundle['teasers'],
+        'coming_soon': bundle['coming_soon'],
         'completed_projects': completed_projects,
         'completed_count': completed_count,
         'reflection_count': reflection_count,
@@ -810,33 +631,8 @@ def reset_child_quiz(request, child_id):
 
 def get_recommended_projects(child, limit=6):
     """Get personalized project recommendations based on child's profile"""
-    # Get all live projects
-    all_projects = Project.objects.filter(visibility=Project.VISIBILITY_LIVE)
-    
-    # Filter by age range in Python (SQLite doesn't support JSONField contains)
-    projects = [p for p in all_projects if child.age_range in p.age_ranges]
-    
-    # If quiz completed, prioritize by interests and learning style
-    if child.quiz_completed and child.interests:
-        # Score projects by matching interests
-        interest_matches = []
-        for project in projects:
-            score = 0
-            # Match category to interests
-            if project.category in child.interests:
-                score += 3
-            # Match tags to interests
-            for interest in child.interests:
-                if interest in project.tags:
-                    score += 1
-            interest_matches.append((project, score))
-        
-        # Sort by score (highest first)
-        interest_matches.sort(key=lambda x: x[1], reverse=True)
-        recommended = [p[0] for p in interest_matches[:limit]]
-    else:
-        # No quiz data - return first available projects
-        recommended = projects[:limit]
+    # Precomputed list when current, else sparse scoring against the catalog (see recommendations.py)
+    recommended = get_recommendations(child, limit)
     
     # Get child's progress for these projects
     progress_dict = {}
@@ -1100,44 +896,38 @@ def growth_map(request):
     current_stage_info = stage_descriptions.get(child.current_stage, stage_descriptions['EXPLORER'])
     
     # Get earned badges
-    badge_info = {
-        'deep_thinker': {'name': '🌟 Deep Thinker', 'desc': "You're thinking about your learning!"},
-        'thoughtful_builder': {'name': '💭 Thoughtful Builder', 'desc': 'Your reflections show real growth'},
-        'reflection_master': {'name': '🧠 Reflection Master', 'desc': 'You understand how you learn best'},
-        'resilience_builder': {'name': '💪 Resilience Builder', 'desc': "You learn from what doesn't work"},
-        'growth_mindset': {'name': '🎯 Growth Mindset', 'desc': 'You know learning comes from practice'},
-    }
-    
-    earned_badges = [badge_info[code] for code in child.badges_earned if code in badge_info]
+    earned_badges = earned_badge_details(child.badges_earned)
+    summary = child.get_progress_summary()
     
     context = {
         'child': child,
         'pathways': pathways,
         'stage_info': current_stage_info,
         'earned_badges': earned_badges,
-        'projects_completed': child.get_projects_completed_count(),
+        'projects_completed': summary.completed_count,
         'total_reflections': child.total_reflections,
     }
     
     return render(request, 'users/growth_map.html', context)
 
 
-@child_session_required(api=True)
+@child_session_required(api=True, cached=True)
 def growth_summary_api(request):
     """API endpoint to get child's growth summary for dashboard"""
     child = request.child
     
     from .models import ProgressionStage, GrowthPathway
     
-    try:
-        progression_stage = ProgressionStage.objects.get(child=child)
-    except ProgressionStage.DoesNotExist:
-        progression_stage = ProgressionStage.objects.create(
-            child=child,
-            current_stage=ProgressionStage.EXPLORER
+    if child.progression_stage is None:
+        progression_stage, _ = ProgressionStage.objects.get_or_create(
+            child_id=child.id,
+            defaults={'current_stage': ProgressionStage.EXPLORER}
         )
+    else:
+        # The cached context carries the stage number, so the row isn't loaded
+        progression_stage = ProgressionStage(child_id=child.id, current_stage=child.progression_stage)
     
-    pathways = GrowthPathway.objects.filter(child=child)
+    pathways = GrowthPathway.objects.filter(child_id=child.id)
     
     growth_summary = {
         'stage': {
@@ -1178,18 +968,20 @@ def update_reflection(request, progress_id):
     if len(reflection_text) < 20:
         return JsonResponse({'error': 'Please share more detail (at least 20 characters)'}, status=400)
     
-    # Save reflection
-    progress.reflection_text = reflection_text
-    progress.has_reflection = True
-    progress.reflection_at = timezone.now()
-    progress.save()
-    
-    # Now apply the growth boosts since we have a thoughtful reflection
-    project = progress.project
-    growth_result = child.apply_project_completion_boost(
-        project=project,
-        has_thoughtful_reflection=True  # We just saved meaningful reflection
-    )
+    # The reflection, the counters its signal handlers maintain and the
+    # growth boost commit or roll back together
+    with transaction.atomic():
+        progress.reflection_text = reflection_text
+        progress.has_reflection = True
+        progress.reflection_at = timezone.now()
+        progress.save()
+        
+        # Now apply the growth boosts since we have a thoughtful reflection
+        project = progress.project
+        growth_result = child.apply_project_completion_boost(
+            project=project,
+            has_thoughtful_reflection=True  # We just saved meaningful reflection
+        )
     
     response = {
         'success': True,
@@ -1203,7 +995,7 @@ def update_reflection(request, progress_id):
     return JsonResponse(response)
 
 
-@child_session_required(api=True)
+@child_session_required(api=True, cached=True)
 def clear_stage_modal(request):
     """Clear stage advancement modal from session"""
     if 'stage_advancement' in request.session:
@@ -1213,7 +1005,7 @@ def clear_stage_modal(request):
     return JsonResponse({'success': True})
 
 
-@child_session_required
+@child_session_required(with_stage=True)
 def progression_detail(request):
     """Show detailed progression information"""
     child = request.child
@@ -1221,7 +1013,7 @@ def progression_detail(request):
     from .models import ProgressionStage
     
     try:
-        progression_stage = ProgressionStage.objects.get(child=child)
+        progression_stage = child.progression_stage
     except ProgressionStage.DoesNotExist:
         progression_stage = ProgressionStage.objects.create(
             child=child,
@@ -0,0 +1,142 @@
+"""
+Shared caching helpers for Zonuko.
+
+Builds on Django's cache framework (configured through CACHE_BACKEND in
+settings) and adds the pieces the apps need on top of it:
+
+- current_version / bump_version: shared integer counters for versioned keys
+- make_key / invalidate_namespace: namespaced keys that can be dropped wholesale
+- get_or_compute / expire: stampede-safe read-through caching
+
+All helpers take an optional `alias` to target a cache other than "default".
+"""
+import time
+
+from django.core.cache import caches
+
+
+LOCK_SUFFIX = ":lock"
+
+_MISSING = object()
+
+
+def get_cache(alias="default"):
+    return caches[alias]
+
+
+def current_version(key, alias="default"):
+    """
+    Read a shared version counter, seeding it on first use.
+
+    Seeds from the clock so a flushed or restarted cache never hands out a
+    version number a worker has already seen.
+    """
+    cache = get_cache(alias)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key, alias="default"):
+    """Advance a shared version counter, invalidating every key built from it"""
+    cache = get_cache(alias)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def _namespace_version_key(namespace):
+    return f"ns:{namespace}"
+
+
+def make_key(namespace, *parts, alias="default"):
+    """
+    Build a namespaced, versioned cache key: "<namespace>:v<generation>:<parts...>".
+
+    The generation moves when invalidate_namespace() is called, so every key
+    in the namespace is orphaned at once without scanning the cache.
+    """
+    generation = current_version(_namespace_version_key(namespace), alias=alias)
+    return ":".join([namespace, f"v{generation}", *(str(part) for part in parts)])
+
+
+def invalidate_namespace(namespace, alias="default"):
+    """Drop every key built with make_key(namespace, ...)"""
+    return bump_version(_namespace_version_key(namespace), alias=alias)
+
+
+def get_or_compute(key, compute, timeout=300, *, stale_ttl=None, lock_timeout=10, wait=2.0, poll_interval=0.05, alias="default"):
+    """
+    Stampede-safe read-through cache.
+
+    Values are stored with a soft expiry (`timeout`) and kept for an extra
+    `stale_ttl` seconds (defaults to `timeout`). Once the soft expiry passes,
+    exactly one caller (whoever wins an atomic cache.add lock) recomputes
+    while everyone else keeps serving the stale value. On a cold miss,
+    callers that lose the lock wait up to `wait` seconds for the winner's
+    result before computing it themselves, so a slow or crashed lock holder
+    can never block a request for long.
+
+    Args:
+        key: Full cache key (see make_key)
+        compute: Zero-argument callable producing the value
+        timeout: Seconds the value is considered fresh
+        stale_ttl: Extra seconds a stale value may be served during refresh
+        lock_timeout: Seconds before an abandoned recompute lock expires
+        wait: Seconds a cold-miss caller waits for another worker's result
+        poll_interval: Seconds between polls while waiting
+        alias: Cache alias
+    """
+    cache = get_cache(alias)
+    stale_ttl = timeout if stale_ttl is None else stale_ttl
+
+    envelope = cache.get(key, _MISSING)
+    if envelope is not _MISSING:
+        value, fresh_until = envelope
+        if time.time() < fresh_until:
+            return value
+        # Stale: one caller refreshes, the rest keep serving the old value
+        if cache.add(key + LOCK_SUFFIX, 1, lock_timeout):
+            return _compute_and_store(cache, key, compute, timeout, stale_ttl)
+        return value
+
+    if cache.add(key + LOCK_SUFFIX, 1, lock_timeout):
+        return _compute_and_store(cache, key, compute, timeout, stale_ttl)
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        envelope = cache.get(key, _MISSING)
+        if envelope is not _MISSING:
+            return envelope[0]
+
+    return compute()
+
+
+def expire(key, stale_ttl=60, alias="default"):
+    """
+    Mark a get_or_compute value stale without deleting it.
+
+    The next read refreshes it (single-flight) while concurrent readers keep
+    getting the old value, so invalidating a hot key never causes a cold miss.
+    """
+    cache = get_cache(alias)
+    envelope = cache.get(key, _MISSING)
+    if envelope is _MISSING:
+        return False
+    cache.set(key, (envelope[0], 0), stale_ttl)
+    return True
+
+
+def _compute_and_store(cache, key, compute, timeout, stale_ttl):
+    try:
+        value = compute()
+        cache.set(key, (value, time.time() + timeout), timeout + stale_ttl)
+        return value
+    finally:
+        cache.delete(key + LOCK_SUFFIX)
@@ -0,0 +1,282 @@
+"""
+Per-request query budget instrumentation.
+
+Opt-in with QUERY_BUDGET_ENABLED=True. QueryBudgetMiddleware then records,
+for every request and URL name:
+
+- the number of SQL queries and total database time
+- duplicate queries (identical SQL and parameters, the usual N+1 signature)
+- template render time (measured by InstrumentedDjangoTemplates)
+
+The figures are sent back in X-Query-* and Server-Timing response headers
+and kept in a rolling in-process report, available to staff as JSON at
+/creator/query-budget/. Requests over their budget are logged as warnings
+(logger zonuko.query_budget).
+
+Budgets live in VIEW_QUERY_BUDGETS and can be overridden with the
+QUERY_BUDGETS setting. Tests can enforce them with assert_query_budget():
+
+    with assert_query_budget('users:child_dashboard'):
+        client.get(reverse('users:child_dashboard'))
+"""
+import contextvars
+import logging
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import JsonResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+
+# Maximum queries per request with warm caches, keyed by URL name. The
+# first request after a catalog change also rebuilds the catalog snapshot
+VIEW_QUERY_BUDGETS = {
+    'core:home': 3,
+    'founding:founding': 4,
+    'users:dashboard': 12,
+    'users:child_dashboard': 8,
+    'users:project_detail': 8,
+    'users:growth_map': 6,
+    'users:progression_detail': 6,
+    'users:growth_summary_api': 6,
+    'users:family_activity_api': 4,
+    'users:attention_items_api': 5,
+}
+
+UNRESOLVED_VIEW = '<unresolved>'
+
+logger = logging.getLogger(__name__)
+
+_current_stats = contextvars.ContextVar('query_budget_stats', default=None)
+
+
+def get_query_budget(view_name):
+    """Query budget for a URL name, or None if it has none"""
+    budgets = {**VIEW_QUERY_BUDGETS, **getattr(settings, 'QUERY_BUDGETS', {})}
+    return budgets.get(view_name)
+
+
+class RequestStats:
+    """Queries and render time collected for one request (or test block)"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.queries = Counter()
+
+    def record_query(self, sql, params, duration):
+        self.query_count += 1
+        self.db_time += duration
+        self.queries[(sql, repr(params))] += 1
+
+    @property
+    def duplicate_count(self):
+        """Queries that repeated an earlier query exactly"""
+        return sum(count - 1 for count in self.queries.values() if count > 1)
+
+    def repeated_queries(self, limit=5):
+        """The most repeated statements as (count, sql) pairs"""
+        return [
+            (count, sql)
+            for (sql, _params), count in self.queries.most_common(limit)
+            if count > 1
+        ]
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper hook that feeds a RequestStats"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.record_query(sql, params, time.perf_counter() - started)
+
+
+@contextmanager
+def capture_request_stats():
+    """Collect queries on every database connection, and template time, for the block"""
+    stats = RequestStats()
+    token = _current_stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_QueryRecorder(stats)))
+            yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class InstrumentedTemplate(Template):
+    """Template wrapper that adds its render time to the active RequestStats"""
+
+    def render(self, context=None, request=None):
+        stats = _current_stats.get()
+        if stats is None:
+            return super().render(context, request)
+
+        # Only the outermost render counts, so templates rendered from inside
+        # other templates aren't added twice
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if stats.template_depth == 0:
+                stats.template_time += time.perf_counter() - started
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The stock Django template backend, returning InstrumentedTemplate objects"""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list"""
+    return sorted_values[max(0, int(round(len(sorted_values) * fraction)) - 1)]
+
+
+class QueryBudgetReport:
+    """Rolling per-view window of request stats, kept in process memory"""
+
+    def __init__(self, window=200):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, stats, budget):
+        sample = (
+            stats.query_count,
+            stats.db_time * 1000,
+            stats.duplicate_count,
+            stats.template_time * 1000,
+            budget is not None and stats.query_count > budget,
+        )
+        with self._lock:
+            samples = self._samples.get(view_name)
+            if samples is None:
+                samples = self._samples[view_name] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def summary(self):
+        """Per-view aggregates over the current window"""
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+
+        report = {}
+        for view_name, samples in sorted(snapshot.items()):
+            query_counts = sorted(sample[0] for sample in samples)
+            db_times = sorted(sample[1] for sample in samples)
+            template_times = [sample[3] for sample in samples]
+            report[view_name] = {
+                'requests': len(samples),
+                'budget': get_query_budget(view_name),
+                'over_budget': sum(1 for sample in samples if sample[4]),
+                'queries_p50': statistics.median(query_counts),
+                'queries_p95': percentile(query_counts, 0.95),
+                'queries_max': query_counts[-1],
+                'db_ms_p50': round(statistics.median(db_times), 2),
+                'db_ms_p95': round(percentile(db_times, 0.95), 2),
+                'duplicates_max': max(sample[2] for sample in samples),
+                'template_ms_avg': round(statistics.fmean(template_times), 2),
+            }
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+report = QueryBudgetReport(window=getattr(settings, 'QUERY_BUDGET_WINDOW', 200))
+
+
+class QueryBudgetMiddleware:
+    """Record query count, DB time, duplicates and template time per request"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_request_stats() as stats:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else UNRESOLVED_VIEW
+        budget = get_query_budget(view_name)
+        report.record(view_name, stats, budget)
+
+        db_ms = stats.db_time * 1000
+        template_ms = stats.template_time * 1000
+        response['X-Query-Count'] = str(stats.query_count)
+        response['X-Query-Time-Ms'] = f'{db_ms:.1f}'
+        response['X-Query-Duplicates'] = str(stats.duplicate_count)
+        response['X-Template-Time-Ms'] = f'{template_ms:.1f}'
+        if budget is not None:
+            response['X-Query-Budget'] = str(budget)
+        response['Server-Timing'] = f'db;dur={db_ms:.1f};desc="{stats.query_count} queries", tpl;dur={template_ms:.1f}'
+
+        if budget is not None and stats.query_count > budget:
+            logger.warning(
+                "Query budget exceeded for %s: %d queries (budget %d, %d duplicates)",
+                view_name, stats.query_count, budget, stats.duplicate_count,
+            )
+
+        return response
+
+
+@staff_member_required
+def query_budget_report(request):
+    """Rolling per-view query report as JSON"""
+    return JsonResponse({
+        'enabled': getattr(settings, 'QUERY_BUDGET_ENABLED', False),
+        'window': report.window,
+        'views': report.summary(),
+    })
+
+
+@contextmanager
+def assert_query_budget(view_name=None, max_queries=None):
+    """
+    Fail if the block runs more queries than allowed.
+
+    Pass a URL name to use its budget from VIEW_QUERY_BUDGETS, or an explicit
+    max_queries. The AssertionError lists the most repeated statements.
+    """
+    budget = max_queries if max_queries is not None else get_query_budget(view_name)
+    if budget is None:
+        raise ValueError(f"No query budget defined for {view_name!r}")
+
+    with capture_request_stats() as stats:
+        yield stats
+
+    if stats.query_count > budget:
+        repeated = '\n'.join(f'  {count}x {sql}' for count, sql in stats.repeated_queries())
+        raise AssertionError(
+            f"{view_name or 'block'} ran {stats.query_count} queries (budget {budget}, "
+            f"{stats.duplicate_count} duplicates)" + (f"\nRepeated:\n{repeated}" if repeated else '')
+        )
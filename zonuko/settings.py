@@ -67,6 +67,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "zonuko.query_budget.QueryBudgetMiddleware",  # Inactive unless QUERY_BUDGET_ENABLED
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,9 +80,16 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "zonuko.urls"
 
+QUERY_BUDGET_ENABLED = env_bool("QUERY_BUDGET_ENABLED", False)
+
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # Render timing for the query budget report costs a wrapper per template; only pay for it when enabled
+        "BACKEND": (
+            "zonuko.query_budget.InstrumentedDjangoTemplates"
+            if QUERY_BUDGET_ENABLED
+            else "django.template.backends.django.DjangoTemplates"
+        ),
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -98,6 +106,12 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "zonuko.wsgi.application"
 
+# Query budget instrumentation (see zonuko/query_budget.py)
+# Adds X-Query-* headers and a rolling per-view report at /creator/query-budget/
+# QUERY_BUDGET_ENABLED is read above, where it picks the template backend
+QUERY_BUDGET_WINDOW = int(os.environ.get("QUERY_BUDGET_WINDOW", 200))  # requests kept per view
+QUERY_BUDGETS = {}  # URL name -> max queries, overrides VIEW_QUERY_BUDGETS
+
 # Database configuration
 
 # Use SQLite for local development if no DATABASE_URL is set
@@ -114,8 +128,64 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # SQLite serializes writers; wait for the lock instead of failing
+            # with "database is locked" during bursts of concurrent writes
+            "OPTIONS": {"timeout": 20},
+        }
+    }
+
+# Cache configuration
+# CACHE_BACKEND selects the shared cache used by zonuko.cache and the apps:
+#   "locmem" - per-process memory (tests, single-process dev). Not for multi-worker
+#              deployments: version bumps (e.g. the project catalog, see
+#              apps/users/catalog.py) don't reach the other workers
+#   "file"   - file-based, shared between workers on one host (CACHE_DIR)
+#   "redis"  - any Redis-protocol server at REDIS_URL (Redis, Valkey or a local stand-in)
+REDIS_URL = os.environ.get("REDIS_URL", "")
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if REDIS_URL else "locmem").strip().lower()
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "zonuko")
+CACHE_DEFAULT_TIMEOUT = int(os.environ.get("CACHE_DEFAULT_TIMEOUT", 300))
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL or "redis://127.0.0.1:6379/0",
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+            "OPTIONS": {
+                "socket_connect_timeout": 1,
+                "socket_timeout": 1,
+            },
+        }
+    }
+elif CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_DIR", str(BASE_DIR / ".cache")),
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
         }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "zonuko-default",
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+        }
+    }
+
+# Login throttling (see zonuko/throttle.py)
+# Token buckets per username and per client IP, checked before the database
+LOGIN_THROTTLE_ENABLED = env_bool("LOGIN_THROTTLE_ENABLED", True)
+LOGIN_THROTTLE_STORE = os.environ.get("LOGIN_THROTTLE_STORE", "cache").strip().lower()  # "cache" (shared) or "local" (per process)
+CHILD_LOGIN_THROTTLE_USERNAME_RATE = (5, 60)  # burst, then one attempt per 60s for each username
+CHILD_LOGIN_THROTTLE_IP_RATE = (30, 2)  # looser per IP: a classroom shares one address
+CLIENT_IP_HEADER = os.environ.get("CLIENT_IP_HEADER", "")  # e.g. HTTP_X_FORWARDED_FOR behind a proxy
+CLIENT_IP_TRUSTED_PROXIES = int(os.environ.get("CLIENT_IP_TRUSTED_PROXIES", 1))  # proxies appending to CLIENT_IP_HEADER
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -189,6 +259,11 @@ ACCOUNT_EMAIL_SUBJECT_PREFIX = "[Zonuko] "
 STRIPE_PUBLISHABLE_KEY = os.environ.get("STRIPE_PUBLISHABLE_KEY", "")
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "")
 STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "")
+STRIPE_HTTP_TIMEOUT = float(os.environ.get("STRIPE_HTTP_TIMEOUT", 5))  # seconds per Stripe API call
+# Offline billing (see apps/users/stripe_offline.py): an in-memory Stripe
+# stand-in for load tests and development without network access
+STRIPE_OFFLINE = env_bool("STRIPE_OFFLINE", False)
+STRIPE_WEBHOOK_RECORD_PATH = os.environ.get("STRIPE_WEBHOOK_RECORD_PATH", "")  # append verified webhooks here (JSONL)
 
 # Digital Ocean Spaces Configuration
 AWS_ACCESS_KEY_ID = os.environ.get("SPACES_ACCESS_KEY", "")
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from zonuko.cache import (
+    LOCK_SUFFIX, bump_version, current_version, expire, get_cache, get_or_compute, invalidate_namespace, make_key,
+)
+
+
+class VersionedKeyTests(SimpleTestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_bump_moves_the_version(self):
+        version = current_version('test:version')
+        self.assertEqual(current_version('test:version'), version)
+        self.assertEqual(bump_version('test:version'), version + 1)
+        self.assertEqual(current_version('test:version'), version + 1)
+
+    def test_bump_seeds_a_missing_counter(self):
+        self.assertGreater(bump_version('test:missing'), 0)
+
+    def test_invalidate_namespace_changes_every_key(self):
+        first = make_key('test:ns', 1, 'a')
+        self.assertTrue(first.startswith('test:ns:v'))
+        self.assertTrue(first.endswith(':1:a'))
+        self.assertEqual(make_key('test:ns', 1, 'a'), first)
+
+        invalidate_namespace('test:ns')
+        self.assertNotEqual(make_key('test:ns', 1, 'a'), first)
+
+
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.compute = mock.Mock(side_effect=lambda: self.compute.call_count)
+
+    def test_value_is_computed_once_while_fresh(self):
+        self.assertEqual(get_or_compute('test:key', self.compute), 1)
+        self.assertEqual(get_or_compute('test:key', self.compute), 1)
+        self.assertEqual(self.compute.call_count, 1)
+
+    def test_stale_value_is_served_while_another_caller_refreshes(self):
+        get_or_compute('test:key', self.compute)
+        expire('test:key')
+        get_cache().add('test:key' + LOCK_SUFFIX, 1, 10)
+        self.assertEqual(get_or_compute('test:key', self.compute), 1)
+        self.assertEqual(self.compute.call_count, 1)
+
+        get_cache().delete('test:key' + LOCK_SUFFIX)
+        self.assertEqual(get_or_compute('test:key', self.compute), 2)
+        self.assertEqual(get_or_compute('test:key', self.compute), 2)
+
+    def test_cold_miss_computes_after_waiting_for_a_stuck_lock(self):
+        get_cache().add('test:key' + LOCK_SUFFIX, 1, 10)
+        self.assertEqual(get_or_compute('test:key', self.compute, wait=0.1, poll_interval=0.02), 1)
+
+    def test_failed_compute_releases_the_lock(self):
+        with self.assertRaises(RuntimeError):
+            get_or_compute('test:key', mock.Mock(side_effect=RuntimeError('down')))
+        self.assertIsNone(get_cache().get('test:key' + LOCK_SUFFIX))
+        self.assertEqual(get_or_compute('test:key', self.compute), 1)
+
+    def test_expire_of_a_missing_key(self):
+        self.assertFalse(expire('test:absent'))
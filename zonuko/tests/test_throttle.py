@@ -0,0 +1,82 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from zonuko.cache import LOCK_SUFFIX, get_cache
+from zonuko.throttle import CacheBucketStore, LocalBucketStore, LoginThrottle, get_client_ip
+
+
+class BrokenStore:
+    def update(self, key, func, ttl):
+        raise ConnectionError('cache down')
+
+    def delete(self, key):
+        raise ConnectionError('cache down')
+
+
+@override_settings(LOGIN_THROTTLE_ENABLED=True)
+class LoginThrottleTests(SimpleTestCase):
+    def throttle(self, store=None):
+        return LoginThrottle('test', username_rate=(3, 60), ip_rate=(5, 60), store=store or LocalBucketStore())
+
+    def test_username_bucket_rejects_after_burst(self):
+        throttle = self.throttle()
+        for _ in range(3):
+            self.assertTrue(throttle.check('Kid', '10.0.0.1').allowed)
+        decision = throttle.check(' KID ', '10.0.0.2')
+        self.assertFalse(decision.allowed)
+        self.assertEqual(decision.scope, 'username')
+        self.assertGreaterEqual(decision.retry_after, 1)
+
+    def test_ip_bucket_rejects_spraying(self):
+        throttle = self.throttle()
+        for number in range(5):
+            self.assertTrue(throttle.check(f'kid{number}', '10.0.0.1').allowed)
+        decision = throttle.check('another', '10.0.0.1')
+        self.assertFalse(decision.allowed)
+        self.assertEqual(decision.scope, 'ip')
+
+    def test_success_refills_username_bucket(self):
+        throttle = self.throttle()
+        for _ in range(3):
+            throttle.check('kid', '10.0.0.1')
+        throttle.succeeded('kid')
+        self.assertTrue(throttle.check('kid', '10.0.0.1').allowed)
+
+    def test_store_errors_fail_open(self):
+        self.assertTrue(self.throttle(BrokenStore()).check('kid', '10.0.0.1').allowed)
+
+    def test_busy_bucket_fails_open(self):
+        store = CacheBucketStore(wait=0)
+        throttle = self.throttle(store)
+        lock_key = throttle.ip_bucket.key('10.0.0.9') + LOCK_SUFFIX
+        get_cache().add(lock_key, 1, 5)
+        self.addCleanup(get_cache().delete, lock_key)
+        self.assertTrue(throttle.check('kid', '10.0.0.9').allowed)
+
+
+class GetClientIpTests(SimpleTestCase):
+    def request(self, forwarded_for=None, remote_addr='10.0.0.1'):
+        meta = {'REMOTE_ADDR': remote_addr}
+        if forwarded_for is not None:
+            meta['HTTP_X_FORWARDED_FOR'] = forwarded_for
+        return RequestFactory().get('/', **meta)
+
+    @override_settings(CLIENT_IP_HEADER='')
+    def test_remote_addr_without_proxy_header(self):
+        self.assertEqual(get_client_ip(self.request('203.0.113.9')), '10.0.0.1')
+
+    @override_settings(CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', CLIENT_IP_TRUSTED_PROXIES=1)
+    def test_single_proxy_uses_rightmost_entry(self):
+        self.assertEqual(get_client_ip(self.request('203.0.113.9')), '203.0.113.9')
+        # Whatever the client put on the left is ignored
+        self.assertEqual(get_client_ip(self.request('1.2.3.4, 203.0.113.9')), '203.0.113.9')
+        self.assertEqual(get_client_ip(self.request(' 1.2.3.4 ,203.0.113.9 ')), '203.0.113.9')
+
+    @override_settings(CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', CLIENT_IP_TRUSTED_PROXIES=2)
+    def test_proxy_chain_skips_trusted_hops(self):
+        self.assertEqual(get_client_ip(self.request('1.2.3.4, 203.0.113.9, 10.1.1.1')), '203.0.113.9')
+
+    @override_settings(CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR', CLIENT_IP_TRUSTED_PROXIES=2)
+    def test_short_header_falls_back_to_remote_addr(self):
+        self.assertEqual(get_client_ip(self.request('203.0.113.9')), '10.0.0.1')
+        self.assertEqual(get_client_ip(self.request('')), '10.0.0.1')
+        self.assertEqual(get_client_ip(self.request()), '10.0.0.1')
@@ -0,0 +1,285 @@
+"""
+Token-bucket login throttling.
+
+LoginThrottle guards a login form with two token buckets: one per username
+(stops PIN guessing against one account) and one per client IP (stops one
+client spraying many accounts). Each attempt takes a token from both; an
+empty bucket rejects the attempt with a Retry-After hint before the form
+touches the database. A successful login refills the username bucket.
+
+Bucket state lives in a pluggable store chosen with LOGIN_THROTTLE_STORE:
+
+- "cache": the shared Django cache (Redis in production), so every worker
+  sees the same buckets
+- "local": per-process memory, for tests and single-process development
+
+If the store is unreachable, or a bucket's lock is held too long by a
+burst of attempts, the throttle fails open, so a cache outage or a
+classroom logging in together can't lock every child out. Allowed/throttled/error counts are kept per
+throttle and available to staff as JSON at /creator/login-throttle/.
+"""
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from zonuko.cache import LOCK_SUFFIX, get_cache
+
+
+class ThrottleStoreBusy(Exception):
+    """The bucket lock could not be taken in time"""
+
+
+class LocalBucketStore:
+    """Bucket state in process memory, guarded by a lock"""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def update(self, key, func, ttl):
+        """Apply func(state) -> (new_state, result) atomically and return result"""
+        now = time.monotonic()
+        with self._lock:
+            state, expires_at = self._buckets.get(key, (None, 0))
+            if expires_at <= now:
+                state = None
+            state, result = func(state)
+            self._buckets[key] = (state, now + ttl)
+            return result
+
+    def delete(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """
+    Bucket state in the shared cache.
+
+    Updates are serialized per key with a cache.add lock (the same pattern
+    as zonuko.cache.get_or_compute), so concurrent attempts from several
+    workers can't both spend the last token.
+    """
+
+    def __init__(self, alias="default", lock_timeout=2, wait=0.25, poll_interval=0.005):
+        self.alias = alias
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+        self.poll_interval = poll_interval
+
+    def update(self, key, func, ttl):
+        cache = get_cache(self.alias)
+        lock_key = key + LOCK_SUFFIX
+        deadline = time.monotonic() + self.wait
+        while not cache.add(lock_key, 1, self.lock_timeout):
+            if time.monotonic() >= deadline:
+                raise ThrottleStoreBusy(key)
+            time.sleep(self.poll_interval)
+        try:
+            state, result = func(cache.get(key))
+            cache.set(key, state, ttl)
+            return result
+        finally:
+            cache.delete(lock_key)
+
+    def delete(self, key):
+        get_cache(self.alias).delete(key)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_bucket_store(kind=None):
+    """The process-wide store for LOGIN_THROTTLE_STORE ("cache" or "local")"""
+    kind = kind or getattr(settings, "LOGIN_THROTTLE_STORE", "cache")
+    with _stores_lock:
+        store = _stores.get(kind)
+        if store is None:
+            if kind == "cache":
+                store = CacheBucketStore()
+            elif kind == "local":
+                store = LocalBucketStore()
+            else:
+                raise ValueError(f"Unknown LOGIN_THROTTLE_STORE {kind!r}")
+            _stores[kind] = store
+        return store
+
+
+class TokenBucket:
+    """
+    `capacity` attempts in a burst, refilled at one token per `refill_seconds`.
+
+    Only the token count and the time it was last updated are stored, and a
+    bucket left alone long enough to refill completely simply expires.
+    """
+
+    def __init__(self, name, capacity, refill_seconds):
+        self.name = name
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+
+    @property
+    def ttl(self):
+        return int(self.capacity * self.refill_seconds) + 1
+
+    def key(self, identity):
+        return f"throttle:{self.name}:{identity}"
+
+    def consume(self, identity, store):
+        """Take one token. Returns (allowed, seconds until the next token)"""
+        now = time.time()
+
+        def take(state):
+            tokens, updated_at = state if state else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated_at) / self.refill_seconds)
+            if tokens >= 1:
+                return (tokens - 1, now), (True, 0.0)
+            return (tokens, now), (False, (1 - tokens) * self.refill_seconds)
+
+        return store.update(self.key(identity), take, self.ttl)
+
+    def reset(self, identity, store):
+        store.delete(self.key(identity))
+
+
+class ThrottleMetrics:
+    """Per-throttle outcome counters, kept in process memory"""
+
+    OUTCOMES = ("allowed", "throttled_username", "throttled_ip", "store_busy", "store_errors")
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, throttle_name, outcome):
+        with self._lock:
+            self._counts.setdefault(throttle_name, Counter())[outcome] += 1
+
+    def summary(self):
+        with self._lock:
+            return {
+                name: {outcome: counts[outcome] for outcome in self.OUTCOMES}
+                for name, counts in sorted(self._counts.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = ThrottleMetrics()
+
+
+@dataclass(frozen=True)
+class ThrottleDecision:
+    allowed: bool
+    retry_after: int = 0  # whole seconds
+    scope: str = ""  # "username" or "ip" when rejected
+
+
+ALLOW = ThrottleDecision(allowed=True)
+
+
+class LoginThrottle:
+    """Username and client IP token buckets for one login form"""
+
+    def __init__(self, name, username_rate, ip_rate, store=None):
+        """
+        Args:
+            name: Throttle name, used in cache keys and metrics
+            username_rate: (burst, seconds per token) for each username
+            ip_rate: (burst, seconds per token) for each client IP
+            store: Bucket store; defaults to get_bucket_store()
+        """
+        self.name = name
+        self.username_bucket = TokenBucket(f"{name}:user", *username_rate)
+        self.ip_bucket = TokenBucket(f"{name}:ip", *ip_rate)
+        self._store = store
+
+    @property
+    def store(self):
+        return self._store or get_bucket_store()
+
+    @staticmethod
+    def normalize(username):
+        return (username or "").strip().lower()
+
+    def check(self, username, ip):
+        """Spend one attempt for this username and IP, or reject it"""
+        if not getattr(settings, "LOGIN_THROTTLE_ENABLED", True):
+            return ALLOW
+
+        store = self.store
+        try:
+            for scope, bucket, identity in (
+                ("ip", self.ip_bucket, ip or "unknown"),
+                ("username", self.username_bucket, self.normalize(username)),
+            ):
+                allowed, retry_after = bucket.consume(identity, store)
+                if not allowed:
+                    metrics.record(self.name, f"throttled_{scope}")
+                    # No username or IP in the log line; the metrics carry the counts
+                    print(f"Login throttled ({self.name}): {scope} bucket empty")
+                    return ThrottleDecision(False, max(1, int(retry_after + 0.999)), scope)
+        except ThrottleStoreBusy:
+            # Lock contention on one bucket (e.g. a classroom behind one IP) is
+            # not a limit being hit; fail open like any other store problem
+            metrics.record(self.name, "store_busy")
+            print(f"Login throttle store busy ({self.name}), allowing attempt")
+            return ALLOW
+        except Exception as e:
+            metrics.record(self.name, "store_errors")
+            print(f"Login throttle store unavailable ({self.name}), allowing attempt: {e}")
+            return ALLOW
+
+        metrics.record(self.name, "allowed")
+        return ALLOW
+
+    def succeeded(self, username):
+        """Refill the username bucket after a correct login"""
+        try:
+            self.username_bucket.reset(self.normalize(username), self.store)
+        except Exception as e:
+            print(f"Login throttle store unavailable ({self.name}): {e}")
+
+
+def get_client_ip(request):
+    """
+    Client IP for throttling.
+
+    Uses the header named by CLIENT_IP_HEADER (e.g. HTTP_X_FORWARDED_FOR)
+    when the app runs behind proxies that append to it, otherwise
+    REMOTE_ADDR. Entries on the left are written by the client and can be
+    forged, so the address is read from the right: each of the
+    CLIENT_IP_TRUSTED_PROXIES proxies appends the address it was reached
+    from, making the Nth entry from the right the one the outermost
+    trusted proxy saw. With fewer entries than proxies the header can't be
+    trusted and REMOTE_ADDR is used.
+    """
+    header = getattr(settings, "CLIENT_IP_HEADER", "")
+    trusted_proxies = max(int(getattr(settings, "CLIENT_IP_TRUSTED_PROXIES", 1)), 1)
+    if header:
+        entries = [entry.strip() for entry in request.META.get(header, "").split(",") if entry.strip()]
+        if len(entries) >= trusted_proxies:
+            return entries[-trusted_proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+@staff_member_required
+def login_throttle_report(request):
+    """Login throttle counters as JSON"""
+    return JsonResponse({
+        "enabled": getattr(settings, "LOGIN_THROTTLE_ENABLED", True),
+        "store": getattr(settings, "LOGIN_THROTTLE_STORE", "cache"),
+        "throttles": metrics.summary(),
+    })
@@ -4,11 +4,16 @@ from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from zonuko.query_budget import query_budget_report
+from zonuko.throttle import login_throttle_report
+
 urlpatterns = [
     path("", include("apps.core.urls")),
     path("founding/", include("apps.founding.urls")),
     path("members/accounts/", include("allauth.urls")),  # Parent login/signup under /members/
     path("members/", include("apps.users.urls")),
+    path("creator/query-budget/", query_budget_report, name="query_budget_report"),
+    path("creator/login-throttle/", login_throttle_report, name="login_throttle_report"),
     path("creator/", admin.site.urls),
     path("tinymce/", include("tinymce.urls")),
 ]